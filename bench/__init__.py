@@ -0,0 +1 @@
+"""Offline benchmarks: synthetic YouTube pages, a local Spotify/YouTube stand-in and the harness."""
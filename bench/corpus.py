@@ -0,0 +1,141 @@
+"""
+Synthetic YouTube results pages for the offline benchmarks.
+
+Live pages can't be fetched (or committed) here, so these mimic the parts that
+matter to the parser: a large block of scripts before ytInitialData, the
+ytInitialData assignment in one of the layouts YouTube has shipped, non-video
+renderers (ads, channels, shelves) before the first videoRenderer, and more
+scripts afterwards. Pages are deterministic for a given (query, layout, size).
+
+search_data() is the same results as bare JSON, which the stand-in also serves
+for the JSON search API and (reshaped) the Data API backends.
+
+Saved real pages can be used instead: put *.html files in a folder and pass
+--corpus DIR to run_bench.
+"""
+
+import functools
+import glob
+import json
+import os
+import random
+from typing import Optional
+
+LAYOUTS = {
+    "var": "var ytInitialData = ",
+    "window-bracket": 'window["ytInitialData"] = ',
+    "window-dot": "window.ytInitialData = ",
+}
+
+# (scripts before ytInitialData KiB, videos, scripts after KiB)
+SIZES = {
+    "small": (120, 8, 40),
+    "medium": (650, 20, 250),
+    "large": (1400, 40, 600),
+}
+
+VIDEO_ID_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_"
+
+
+@functools.lru_cache(maxsize=16)
+def _scripts(kib: int, salt: str) -> str:
+    """Filler JavaScript (with braces inside strings, like the real thing); cached as it dominates build time."""
+    rnd = random.Random(f"{kib}|{salt}")
+    out, size = [], 0
+    while size < kib * 1024:
+        name = rnd.randrange(10 ** 9)
+        s = ('function f%d(a,b){if(a){return {k:"%s",v:[1,2,{w:3}]}}else{var t="}{";return b}}\n'
+             % (name, "x" * rnd.randrange(10, 120)))
+        out.append(s)
+        size += len(s)
+    return "".join(out)
+
+
+def _video_id(rnd: random.Random) -> str:
+    return "".join(rnd.choice(VIDEO_ID_CHARS) for _ in range(11))
+
+
+def video_renderer(rnd: random.Random, title: str, channel: str, seconds: int,
+                   badge: Optional[str] = None, video_id: Optional[str] = None) -> dict:
+    """A videoRenderer shaped like YouTube's (the fields we read, plus realistic bulk)."""
+    vid = video_id or _video_id(rnd)
+    r = {
+        "videoId": vid,
+        "thumbnail": {"thumbnails": [{"url": f"https://i.ytimg.com/vi/{vid}/hq{i}.jpg", "width": 360, "height": 202}
+                                     for i in range(4)]},
+        "title": {"runs": [{"text": title}], "accessibility": {"accessibilityData": {"label": f"{title} by {channel}"}}},
+        "longBylineText": {"runs": [{"text": channel, "navigationEndpoint": {"browseEndpoint": {"browseId": "UC" + vid}}}]},
+        "ownerText": {"runs": [{"text": channel}]},
+        "lengthText": {"simpleText": f"{seconds // 60}:{seconds % 60:02d}"},
+        "viewCountText": {"simpleText": f"{rnd.randrange(10 ** 3, 10 ** 9):,} views"},
+        "navigationEndpoint": {"commandMetadata": {"webCommandMetadata": {"url": f"/watch?v={vid}"}},
+                               "watchEndpoint": {"videoId": vid}},
+        "trackingParams": "x" * 120,
+        "menu": {"menuRenderer": {"items": [{"menuServiceItemRenderer": {"text": {"runs": [{"text": t}]}}}
+                                            for t in ("Add to queue", "Save to Watch later", "Share", "Report")]}},
+    }
+    if badge:
+        r["ownerBadges"] = [{"metadataBadgeRenderer": {"style": badge, "tooltip": "Verified"}}]
+    return r
+
+
+def search_data(query: str, size: str = "medium", seed=None, duration_s: int = 210) -> dict:
+    """The ytInitialData-shaped search results for ``query`` (also what the JSON search API returns)."""
+    rnd = random.Random(seed if seed is not None else f"{query}|{size}")
+    _before_kib, n_videos, _after_kib = SIZES[size]
+    artist = query.split(" ")[-1] if " " in query else "Artist"
+    variants = [
+        (f"{query} (Official Music Video)", f"{artist}VEVO", duration_s + 35, "BADGE_STYLE_TYPE_VERIFIED_ARTIST"),
+        (query, f"{artist} - Topic", duration_s, None),
+        (f"{query} (Lyrics)", "Lyrics Channel", duration_s + 2, None),
+        (f"{query} (Live)", artist, duration_s + 90, "BADGE_STYLE_TYPE_VERIFIED"),
+    ]
+    items: list = [
+        {"adSlotRenderer": {"trackingParams": "y" * 400, "enablePacfLoggingWeb": False}},
+        {"channelRenderer": {"channelId": "UC" + _video_id(rnd), "title": {"simpleText": artist}}},
+    ]
+    for i in range(n_videos):
+        if i < len(variants):
+            title, channel, seconds, badge = variants[i]
+        else:
+            title, channel, seconds, badge = (f"{query} cover #{i}", f"Channel {i}", rnd.randrange(90, 600), None)
+        items.append({"videoRenderer": video_renderer(rnd, title, channel, seconds, badge)})
+        if i == 5:
+            shelf = [{"videoRenderer": video_renderer(rnd, f"Related {j}", "Other", 200)} for j in range(3)]
+            items.append({"shelfRenderer": {"content": {"verticalListRenderer": {"items": shelf}}}})
+    return {
+        "responseContext": {"serviceTrackingParams": [{"service": "GFEEDBACK", "params": [{"key": "k", "value": "v" * 60}] * 20}]},
+        "estimatedResults": str(rnd.randrange(10 ** 6)),
+        "contents": {"twoColumnSearchResultsRenderer": {"primaryContents": {"sectionListRenderer": {
+            "contents": [{"itemSectionRenderer": {"contents": items}}]}}}},
+    }
+
+
+def videos(data: dict) -> list[dict]:
+    """The top-level videoRenderers of search_data() output, in page order (shelves skipped)."""
+    section = data["contents"]["twoColumnSearchResultsRenderer"]["primaryContents"]["sectionListRenderer"]
+    items = section["contents"][0]["itemSectionRenderer"]["contents"]
+    return [item["videoRenderer"] for item in items if "videoRenderer" in item]
+
+
+def results_page(query: str, layout: str = "var", size: str = "medium", seed: Optional[int] = None,
+                 duration_s: int = 210) -> bytes:
+    """Build a results page whose videos are plausible matches for ``query``."""
+    before_kib, _n_videos, after_kib = SIZES[size]
+    data = search_data(query, size, seed if seed is not None else f"{query}|{layout}|{size}", duration_s)
+    html = ("<!DOCTYPE html><html><head><script>" + _scripts(before_kib, "head") + "</script></head><body>"
+            + "<script>" + LAYOUTS[layout] + json.dumps(data, ensure_ascii=False) + ";</script>"
+            + "<script>" + _scripts(after_kib, "tail") + "</script></body></html>")
+    return html.encode("utf-8")
+
+
+def load_corpus(directory: Optional[str] = None) -> dict[str, bytes]:
+    """Saved pages from ``directory`` if given, else one synthetic page per layout × size."""
+    if directory:
+        pages = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+            with open(path, "rb") as f:
+                pages[os.path.basename(path)] = f.read()
+        return pages
+    return {f"{size}-{layout}": results_page("Never Gonna Give You Up Rick Astley", layout, size, seed=7)
+            for size in SIZES for layout in LAYOUTS}
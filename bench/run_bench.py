@@ -0,0 +1,602 @@
+"""
+Offline benchmark harness for the resolver pipeline.
+
+    python -m bench.run_bench                       # table + bench_results.json
+    python -m bench.run_bench --out new.json --compare old.json
+    python -m bench.run_bench --corpus saved_pages/ --only parse
+
+Parse benchmarks run on the corpus (synthetic by default, see bench.corpus).
+Network benchmarks run against bench.stand_in on localhost with configurable
+latency, so nothing here touches the real Spotify or YouTube. The server
+benchmarks drive spotify_to_youtube_server with several keep-alive clients.
+The parse-stage benchmark compares parsing on threads vs in a process pool:
+UI frame lateness (a 60 Hz ticker thread standing in for the Tk loop) and
+pages/s while several threads resolve at once. The hedging benchmark stalls
+every Nth stand-in YouTube search and compares search latency with hedged
+requests off, fixed and adaptive. The metadata benchmark times a cold first
+lookup (new resolver: no token, no open connections) with each Spotify
+metadata provider (Web API vs public embed page / oEmbed). The engine benchmarks resolve a playlist
+with 8…512 tracks in flight on worker threads vs the asyncio engine
+(tracks/s and peak thread count), with at least 50 ms of stand-in latency.
+The index benchmarks time song-index lookups against a large in-memory cache,
+and the history ones the GUI history pane's store (append, filter, row access).
+
+Every benchmark reports p50/p95/mean latency, throughput (ops/s over the timed
+loop) and peak traced memory (one extra run under tracemalloc, so tracing
+overhead doesn't skew the latencies). The JSON output is meant to be diffed
+between versions with --compare.
+"""
+
+import argparse
+import gc
+import http.client
+import threading
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+from urllib.parse import quote
+
+import spotify_to_youtube_core as core
+from bench import corpus
+from bench.stand_in import StandInServer
+from spotify_to_youtube_stats import StageStats
+
+
+def _percentile(sorted_vals: list[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def measure(fn: Callable[[int], object], iterations: int, warmup: int = 1) -> dict:
+    """Time ``fn(i)`` for i in range(iterations); fn gets the iteration number."""
+    for i in range(warmup):
+        fn(-1 - i)
+    gc.collect()
+    samples = []
+    t_start = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    wall = time.perf_counter() - t_start
+    tracemalloc.start()
+    fn(iterations)
+    _cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p95_ms": round(_percentile(samples, 95), 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "throughput_per_s": round(iterations / wall, 2) if wall else 0.0,
+        "peak_mem_kib": round(peak / 1024, 1),
+    }
+
+
+def _find_data(html: str):
+    for marker in core.YT_INITIAL_DATA_MARKERS:
+        data = core._extract_json_block(html, marker)
+        if data:
+            return data
+    return None
+
+
+def _first_renderer_id(data) -> Optional[str]:
+    for d in core._walk_dicts(data):
+        if "videoRenderer" in d:
+            return d["videoRenderer"].get("videoId")
+    return None
+
+
+def _chunks(page: bytes, size: int = core.YT_CHUNK_SIZE):
+    for i in range(0, len(page), size):
+        yield page[i:i + size]
+
+
+def bench_parse(pages: dict[str, bytes], iterations: int) -> dict:
+    results = {}
+    for name, page in pages.items():
+        html = page.decode("utf-8", "replace")
+        data = _find_data(html)
+        results[f"extract_json_block[{name}]"] = measure(lambda _i: _find_data(html), iterations)
+        if data is not None:
+            results[f"walk_dicts[{name}]"] = measure(lambda _i: _first_renderer_id(data), iterations)
+        results[f"iter_video_renderers[{name}]"] = measure(
+            lambda _i: next(core.iter_video_renderers(_chunks(page), limit=1), None), iterations)
+        results[f"iter_video_renderers[{name}]"]["page_bytes"] = len(page)
+        cands = [core.candidate_from_renderer(r) for r in core.iter_video_renderers(_chunks(page), limit=6)]
+        if cands:
+            results[f"rank_candidates[{name}]"] = measure(
+                lambda _i: core.rank_candidates(cands, "Never Gonna Give You Up", "Rick Astley", 213000), iterations)
+    return results
+
+
+def _frame_ticker(stop: threading.Event, lags: list, period_s: float = 1 / 60) -> None:
+    """Stand-in for the Tk main loop: how late each 60 Hz frame wakes up, in ms."""
+    due = time.perf_counter() + period_s
+    while not stop.is_set():
+        time.sleep(max(0.0, due - time.perf_counter()))
+        now = time.perf_counter()
+        lags.append((now - due) * 1000)
+        due = max(due + period_s, now)
+
+
+def bench_parse_stage(pages: dict[str, bytes], seconds: float = 2.0, threads: int = 4, limit: int = 20) -> dict:
+    """Frame lateness + parse throughput with ``threads`` searchers, parsing on threads vs in processes."""
+    page = pages.get("large-var") or max(pages.values(), key=len)
+    chunks = [page[i:i + core.YT_CHUNK_SIZE] for i in range(0, len(page), core.YT_CHUNK_SIZE)]
+    results = {}
+    for mode in ("idle", "thread", "process"):
+        stage = core.ParseStage("thread" if mode == "idle" else mode, workers=threads)
+        stage.warm_up()
+        stop, lags, counts = threading.Event(), [], [0] * threads
+
+        def searcher(k: int) -> None:
+            while not stop.is_set():
+                stage.parse(iter(chunks), limit)
+                counts[k] += 1
+
+        workers = [] if mode == "idle" else [threading.Thread(target=searcher, args=(k,)) for k in range(threads)]
+        ticker = threading.Thread(target=_frame_ticker, args=(stop, lags))
+        ticker.start()
+        for w in workers:
+            w.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in [ticker, *workers]:
+            t.join()
+        stage.close()
+        lags.sort()
+        results[f"parse_stage[{mode},{threads} threads]"] = {
+            "p50_ms": round(_percentile(lags, 50), 3), "p95_ms": round(_percentile(lags, 95), 3),
+            "mean_ms": round(sum(lags) / len(lags), 3), "max_ms": round(lags[-1], 3),
+            "throughput_per_s": round(sum(counts) / seconds, 1), "peak_mem_kib": 0.0,
+            "metric": "p50/p95: UI frame lateness; throughput: pages parsed", "page_bytes": len(page), "limit": limit,
+        }
+    return results
+
+
+def _song_name(rng: random.Random, words: list[str]) -> tuple[str, str]:
+    title = " ".join(rng.choice(words) for _ in range(rng.randint(1, 5))).title()
+    artist = " ".join(rng.choice(words) for _ in range(rng.randint(1, 2))).title()
+    return title, artist
+
+
+def bench_index(iterations: int, entries: int = 50000) -> dict:
+    """Song-index lookups (exact, tagged variant, miss) over ``entries`` resolved songs."""
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 8)))
+             for _ in range(4000)]
+    cache = core.TrackCache(":memory:", max_entries=entries, song_max_entries=entries)
+    songs = []
+    t0 = time.perf_counter()
+    for i in range(entries):
+        title, artist = _song_name(rng, words)
+        cache.put(f"t{i}", title, artist, "", f"v{i}", 180000 + i % 60000)
+        songs.append((title, artist, 180000 + i % 60000))
+    fill_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cache.warm_index()
+    build_ms = (time.perf_counter() - t0) * 1000
+    picks = [songs[rng.randrange(entries)] for _ in range(max(iterations, 1))]
+    misses = [_song_name(rng, words) for _ in range(max(iterations, 1))]
+    results = {
+        f"find_song[exact,{entries}]": measure(lambda i: cache.find_song(*picks[i % len(picks)]), iterations),
+        f"find_song[remaster tag,{entries}]": measure(
+            lambda i: cache.find_song(picks[i % len(picks)][0] + " - Remastered 2011", picks[i % len(picks)][1],
+                                      picks[i % len(picks)][2]), iterations),
+        f"find_song[miss,{entries}]": measure(lambda i: cache.find_song(*misses[i % len(misses)]), iterations),
+    }
+    results[f"find_song[exact,{entries}]"]["index_build_ms"] = round(build_ms, 1)
+    results[f"find_song[exact,{entries}]"]["fill_s"] = round(fill_s, 2)
+    cache.close()
+    return results
+
+
+def bench_history(iterations: int, rows: int = 20000) -> dict:
+    """History pane store: batched appends, filtering as you type, and a screenful of row reads."""
+    try:
+        from spotify_to_youtube_history import HistoryEntry, HistoryStore
+    except ImportError:  # no tkinter
+        return {}
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 8)))
+             for _ in range(2000)]
+    entries = [HistoryEntry(time.time(), *_song_name(rng, words), f"v{i:010d}", f"t{i}") for i in range(rows)]
+    store = HistoryStore()
+    store.extend(entries)
+    batch = entries[:25]
+    queries = [words[rng.randrange(len(words))][:3] for _ in range(max(iterations, 1))]
+
+    def filter_typed(i: int) -> None:
+        q = queries[i % len(queries)]
+        for n in range(1, len(q) + 1):
+            store.set_filter(q[:n])
+        store.set_filter("")
+
+    results = {
+        f"history_append[25 rows,{rows}]": measure(lambda _i: store.extend(batch), iterations),
+        f"history_filter[typed,{rows}]": measure(filter_typed, iterations),
+        f"history_screen[30 rows,{rows}]": measure(
+            lambda i: [store.visible((i * 997 + r) % len(store)).label() for r in range(30)], iterations),
+    }
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    more = [HistoryEntry(time.time(), e.title, e.artist, e.video_id, e.track_id) for e in entries[:10000]]
+    results[f"history_append[25 rows,{rows}]"]["bytes_per_row"] = round(
+        (tracemalloc.get_traced_memory()[0] - before) / len(more))
+    tracemalloc.stop()
+    return results
+
+
+class _NullBatcher:
+    def put(self, _item) -> None:
+        pass
+
+
+class _AppShim:
+    """Just enough of App for App._work: a resolver and a ``_post`` that records the outcome."""
+
+    def __init__(self, resolver: core.Resolver):
+        self.resolver = resolver
+        self.outcome = None
+        self._results = _NullBatcher()
+
+    def _post(self, _job, fn, *args):
+        fn(*args)
+
+    def _track_ok(self, res):
+        self.outcome = ("ok", res)
+
+    def _ok(self, *args, **kwargs):
+        self.outcome = ("ok", args)
+
+    def _err(self, msg):
+        self.outcome = ("err", msg)
+
+
+def _app_work() -> Optional[Callable]:
+    """App._work, unbound, if the GUI module can be imported here (tkinter present; no display needed)."""
+    try:
+        from spotify_to_youtube_gui_exe import App
+    except Exception:
+        return None
+    return App._work
+
+
+def bench_network(iterations: int, latency_ms: float, page_size: str) -> dict:
+    results = {}
+    srv = StandInServer(spotify_latency_ms=latency_ms, youtube_latency_ms=latency_ms, page_size=page_size).start()
+    try:
+        # Unlimited rates (the stand-in is one host for everything), but the same limiter code path
+        resolver = core.Resolver("bench-id", "bench-secret", limiter=core.RateLimiter(), stats=False,
+                                 **srv.resolver_kwargs())
+        sess = resolver.session(srv.base_url)
+        results["search_youtube_first_video_id"] = measure(
+            lambda i: core.search_youtube_first_video_id(f"bench query {i}", session=sess, base=srv.base_url),
+            iterations)
+        results["resolver.resolve_track"] = measure(
+            lambda i: resolver.resolve_track(f"https://open.spotify.com/track/rt{i + 1000}"), iterations)
+        # Same lookups with per-stage stats on, to keep an eye on the instrumentation's cost
+        resolver.stats = StageStats()
+        results["resolver.resolve_track[stats on]"] = measure(
+            lambda i: resolver.resolve_track(f"https://open.spotify.com/track/rs{i + 1000}"), iterations)
+        resolver.stats = None
+        work = _app_work()
+        if work is not None:
+            shim = _AppShim(resolver)
+
+            def run_work(i: int) -> None:
+                work(shim, f"https://open.spotify.com/track/aw{i + 1000}")
+                if shim.outcome is None or shim.outcome[0] != "ok":
+                    raise RuntimeError(f"App._work failed: {shim.outcome}")
+
+            results["App._work"] = measure(run_work, iterations)
+        resolver.close()
+        results["stand_in_counts"] = dict(srv.counts)
+        results["stand_in_bytes_sent"] = dict(srv.bytes_sent)
+    finally:
+        srv.stop()
+    results.update(bench_backends(iterations, latency_ms, page_size))
+    results.update(bench_metadata(max(1, iterations // 2), latency_ms))
+    results.update(bench_throttled(max(1, iterations // 5), latency_ms))
+    results.update(bench_hedging(max(60, iterations), latency_ms))
+    return results
+
+
+def bench_backends(iterations: int, latency_ms: float, page_size: str) -> dict:
+    """Each YouTube search backend on the same queries: latency, plus bytes downloaded per search."""
+    results = {}
+    srv = StandInServer(spotify_latency_ms=latency_ms, youtube_latency_ms=latency_ms, page_size=page_size).start()
+    try:
+        resolver = core.Resolver("bench-id", "bench-secret", limiter=core.RateLimiter(), stats=False,
+                                 youtube_api_key="bench-key", **srv.resolver_kwargs())
+        for name in core.SEARCH_BACKENDS:
+            resolver.set_search_backends(name, "bench-key")
+            backend = resolver.backends[0]
+            sess = resolver.session(backend.base)
+            sizes: list[int] = []
+
+            def search(i: int) -> None:
+                meter: dict = {}
+                if not backend.search(f"backend query {i}", resolver.candidates, sess, cancel=None, meter=meter):
+                    raise RuntimeError(f"{name}: no results")
+                sizes.append(meter["bytes"])
+
+            row = measure(search, iterations)
+            row["bytes_per_search"] = round(sum(sizes) / len(sizes))
+            results[f"search_backend[{name}]"] = row
+        resolver.close()
+    finally:
+        srv.stop()
+    return results
+
+
+def bench_metadata(iterations: int, latency_ms: float) -> dict:
+    """Time to first link from a cold resolver with each metadata provider chain, plus Spotify bytes per lookup."""
+    results = {}
+    srv = StandInServer(spotify_latency_ms=latency_ms, youtube_latency_ms=latency_ms, page_size="small").start()
+    try:
+        for spec, client_id in (("api", "bench-id"), ("embed,api,oembed", "bench-id"), ("embed,api,oembed", ""),
+                                ("oembed", "")):
+            before = sum(srv.bytes_sent.get(k, 0) for k in ("spotify", "embed", "oembed"))
+
+            def run(i: int) -> None:
+                resolver = core.Resolver(client_id, "bench-secret" if client_id else "", limiter=core.RateLimiter(),
+                                         stats=False, metadata_providers=spec, **srv.resolver_kwargs())
+                try:
+                    resolver.resolve_track(f"https://open.spotify.com/track/md{i + 1000}")
+                finally:
+                    resolver.close()
+
+            row = measure(run, iterations)
+            sent = sum(srv.bytes_sent.get(k, 0) for k in ("spotify", "embed", "oembed")) - before
+            # measure() runs warmup + timed + traced passes
+            row["spotify_bytes_per_lookup"] = round(sent / (iterations + 2))
+            results[f"first_link[{spec}{'' if client_id else ', no credentials'}]"] = row
+    finally:
+        srv.stop()
+    return results
+
+
+def bench_throttled(iterations: int, latency_ms: float, throttle_every: int = 7, retry_after: float = 0.05) -> dict:
+    """A 40-track playlist while the stand-in answers every Nth request with 429 + Retry-After."""
+    results = {}
+    srv = StandInServer(spotify_latency_ms=latency_ms, youtube_latency_ms=latency_ms, page_size="small",
+                        throttle_every=throttle_every, retry_after=retry_after).start()
+    try:
+        resolver = core.Resolver("bench-id", "bench-secret", limiter=core.RateLimiter(), **srv.resolver_kwargs())
+
+        def run(i: int) -> None:
+            out = resolver.resolve_many(["https://open.spotify.com/playlist/pl40"])
+            failed = [r for r in out if r.get("error")]
+            if failed:
+                raise RuntimeError(f"throttled playlist failed: {failed[0]['error']}")
+
+        results[f"resolve_many[playlist 40, 429 every {throttle_every}]"] = measure(run, iterations)
+        results["throttled_limiter_stats"] = resolver.limiter.stats()
+        resolver.close()
+    finally:
+        srv.stop()
+    return results
+
+
+def bench_hedging(iterations: int, latency_ms: float, slow_every: int = 10, slow_ms: float = 1500) -> dict:
+    """Search latency when every Nth YouTube search stalls, without hedging and with fixed / adaptive hedges."""
+    results = {}
+    srv = StandInServer(youtube_latency_ms=latency_ms, page_size="small", slow_every=slow_every,
+                        slow_ms=slow_ms).start()
+    try:
+        for mode in ("off", "fixed", "adaptive"):
+            srv.searches = 0
+            resolver = core.Resolver("bench-id", "bench-secret", limiter=core.RateLimiter(), stats=False,
+                                     hedge_mode=mode, hedge_delay_ms=300, hedges_per_min=1000,
+                                     **srv.resolver_kwargs())
+            name = f"search[stall 1/{slow_every} by {slow_ms:g} ms, hedge {mode}]"
+            results[name] = measure(lambda i: resolver.search_candidates(f"hedge {mode} {i}"), iterations, warmup=0)
+            if resolver.hedger is not None:
+                results[name]["hedging"] = resolver.hedger.stats()
+            # Let cancelled losers finish before the next run shares the server
+            time.sleep(slow_ms / 1000)
+            resolver.close()
+    finally:
+        srv.stop()
+    return results
+
+
+def bench_engines(latency_ms: float, levels: tuple = (8, 32, 128, 512), tracks_per_level: int = 4) -> dict:
+    """A playlist resolved with N tracks in flight, on worker threads vs on the asyncio engine.
+
+    Per level: tracks/s, per-track YouTube latency and the most client threads
+    alive at once, i.e. how many concurrent resolutions one process sustains.
+    The stand-in runs in this process too (its threads aren't counted, but it
+    shares the GIL), so tracks/s is a lower bound.
+    """
+    from spotify_to_youtube_async import AsyncEngine
+
+    results = {}
+    srv = StandInServer(spotify_latency_ms=latency_ms, youtube_latency_ms=latency_ms, page_size="small").start()
+    try:
+        for level in levels:
+            for engine in ("threads", "asyncio"):
+                resolver = core.Resolver("bench-id", "bench-secret", limiter=False, stats=False, concurrency=level,
+                                         **srv.resolver_kwargs())
+                runner = AsyncEngine(resolver, concurrency=level) if engine == "asyncio" else resolver
+                tracks = level * tracks_per_level
+                stop = threading.Event()
+                peak = [0]
+
+                def watch() -> None:
+                    while not stop.wait(0.01):
+                        alive = sum(1 for t in threading.enumerate() if "process_request" not in t.name)
+                        peak[0] = max(peak[0], alive)
+
+                watcher = threading.Thread(target=watch, daemon=True)
+                watcher.start()
+                t0 = time.perf_counter()
+                out = runner.resolve_many([f"https://open.spotify.com/playlist/pl{tracks}"])
+                wall = time.perf_counter() - t0
+                stop.set()
+                watcher.join()
+                failed = [r for r in out if r.get("error")]
+                if failed or len(out) != tracks:
+                    raise RuntimeError(f"{engine} x{level}: {len(failed)} failed, e.g. {failed[:1]}")
+                samples = sorted(r["timings"]["youtube_ms"] for r in out)
+                results[f"resolve_many[{tracks} tracks, {level} in flight, {engine}]"] = {
+                    "iterations": tracks,
+                    "p50_ms": round(_percentile(samples, 50), 3),
+                    "p95_ms": round(_percentile(samples, 95), 3),
+                    "mean_ms": round(sum(samples) / len(samples), 3),
+                    "throughput_per_s": round(tracks / wall, 2),
+                    "peak_mem_kib": 0.0,
+                    "peak_threads": peak[0],
+                }
+                runner.close()
+    finally:
+        srv.stop()
+    return results
+
+
+def bench_server(iterations: int, latency_ms: float, clients: int = 8) -> dict:
+    """GET /resolve from ``clients`` keep-alive clients at once; every request is a new track, then repeats."""
+    from spotify_to_youtube_server import ResolveServer
+
+    results = {}
+    srv = StandInServer(spotify_latency_ms=latency_ms, youtube_latency_ms=latency_ms, page_size="small").start()
+    cache = core.TrackCache(":memory:")
+    resolver = core.Resolver("bench-id", "bench-secret", cache=cache, limiter=core.RateLimiter(),
+                             **srv.resolver_kwargs())
+    api = ResolveServer(resolver, port=0).start()
+    try:
+        # The second pass asks for the same tracks again: answered from the shared cache
+        for label in ("new tracks", "cached tracks"):
+            samples: list[float] = []
+            lock = threading.Lock()
+
+            def client(c: int) -> None:
+                # http.client, not requests: its per-call overhead (~4 ms) would hide the server's
+                conn = http.client.HTTPConnection(*api.server_address[:2], timeout=30)
+                mine = []
+                for i in range(iterations):
+                    t0 = time.perf_counter()
+                    conn.request("GET", "/resolve?url=" + quote(f"https://open.spotify.com/track/sv{c}x{i}"))
+                    resp = conn.getresponse()
+                    body = json.loads(resp.read())
+                    if resp.status != 200 or body["failures"]:
+                        raise RuntimeError(f"{resp.status}: {body}")
+                    mine.append((time.perf_counter() - t0) * 1000)
+                conn.close()
+                with lock:
+                    samples.extend(mine)
+
+            t_start = time.perf_counter()
+            threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            wall = time.perf_counter() - t_start
+            samples.sort()
+            results[f"server GET /resolve[{clients} clients, {label}]"] = {
+                "iterations": len(samples),
+                "p50_ms": round(_percentile(samples, 50), 3),
+                "p95_ms": round(_percentile(samples, 95), 3),
+                "p99_ms": round(_percentile(samples, 99), 3),
+                "mean_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+                "throughput_per_s": round(len(samples) / wall, 2) if wall else 0.0,
+                "peak_mem_kib": 0.0,
+            }
+        results["server_stats"] = api.stats()["server"]
+    finally:
+        api.stop()
+        resolver.close()
+        srv.stop()
+    return results
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(new: dict, old: dict) -> None:
+    print(f"\n{'benchmark':<52}{'old p50':>10}{'new p50':>10}{'ratio':>8}")
+    for name, row in new["results"].items():
+        prev = old.get("results", {}).get(name)
+        if not isinstance(row, dict) or "p50_ms" not in row or not isinstance(prev, dict) or "p50_ms" not in prev:
+            continue
+        ratio = row["p50_ms"] / prev["p50_ms"] if prev["p50_ms"] else float("inf")
+        print(f"{name:<52}{prev['p50_ms']:>10.3f}{row['p50_ms']:>10.3f}{ratio:>7.2f}x")
+
+
+def print_table(results: dict) -> None:
+    print(f"{'benchmark':<52}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>10}{'peak KiB':>10}{'KiB/op':>10}")
+    for name, row in results.items():
+        if isinstance(row, dict) and "p50_ms" in row:
+            per_op = f"{row['bytes_per_search'] / 1024:>10.1f}" if "bytes_per_search" in row else ""
+            print(f"{name:<52}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}"
+                  f"{row['throughput_per_s']:>10.1f}{row['peak_mem_kib']:>10.1f}{per_op}")
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Offline resolver benchmarks")
+    p.add_argument("--only", choices=["parse", "parse_stage", "index", "history", "network", "engines", "server"],
+                   help="run just one group")
+    p.add_argument("--corpus", help="folder of saved YouTube results *.html (default: synthetic corpus)")
+    p.add_argument("-n", "--iterations", type=int, default=30)
+    p.add_argument("--latency-ms", type=float, default=20, help="stand-in server latency per response")
+    p.add_argument("--page-size", choices=sorted(corpus.SIZES), default="medium")
+    p.add_argument("--out", default="bench_results.json", help="machine-readable results ('-' for stdout only)")
+    p.add_argument("--compare", help="earlier results JSON to compare p50s against")
+    args = p.parse_args(argv)
+
+    results: dict = {}
+    if args.only in (None, "parse"):
+        results.update(bench_parse(corpus.load_corpus(args.corpus), args.iterations))
+    if args.only in (None, "parse_stage"):
+        results.update(bench_parse_stage(corpus.load_corpus(args.corpus)))
+    if args.only in (None, "index"):
+        results.update(bench_index(args.iterations))
+    if args.only in (None, "history"):
+        results.update(bench_history(args.iterations))
+    if args.only in (None, "network"):
+        results.update(bench_network(args.iterations, args.latency_ms, args.page_size))
+    if args.only in (None, "engines"):
+        results.update(bench_engines(max(args.latency_ms, 50)))
+    if args.only in (None, "server"):
+        results.update(bench_server(args.iterations, args.latency_ms))
+    report = {
+        "meta": {"git_rev": _git_rev(), "python": platform.python_version(), "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "iterations": args.iterations,
+                 "latency_ms": args.latency_ms, "corpus": args.corpus or "synthetic"},
+        "results": results,
+    }
+    print_table(results)
+    if args.out != "-":
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
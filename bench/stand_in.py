@@ -0,0 +1,373 @@
+"""
+Local stand-in for the Spotify and YouTube endpoints the resolver calls.
+
+Serves, on one localhost port:
+    POST /api/token                     client-credentials token
+    GET  /v1/tracks/{id}                one track
+    GET  /v1/tracks?ids=a,b,c           several tracks
+    GET  /v1/playlists/{id}/tracks      paginated playlist (size from the ID, e.g. "pl250")
+    GET  /v1/albums/{id}/tracks         paginated album
+    GET  /embed/track/{id}              the public embed page (track data in __NEXT_DATA__, no token)
+    GET  /oembed?url=…/track/{id}       the public oEmbed reply (title only, no token)
+    GET  /results?search_query=…        a synthetic YouTube results page (bench.corpus)
+    POST /youtubei/v1/search            the same results as bare JSON (the JSON search API)
+    GET  /youtube/v3/search, /videos    the same results through the Data API v3 (any ?key=)
+
+Track metadata is derived from the ID, so no fixtures are needed. Each host
+family has its own artificial latency to model round trips. With
+``throttle_every`` N, every Nth Spotify / YouTube request gets a 429 with a
+Retry-After, to exercise the client's rate limiting. Search endpoints and
+metadata pages named in ``broken`` ("html", "innertube", "data_api", "embed",
+"oembed") answer 400, to exercise fallback.
+With ``slow_every`` N, every Nth YouTube search stalls ``slow_ms`` before
+answering (a tail-latency outlier, for hedging).
+
+Run standalone:  python -m bench.stand_in --port 8765 --latency-ms 40
+"""
+
+import argparse
+import functools
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from bench import corpus
+
+
+def track_json(track_id: str) -> dict:
+    n = sum(map(ord, track_id))
+    return {
+        "id": track_id,
+        "type": "track",
+        "name": f"Song {track_id}",
+        "artists": [{"name": f"Artist{n % 97}"}] + ([{"name": f"Feature{n % 13}"}] if n % 3 == 0 else []),
+        "duration_ms": 150000 + (n * 7919) % 150000,
+    }
+
+
+# The real embed page is mostly player markup and scripts around the page data
+_EMBED_FILLER = ("<div class=\"player\">" + "<span class=\"ctl\"></span>" * 400 + "</div>\n"
+                 + "<script>/* player */" + "var a=0;" * 2000 + "</script>\n")
+
+
+@functools.lru_cache(maxsize=256)
+def embed_page(track_id: str) -> bytes:
+    t = track_json(track_id)
+    entity = {"type": "track", "name": t["name"], "uri": f"spotify:track:{track_id}", "id": track_id,
+              "title": t["name"], "artists": [{"name": a["name"], "uri": "spotify:artist:0"} for a in t["artists"]],
+              "duration": t["duration_ms"], "isPlayable": True, "isExplicit": False}
+    data = {"props": {"pageProps": {"state": {"data": {"entity": entity}, "settings": {"theme": "dark"}}}},
+            "page": "/embed/track/[id]", "buildId": "stand-in"}
+    return (f"<!DOCTYPE html><html><head><title>{t['name']}</title></head><body>{_EMBED_FILLER}"
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></body></html>').encode()
+
+
+def oembed_json(track_id: str) -> dict:
+    return {"html": f'<iframe src="https://open.spotify.com/embed/track/{track_id}" width="100%" height="352"></iframe>',
+            "iframe_url": f"https://open.spotify.com/embed/track/{track_id}", "width": 456, "height": 352,
+            "version": "1.0", "provider_name": "Spotify", "provider_url": "https://spotify.com", "type": "rich",
+            "title": track_json(track_id)["name"], "thumbnail_url": "https://i.scdn.co/image/0",
+            "thumbnail_width": 300, "thumbnail_height": 300}
+
+
+@functools.lru_cache(maxsize=256)
+def _page(query: str, layout: str, size: str) -> bytes:
+    return corpus.results_page(query, layout, size, seed=0)
+
+
+@functools.lru_cache(maxsize=256)
+def _search_json(query: str, size: str) -> bytes:
+    return json.dumps(corpus.search_data(query, size, seed=0), ensure_ascii=False).encode()
+
+
+def _text(field: dict) -> str:
+    return field.get("simpleText") or "".join(r["text"] for r in field.get("runs", []))
+
+
+def _iso_duration(length: str) -> str:
+    m, s = length.split(":")
+    return f"PT{int(m)}M{int(s)}S"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+    # Headers and body go out in separate writes; without this, Nagle + delayed
+    # ACK adds ~40 ms per response on loopback and swamps what we measure.
+    disable_nagle_algorithm = True
+    server: "StandInServer"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, body, ctype: str = "application/json") -> None:
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, key: str, nbytes: int = 0) -> None:
+        with self.server.lock:
+            self.server.counts[key] = self.server.counts.get(key, 0) + 1
+            self.server.bytes_sent[key] = self.server.bytes_sent.get(key, 0) + nbytes
+
+    def _throttle(self) -> bool:
+        """Send a 429 instead of the real response for every Nth request (if configured)."""
+        srv = self.server
+        if not srv.throttle_every:
+            return False
+        with srv.lock:
+            srv.served += 1
+            if srv.served % srv.throttle_every:
+                return False
+            srv.counts["throttled"] = srv.counts.get("throttled", 0) + 1
+        body = json.dumps({"error": {"status": 429, "message": "API rate limit exceeded"}}).encode()
+        self.send_response(429)
+        self.send_header("Retry-After", f"{srv.retry_after:g}")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    def _youtube_delay(self) -> None:
+        srv = self.server
+        delay = srv.youtube_latency
+        if srv.slow_every:
+            with srv.lock:
+                srv.searches += 1
+                if srv.searches % srv.slow_every == 0:
+                    delay += srv.slow_ms / 1000
+                    srv.counts["slow"] = srv.counts.get("slow", 0) + 1
+        time.sleep(delay)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if path == "/youtubei/v1/search":
+            self._youtube_delay()
+            if self._throttle() or self._broken("innertube"):
+                return
+            try:
+                query = json.loads(body)["query"]
+            except (ValueError, KeyError, TypeError):
+                self._send(400, {"error": {"code": 400, "message": "Request contains an invalid argument."}})
+                return
+            data = _search_json(query, self.server.page_size)
+            self._count("innertube", len(data))
+            self._send(200, data)
+        elif path == "/api/token":
+            time.sleep(self.server.spotify_latency)
+            self._count("token")
+            self._send(200, {"access_token": f"stand-in-{time.monotonic_ns()}", "token_type": "Bearer",
+                             "expires_in": self.server.token_ttl})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = parse_qs(url.query)
+        if url.path.startswith("/v1/"):
+            time.sleep(self.server.spotify_latency)
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self._send(401, {"error": {"status": 401, "message": "No token provided"}})
+                return
+            if self._throttle():
+                return
+            self._spotify(url.path, q)
+        elif url.path.startswith("/youtube/v3/"):
+            self._youtube_delay()
+            if self._throttle() or self._broken("data_api"):
+                return
+            self._data_api(url.path, q)
+        elif url.path.startswith("/embed/track/") or url.path == "/oembed":
+            time.sleep(self.server.spotify_latency)
+            if self._throttle():
+                return
+            self._open_page(url.path, q)
+        elif url.path == "/results":
+            self._youtube_delay()
+            if self._throttle() or self._broken("html"):
+                return
+            query = (q.get("search_query") or [""])[0]
+            page = _page(query, self.server.layout, self.server.page_size)
+            self._count("results", len(page))
+            self._send(200, page, "text/html; charset=utf-8")
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _open_page(self, path: str, q: dict) -> None:
+        if path == "/oembed":
+            if self._broken("oembed"):
+                return
+            m = re.search(r"/track/([A-Za-z0-9]+)", (q.get("url") or [""])[0])
+            if not m:
+                self._send(404, {"error": "not found"})
+                return
+            body = json.dumps(oembed_json(m.group(1))).encode()
+            self._count("oembed", len(body))
+            self._send(200, body)
+            return
+        if self._broken("embed"):
+            return
+        page = embed_page(path.rsplit("/", 1)[1])
+        self._count("embed", len(page))
+        self._send(200, page, "text/html; charset=utf-8")
+
+    def _broken(self, backend: str) -> bool:
+        if backend not in self.server.broken:
+            return False
+        self._send(400, {"error": {"code": 400, "message": f"stand-in: {backend} disabled"}})
+        return True
+
+    def _data_api(self, path: str, q: dict) -> None:
+        if not (q.get("key") or [""])[0]:
+            self._send(403, {"error": {"code": 403, "message": "The request is missing a valid API key."}})
+            return
+        if path == "/youtube/v3/search":
+            query = (q.get("q") or [""])[0]
+            limit = int((q.get("maxResults") or ["5"])[0])
+            renderers = corpus.videos(corpus.search_data(query, self.server.page_size, seed=0))[:limit]
+            with self.server.lock:
+                for r in renderers:
+                    self.server.video_lengths[r["videoId"]] = r["lengthText"]["simpleText"]
+            items = [{"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": r["videoId"]},
+                      "snippet": {"title": _text(r["title"]).replace("&", "&amp;"),
+                                  "channelTitle": _text(r["ownerText"]), "description": ""}} for r in renderers]
+            body = json.dumps({"kind": "youtube#searchListResponse", "items": items}).encode()
+        elif path == "/youtube/v3/videos":
+            ids = (q.get("id") or [""])[0].split(",")
+            with self.server.lock:
+                lengths = {i: self.server.video_lengths.get(i) for i in ids}
+            items = [{"id": i, "contentDetails": {"duration": _iso_duration(length)}}
+                     for i, length in lengths.items() if length]
+            body = json.dumps({"kind": "youtube#videoListResponse", "items": items}).encode()
+        else:
+            self._send(404, {"error": {"code": 404, "message": "not found"}})
+            return
+        self._count("data_api", len(body))
+        self._send(200, body)
+
+    def _spotify(self, path: str, q: dict) -> None:
+        def send(payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self._count("spotify", len(body))
+            self._send(200, body)
+
+        m = re.fullmatch(r"/v1/tracks/([A-Za-z0-9]+)", path)
+        if m:
+            send(track_json(m.group(1)))
+            return
+        if path == "/v1/tracks":
+            ids = (q.get("ids") or [""])[0].split(",")
+            send({"tracks": [track_json(i) for i in ids if i]})
+            return
+        m = re.fullmatch(r"/v1/(playlists|albums)/([A-Za-z0-9]+)/tracks", path)
+        if m:
+            kind, cid = m.groups()
+            total = int(re.sub(r"\D", "", cid) or 30)
+            offset = int((q.get("offset") or ["0"])[0])
+            limit = int((q.get("limit") or ["50"])[0])
+            tracks = [track_json(f"{cid}t{i}") for i in range(offset, min(total, offset + limit))]
+            items = [{"track": t} for t in tracks] if kind == "playlists" else tracks
+            nxt = None
+            if offset + limit < total:
+                nxt = f"http://{self.headers.get('Host')}{path}?offset={offset + limit}&limit={limit}"
+            send({"items": items, "next": nxt, "total": total})
+            return
+        self._count("spotify")
+        self._send(404, {"error": {"status": 404, "message": "Non existing id"}})
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Hundreds of clients connect at once in the engine benchmarks
+    request_queue_size = 1024
+
+    def __init__(self, port: int = 0, spotify_latency_ms: float = 0, youtube_latency_ms: float = 0,
+                 layout: str = "var", page_size: str = "medium", token_ttl: int = 3600,
+                 throttle_every: int = 0, retry_after: float = 1.0, broken: tuple = (),
+                 slow_every: int = 0, slow_ms: float = 0):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.spotify_latency = spotify_latency_ms / 1000
+        self.youtube_latency = youtube_latency_ms / 1000
+        self.layout = layout
+        self.page_size = page_size
+        self.token_ttl = token_ttl
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.served = 0
+        self.slow_every = slow_every
+        self.slow_ms = slow_ms
+        self.searches = 0
+        self.broken = set(broken)
+        self.video_lengths: dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+        self.bytes_sent: dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def handle_error(self, request, client_address):
+        # Clients hang up mid-response on purpose (early exit, cancellation)
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def resolver_kwargs(self) -> dict:
+        """Keyword arguments that point a Resolver at this server."""
+        return {"spotify_accounts_base": self.base_url, "spotify_api_base": self.base_url,
+                "spotify_open_base": self.base_url, "youtube_base": self.base_url, "youtube_api_base": self.base_url}
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Local Spotify/YouTube stand-in server")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--latency-ms", type=float, default=0, help="added to every Spotify and YouTube response")
+    p.add_argument("--layout", choices=sorted(corpus.LAYOUTS), default="var")
+    p.add_argument("--page-size", choices=sorted(corpus.SIZES), default="medium")
+    p.add_argument("--throttle-every", type=int, default=0, help="answer every Nth API request with a 429")
+    p.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with those 429s")
+    p.add_argument("--slow-every", type=int, default=0, help="stall every Nth YouTube search by --slow-ms")
+    p.add_argument("--slow-ms", type=float, default=3000, help="extra delay of those stalled searches")
+    p.add_argument("--broken", default="",
+                   help="comma-separated search backends / metadata pages to fail (html,innertube,data_api,embed,oembed)")
+    args = p.parse_args(argv)
+    srv = StandInServer(args.port, args.latency_ms, args.latency_ms, args.layout, args.page_size,
+                        throttle_every=args.throttle_every, retry_after=args.retry_after,
+                        broken=tuple(b for b in args.broken.split(",") if b),
+                        slow_every=args.slow_every, slow_ms=args.slow_ms)
+    print(f"Stand-in listening on {srv.base_url} (set S2Y_SPOTIFY_ACCOUNTS_BASE / S2Y_SPOTIFY_API_BASE / "
+          f"S2Y_SPOTIFY_OPEN_BASE / S2Y_YOUTUBE_BASE / S2Y_YOUTUBE_API_BASE to it)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
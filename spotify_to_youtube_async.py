@@ -0,0 +1,686 @@
+"""
+spotify_to_youtube_async.py — asyncio engine for the resolver (settings "engine": "asyncio")
+
+The token fetch, Spotify metadata and YouTube search run as coroutines over
+one small stdlib HTTP/1.1 client (AsyncHttpClient: keep-alive pools per host,
+gzip, redirects), all on a single event-loop thread. A playlist with hundreds
+of tracks in flight costs tasks and sockets, not threads.
+
+Everything else is shared with the Resolver it wraps: credentials and the
+cached token, the metadata providers and their cooldowns, the rate limiter
+(same buckets, Retry-After pauses and retries), the track cache and song
+index, ranking, search backends and their cooldowns, the parse stage and
+StageStats. Cache and song-index calls (SQLite, the lazily built index) run
+on worker threads so a slow disk never stalls the loop. Hedged searches
+(hedge_mode) are a threads-engine feature; here the "youtube" stage timeout
+bounds a stalled search instead.
+
+The requests themselves, and what is done with each response, are the
+Resolver's own request flows (see core.HttpCall); only the I/O differs. Each
+request runs under its stage's ("token", "spotify", "youtube") asyncio.wait_for,
+so a timeout or a cancelled task stops it wherever it is waiting (a socket
+read, a rate-limit sleep) and closes that connection.
+
+    AsyncResolver    the coroutines (resolve_track, resolve_many, search, …)
+    AsyncEngine      the loop thread: submit() / submit_latest() for the GUI,
+                     whose results reach Tk through a TkBatcher, and blocking
+                     resolve_track / resolve_many wrappers with Resolver's
+                     signatures for the CLI, export and server
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import threading
+import time
+import zlib
+from concurrent.futures import CancelledError, Future, wait
+from typing import Awaitable, Callable, Collection, Iterable, Optional
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from spotify_to_youtube_core import (
+    BROWSER_HEADERS,
+    SPOTIFY_IDS_BATCH,
+    Cancelled,
+    HttpCall,
+    NeedToken,
+    Resolver,
+    TrackMeta,
+    _account,
+    _batch_metas,
+    _collection_page_flow,
+    _collection_request,
+    _ms_since,
+    _spotify_get_flow,
+    _token_flow,
+    _tracks_flow,
+    build_query,
+    extract_spotify_ref,
+    extract_track_id,
+    failed_result,
+    parse_candidates,
+)
+
+# Seconds one request of a stage may take, rate-limit waits and retries included
+STAGE_TIMEOUTS = {"token": 30.0, "spotify": 60.0, "youtube": 60.0}
+STAGE_LABELS = {"token": "Spotify sign-in", "spotify": "Spotify lookup", "youtube": "YouTube search"}
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# StreamReader buffer; header lines and chunk-size lines must fit
+STREAM_LIMIT = 256 * 1024
+# Largest body (after decompression) a response may have; a results page is ~1 MB
+MAX_RESPONSE_BYTES = 16 * 1024 * 1024
+# How often a blocking wrapper re-checks its caller's cancel event
+CANCEL_POLL_S = 0.05
+
+
+class HttpError(RuntimeError):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ResponseTooLarge(RuntimeError):
+    """The body was bigger than the client's max_response_bytes; not retried."""
+
+
+class HttpResponse:
+    """A finished response: the whole body, already decoded from gzip / deflate."""
+
+    def __init__(self, status_code: int, reason: str, headers: http.client.HTTPMessage, content: bytes, url: str):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise HttpError(f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}", self.status_code)
+
+    def close(self) -> None:
+        pass  # the body has been read and the connection is back in its pool
+
+
+def _close(conn: tuple) -> None:
+    try:
+        conn[1].close()
+    except Exception:
+        pass
+
+
+def _decompress(data: bytes, wbits: int, max_bytes: int) -> bytes:
+    """Inflate at most one byte past ``max_bytes`` (so a compression bomb stops there)."""
+    return zlib.decompressobj(wbits).decompress(data, max_bytes + 1)
+
+
+class AsyncHttpClient:
+    """A small HTTP/1.1 client on asyncio streams, with a keep-alive pool per origin.
+
+    At most ``max_per_host`` connections are open to one origin; more requests
+    wait for a free one. ``timeout`` covers one exchange (connect, send, read)
+    and a cancelled caller closes its connection rather than returning it.
+    Network and protocol failures raise ConnectionError, timeouts
+    asyncio.TimeoutError (what RateLimiter.request_async retries); a body
+    over ``max_response_bytes`` (before or after decoding) ResponseTooLarge.
+    """
+
+    def __init__(self, max_per_host: int = 32, max_response_bytes: int = MAX_RESPONSE_BYTES):
+        self.max_per_host = max(1, int(max_per_host))
+        self.max_response_bytes = max_response_bytes
+        self._idle: dict[tuple, list[tuple]] = {}
+        self._slots: dict[tuple, asyncio.Semaphore] = {}
+        self._ssl = None
+
+    async def request(self, method: str, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                      data=None, timeout: float = 20.0) -> HttpResponse:
+        if params:
+            url += ("&" if urlsplit(url).query else "?") + urlencode(params)
+        hdrs = {"Accept": "*/*", "Accept-Encoding": "gzip, deflate"}
+        if isinstance(data, dict):
+            body = urlencode(data).encode()
+            hdrs["Content-Type"] = "application/x-www-form-urlencoded"
+        else:
+            body = data.encode() if isinstance(data, str) else (data or b"")
+        hdrs.update(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = await asyncio.wait_for(self._exchange(method, url, hdrs, body), timeout)
+            location = resp.headers.get("Location")
+            if resp.status_code not in REDIRECT_STATUSES or not location:
+                return resp
+            url = urljoin(url, location)
+            if resp.status_code == 303 or (resp.status_code in (301, 302) and method == "POST"):
+                method, body = "GET", b""
+                hdrs.pop("Content-Type", None)
+        raise RuntimeError(f"Too many redirects for {url}")
+
+    async def _exchange(self, method: str, url: str, headers: dict, body: bytes) -> HttpResponse:
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if secure else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        head = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}", *(f"{k}: {v}" for k, v in headers.items())]
+        if body or method in ("POST", "PUT"):
+            head.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+        slots = self._slots.get(origin)
+        if slots is None:
+            slots = self._slots[origin] = asyncio.Semaphore(self.max_per_host)
+        async with slots:
+            for attempt in range(2):
+                conn, reused = await self._connection(origin, secure)
+                try:
+                    conn[1].write(request)
+                    await conn[1].drain()
+                    resp, keep = await self._read_response(conn[0], method, url, self.max_response_bytes)
+                except (OSError, EOFError, ValueError, asyncio.LimitOverrunError) as e:
+                    _close(conn)
+                    if reused and attempt == 0:
+                        continue  # the server had dropped that idle keep-alive connection
+                    raise ConnectionError(f"{method} {url}: {e or type(e).__name__}") from e
+                except BaseException:
+                    _close(conn)  # cancelled or timed out mid-exchange: the stream is in an unknown state
+                    raise
+                if keep:
+                    self._idle.setdefault(origin, []).append(conn)
+                else:
+                    _close(conn)
+                return resp
+        raise AssertionError("unreachable")
+
+    async def _connection(self, origin: tuple, secure: bool) -> tuple[tuple, bool]:
+        """(reader, writer) and whether it's a reused keep-alive connection."""
+        idle = self._idle.get(origin)
+        while idle:
+            conn = idle.pop()
+            if not conn[0].at_eof() and not conn[1].is_closing():
+                return conn, True
+            _close(conn)
+        ssl_ctx = None
+        if secure:
+            if self._ssl is None:
+                import ssl
+                self._ssl = ssl.create_default_context()
+            ssl_ctx = self._ssl
+        try:
+            conn = await asyncio.open_connection(origin[1], origin[2], ssl=ssl_ctx, limit=STREAM_LIMIT)
+        except OSError as e:
+            raise ConnectionError(f"Cannot connect to {origin[1]}:{origin[2]}: {e}") from e
+        return conn, False
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, method: str, url: str,
+                             max_bytes: int) -> tuple[HttpResponse, bool]:
+        def too_large() -> ResponseTooLarge:
+            return ResponseTooLarge(f"{method} {url}: response body over {max_bytes} bytes")
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("connection closed before the response")
+            version, _, rest = line.decode("latin-1").rstrip("\r\n").partition(" ")
+            code, _, reason = rest.partition(" ")
+            status = int(code)
+            raw = []
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                raw.append(line)
+            if not 100 <= status < 200:
+                break  # skip interim (1xx) responses
+        headers = http.client.parse_headers(io.BytesIO(b"".join(raw) + b"\r\n"))
+        keep = version == "HTTP/1.1" and "close" not in (headers.get("Connection") or "").lower()
+        if method == "HEAD" or status in (204, 304):
+            content = b""
+        elif "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+            chunks = []
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                total += size
+                if size < 0 or total > max_bytes:
+                    raise too_large()
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b"".join(chunks)
+        elif headers.get("Content-Length") is not None:
+            length = int(headers["Content-Length"])
+            if length > max_bytes:
+                raise too_large()
+            content = await reader.readexactly(length)
+        else:
+            body, keep = bytearray(), False
+            while len(body) <= max_bytes:
+                more = await reader.read(max_bytes + 1 - len(body))
+                if not more:
+                    break
+                body += more
+            content = bytes(body)
+        encoding = (headers.get("Content-Encoding") or "").lower()
+        if encoding in ("gzip", "x-gzip"):
+            content = _decompress(content, 16 + zlib.MAX_WBITS, max_bytes)
+        elif encoding == "deflate":
+            try:
+                content = _decompress(content, zlib.MAX_WBITS, max_bytes)
+            except zlib.error:
+                content = _decompress(content, -zlib.MAX_WBITS, max_bytes)
+        if len(content) > max_bytes:
+            raise too_large()
+        return HttpResponse(status, reason, headers, content, url), keep
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                _close(conn)
+
+
+def _errors_only(results: list) -> list:
+    """gather(return_exceptions=True) results, re-raising anything that isn't an Exception (a cancellation)."""
+    for res in results:
+        if isinstance(res, BaseException) and not isinstance(res, Exception):
+            raise res
+    return results
+
+
+class AsyncResolver:
+    """Resolver's lookups as coroutines; must be used from one event loop (see AsyncEngine).
+
+    ``concurrency`` caps the tracks of one resolve_many in flight at once
+    (default: the resolver's); ``timeouts`` overrides STAGE_TIMEOUTS.
+    """
+
+    def __init__(self, resolver: Resolver, http: Optional[AsyncHttpClient] = None,
+                 concurrency: Optional[int] = None, timeouts: Optional[dict] = None):
+        self.resolver = resolver
+        self.concurrency = max(1, int(concurrency or resolver.concurrency))
+        self.http = http or AsyncHttpClient(max_per_host=max(8, self.concurrency))
+        self.timeouts = dict(STAGE_TIMEOUTS, **(timeouts or {}))
+        self._token_lock = asyncio.Lock()
+
+    async def _stage(self, name: str, aw: Awaitable):
+        try:
+            return await asyncio.wait_for(aw, self.timeouts[name])
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"{STAGE_LABELS[name]} timed out after {self.timeouts[name]:g} s.") from None
+
+    async def _send(self, method: str, url: str, **kwargs) -> HttpResponse:
+        limiter = self.resolver.limiter
+        if limiter is None:
+            return await self.http.request(method, url, **kwargs)
+        return await limiter.request_async(self.http.request, method, url, **kwargs)
+
+    async def _drive(self, flow, meter: Optional[dict] = None):
+        """core.run_flow on this loop: each HttpCall (and NeedToken) under its stage timeout."""
+        t0 = time.perf_counter()
+        if meter is not None:
+            meter.update(fetch_ms=0.0, bytes=0)
+        reply = error = None
+        try:
+            while True:
+                try:
+                    step = flow.send(reply) if error is None else flow.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                reply = error = None
+                try:
+                    if isinstance(step, NeedToken):
+                        reply = await self._stage("token", self.token(step.rejected))
+                    else:
+                        reply = await self._stage(step.stage, self._call(step, meter))
+                except Exception as e:
+                    error = e
+        finally:
+            flow.close()
+            if meter is not None:
+                meter["parse_ms"] = max(0.0, (time.perf_counter() - t0) * 1000 - meter["fetch_ms"])
+
+    async def _call(self, call: HttpCall, meter: Optional[dict]):
+        t0 = time.perf_counter()
+        resp = await self._send(call.method, call.url, params=call.params, headers=call.headers, data=call.data,
+                                timeout=call.timeout)
+        _account(call, resp, _ms_since(t0), meter, self.resolver.stats)
+        if call.markers is None:
+            return resp
+        resp.raise_for_status()
+        return await self._parse(resp.content, call.limit, call.markers)
+
+    async def token(self, rejected: Optional[str] = None) -> str:
+        """The resolver's cached token, else a new one from a single POST (other tasks wait for it)."""
+        r = self.resolver
+        token = r.cached_token()
+        if token and token != rejected:
+            return token
+        async with self._token_lock:
+            token = r.cached_token()
+            if token and token != rejected:
+                return token
+            token, expires_in = await self._drive(_token_flow(r.spotify_accounts_base, r.client_id, r.client_secret))
+            r.store_token(token, expires_in)
+            return token
+
+    async def spotify_get(self, path: str, params: Optional[dict] = None) -> dict:
+        """GET a Web API path (or an absolute ``next`` URL); a 401 gets one fresh token and a retry."""
+        return await self._drive(_spotify_get_flow(self.resolver.spotify_api_base, path, params))
+
+    async def fetch_track_meta(self, spotify_url: str) -> tuple[str, str, Optional[int]]:
+        """Resolver.fetch_track_meta's provider chain: first title + artist wins, else the first title."""
+        track_id = extract_track_id(spotify_url)
+        if not track_id:
+            raise ValueError("Please paste a valid Spotify *track* URL.")
+        return await self._drive(self.resolver.track_meta_flow(track_id))
+
+    async def fetch_tracks(self, track_ids: list[str]) -> list[TrackMeta]:
+        """(track_id, title, artist, duration_ms) for the tracks fetch_track_metas found; the rest are left out."""
+        metas = await self.fetch_track_metas(track_ids)
+        return [(t, *meta) for t, meta in metas.items() if not isinstance(meta, Exception)]
+
+    async def fetch_track_metas(self, track_ids: list[str]) -> dict:
+        """Resolver.fetch_track_metas as a coroutine: the /v1/tracks?ids= batches (or the
+        per-track provider chains) all run at once.
+        """
+        r = self.resolver
+        if not r.use_batch_meta(track_ids):
+            metas = await asyncio.gather(*(self._drive(r.track_meta_flow(t)) for t in track_ids),
+                                         return_exceptions=True)
+            return dict(zip(track_ids, _errors_only(metas)))
+        batches = [track_ids[i:i + SPOTIFY_IDS_BATCH] for i in range(0, len(track_ids), SPOTIFY_IDS_BATCH)]
+        pages = await asyncio.gather(*(self._drive(_tracks_flow(r.spotify_api_base, b)) for b in batches),
+                                     return_exceptions=True)
+        metas: dict = {}
+        for batch, page in zip(batches, _errors_only(pages)):
+            metas.update(dict.fromkeys(batch, page) if isinstance(page, Exception) else _batch_metas(batch, page))
+        return metas
+
+    async def iter_tracks(self, spotify_urls: Iterable[str]):
+        """Async generator of (track_id, title, artist, duration_ms) batches, like Resolver.iter_tracks."""
+        track_ids: list[str] = []
+        for url in spotify_urls:
+            ref = extract_spotify_ref(url)
+            if ref is None:
+                raise ValueError(f"Not a Spotify track, playlist or album URL: {url}")
+            kind, ref_id = ref
+            if kind == "track":
+                track_ids.append(ref_id)
+                continue
+            async for page in self.iter_collection_tracks(kind, ref_id):
+                yield page
+        if track_ids:
+            yield await self.fetch_tracks(track_ids)
+
+    async def iter_collection_tracks(self, kind: str, collection_id: str):
+        """Async generator of a playlist's or album's pages, like Resolver.iter_collection_tracks."""
+        path, params = _collection_request(kind, collection_id)
+        while path:
+            page, path = await self._drive(_collection_page_flow(self.resolver.spotify_api_base, kind, path, params))
+            params = None
+            yield page
+
+    async def search(self, query: str, meter: Optional[dict] = None) -> tuple[list[dict], Optional[str]]:
+        """(candidates, backend name) from the first backend that answers, sharing the resolver's cooldowns."""
+        r = self.resolver
+        return await self._drive(r.search_flow(query, r.search_order()), meter)
+
+    async def _parse(self, data: bytes, limit: int, markers) -> list[dict]:
+        """parse_candidates off the loop thread: in the parse stage's process pool, else a worker thread."""
+        parse = self.resolver.parse
+        executor = parse._executor() if parse.mode == "process" else None
+        return await asyncio.get_running_loop().run_in_executor(executor, parse_candidates, data, limit,
+                                                                tuple(markers))
+
+    async def _finish(self, track_id: str, title: str, artist: str, duration_ms: Optional[int],
+                      timings: dict) -> dict:
+        r = self.resolver
+        query = build_query(title, artist)
+        hit = await self._off_loop(r.song_hit, track_id, title, artist, duration_ms, query, timings)
+        if hit is not None:
+            return hit
+        meter = {} if r.stats is not None else None
+        t0 = time.perf_counter()
+        candidates, backend = await self.search(query, meter)
+        timings["youtube_ms"] = _ms_since(t0)
+        return await self._off_loop(r.pick_result, track_id, title, artist, duration_ms, query, candidates, backend,
+                                    timings, meter)
+
+    async def _off_loop(self, fn: Callable, *args):
+        """Run a Resolver step that reads or writes the cache (SQLite, song index) on a worker thread."""
+        if self.resolver.cache is None:
+            return fn(*args)  # nothing on disk to wait for
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def resolve_track(self, spotify_url: str) -> dict:
+        """Resolver.resolve_track as a coroutine."""
+        r = self.resolver
+        track_id = extract_track_id(spotify_url)
+        if not track_id:
+            raise ValueError("Please paste a valid Spotify *track* URL.")
+        hit = await self._off_loop(r.cached_result, track_id)
+        if hit is not None:
+            return hit
+        r.check_credentials([spotify_url])
+        t0 = time.perf_counter()
+        title, artist, duration_ms = await self.fetch_track_meta(spotify_url)
+        return await self._finish(track_id, title, artist, duration_ms, {"spotify_ms": _ms_since(t0)})
+
+    async def resolve_many(self, spotify_urls: Iterable[str], on_result: Optional[Callable[[dict], None]] = None,
+                           skip: Collection[str] = ()) -> list[dict]:
+        """Resolver.resolve_many as a coroutine: one task per track, ``concurrency`` searching at once.
+
+        ``on_result`` runs on the loop thread. Cancelling the call cancels every track still in flight.
+        """
+        r = self.resolver
+        results: list[dict] = []
+        slots = asyncio.Semaphore(self.concurrency)
+
+        def emit(res: dict) -> None:
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
+
+        async def work(index: int, track_id: str, title: str, artist: str, duration_ms: Optional[int]) -> None:
+            timings: dict = {}
+            async with slots:
+                try:
+                    res = await self._finish(track_id, title, artist, duration_ms, timings)
+                except Exception as e:
+                    res = failed_result(track_id, e, title, artist, timings)
+            res["index"] = index
+            emit(res)
+
+        # Numbered in one pass over the expanded input, like Resolver.resolve_many
+        spotify_urls = list(spotify_urls)
+        refs = []
+        for url in spotify_urls:
+            ref = extract_spotify_ref(url)
+            if ref is None:
+                raise ValueError(f"Not a Spotify track, playlist or album URL: {url}")
+            refs.append(ref)
+        collections = [url for url, ref in zip(spotify_urls, refs) if ref[0] != "track"]
+        if collections:
+            r.check_credentials(collections)
+        deferred: list[tuple[int, str]] = []
+        tasks: list[asyncio.Task] = []
+
+        async def take(entries: list[tuple[int, str, Optional[tuple]]]) -> None:
+            """(index, track_id, metadata or None) in input order; one cache round trip for all of them."""
+            entries = [e for e in entries if e[1] not in skip]
+            hits = await self._off_loop(lambda: [r.cached_result(track_id) for _, track_id, _ in entries])
+            for (index, track_id, meta), hit in zip(entries, hits):
+                if hit is not None:
+                    hit["index"] = index
+                    emit(hit)
+                elif meta is None:
+                    deferred.append((index, track_id))
+                else:
+                    tasks.append(asyncio.ensure_future(work(index, track_id, *meta)))
+
+        try:
+            index = 0
+            for kind, ref_id in refs:
+                if kind == "track":
+                    await take([(index, ref_id, None)])
+                    index += 1
+                    continue
+                async for page in self.iter_collection_tracks(kind, ref_id):
+                    await take([(index + i, track_id, tuple(meta)) for i, (track_id, *meta) in enumerate(page)])
+                    index += len(page)
+            if deferred:
+                r.check_credentials()
+                metas = await self.fetch_track_metas(list(dict.fromkeys(t for _, t in deferred)))
+                for index, track_id in deferred:
+                    meta = metas[track_id]
+                    if isinstance(meta, Exception):
+                        emit(dict(failed_result(track_id, meta), index=index))
+                    else:
+                        tasks.append(asyncio.ensure_future(work(index, track_id, *meta)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        results.sort(key=lambda res: res["index"])
+        return results
+
+    async def warm_up(self) -> None:
+        """Open keep-alive connections and fetch a token (if credentials are set)."""
+        r = self.resolver
+        for base in dict.fromkeys([p.base for p in r.meta_order()] + [r.spotify_api_base, r.youtube_base]):
+            try:
+                await self.http.request("HEAD", base, headers=BROWSER_HEADERS, timeout=5)
+            except Exception:
+                pass
+        if r.client_id and r.client_secret:
+            try:
+                await self._stage("token", self.token())
+            except Exception:
+                pass
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+
+class AsyncJob:
+    """One lookup from AsyncEngine.submit_latest; superseded as soon as a newer one is submitted."""
+
+    def __init__(self, engine: "AsyncEngine", key):
+        self.engine = engine
+        self.key = key
+        self.future: Optional[Future] = None
+        self.cancelled = False
+
+    def is_current(self) -> bool:
+        """True while no newer job has been submitted; only then may results reach the UI."""
+        return not self.cancelled and self.engine._latest is self
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class AsyncEngine:
+    """An AsyncResolver on its own event-loop thread.
+
+    ``submit`` schedules a coroutine from any thread and returns a
+    concurrent.futures.Future; ``resolve_track`` / ``resolve_many`` block on
+    one, with Resolver's signatures (a set ``cancel`` event cancels the task and
+    raises Cancelled), so the engine can stand in for a Resolver in the CLI,
+    export and server; ``stats``, ``limiter`` and ``hedger`` are the
+    resolver's. ``close`` closes the resolver too.
+    """
+
+    def __init__(self, resolver: Resolver, concurrency: Optional[int] = None, timeouts: Optional[dict] = None):
+        self.resolver = resolver
+        self.loop = asyncio.new_event_loop()
+        self.aresolver = AsyncResolver(resolver, concurrency=concurrency, timeouts=timeouts)
+        self._latest: Optional[AsyncJob] = None
+        self._thread = threading.Thread(target=self.loop.run_forever, name="s2y-asyncio", daemon=True)
+        self._thread.start()
+
+    @property
+    def stats(self):
+        return self.resolver.stats
+
+    @property
+    def limiter(self):
+        return self.resolver.limiter
+
+    @property
+    def hedger(self):
+        return self.resolver.hedger
+
+    def submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def submit_latest(self, key, make: Callable[[AsyncJob], Awaitable],
+                      on_done: Callable[[AsyncJob], None]) -> AsyncJob:
+        """FetchScheduler.submit for coroutines: the previous job is cancelled unless it has the same key.
+
+        ``make(job)`` builds the coroutine; ``on_done(job)`` runs on the loop thread
+        once it finishes (or is cancelled). Call from one thread (Tk's).
+        """
+        latest = self._latest
+        if latest is not None and latest.key == key and latest.is_current():
+            return latest
+        if latest is not None:
+            latest.cancel()
+        job = self._latest = AsyncJob(self, key)
+        job.future = self.submit(make(job))
+        job.future.add_done_callback(lambda _fut: on_done(job))
+        return job
+
+    def cancel_all(self) -> None:
+        if self._latest is not None:
+            self._latest.cancel()
+
+    def run(self, coro, cancel: Optional[threading.Event] = None):
+        """Run ``coro`` on the loop and wait for it (not from the loop thread)."""
+        fut = self.submit(coro)
+        while not wait([fut], CANCEL_POLL_S if cancel is not None else None).done:
+            if cancel.is_set():
+                fut.cancel()
+                raise Cancelled()
+        try:
+            return fut.result()
+        except CancelledError:
+            raise Cancelled() from None
+
+    def resolve_track(self, spotify_url: str, cancel: Optional[threading.Event] = None) -> dict:
+        return self.run(self.aresolver.resolve_track(spotify_url), cancel)
+
+    def resolve_many(self, spotify_urls: Iterable[str], on_result: Optional[Callable[[dict], None]] = None,
+                     cancel: Optional[threading.Event] = None, skip: Collection[str] = ()) -> list[dict]:
+        return self.run(self.aresolver.resolve_many(list(spotify_urls), on_result, skip), cancel)
+
+    def warm_up(self) -> None:
+        self.run(self.aresolver.warm_up())
+        r = self.resolver
+        if r.cache is not None and r.fuzzy_threshold > 0:
+            r.cache.warm_index()
+        r.parse.warm_up()
+
+    async def _shutdown(self) -> None:
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.aresolver.aclose()
+
+    def close(self) -> None:
+        if self.loop.is_running():
+            try:
+                self.submit(self._shutdown()).result(timeout=2)
+            except Exception:
+                pass
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
+        self.resolver.close()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+spotify_to_youtube_cli.py — headless / batch mode
+
+Resolves Spotify track, playlist and album URLs to YouTube links without
+importing tkinter, so it runs from cron or a bot on a box with no display.
+One JSON object per track is written to stdout as soon as that track is done.
+
+Usage:
+    python spotify_to_youtube_cli.py URL [URL ...]
+    python spotify_to_youtube_cli.py --file urls.txt
+    some_bot | python spotify_to_youtube_cli.py -
+    python spotify_to_youtube_cli.py --export out.m3u [--resume] PLAYLIST_URL   (.m3u / .csv / .jsonl)
+    python spotify_to_youtube_cli.py --serve [--port 8770]   (local HTTP service, see spotify_to_youtube_server.py)
+
+Credentials come from --client-id/--client-secret, then the SPOTIFY_CLIENT_ID /
+SPOTIFY_CLIENT_SECRET environment variables, then the GUI's settings.json.
+Track URLs resolve without any (--metadata embed reads Spotify's public embed
+page); playlists and albums need them.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from typing import Iterable, Iterator, Optional, TextIO
+
+from spotify_to_youtube_core import (
+    DEFAULT_SETTINGS,
+    Resolver,
+    load_settings,
+    open_track_cache,
+    rate_limiter_for,
+    resolve_records,
+)
+from spotify_to_youtube_stats import StageStats
+
+
+def _iter_lines(f: TextIO) -> Iterator[str]:
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def resolve_urls(resolver: Resolver, urls: Iterable[str], out: TextIO, batch: bool = True) -> int:
+    """Write one JSONL record per resolved track to ``out``; returns the number of failures."""
+    failures = 0
+    lock = threading.Lock()
+
+    def write(rec: dict) -> None:
+        nonlocal failures
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with lock:  # results arrive from the resolver's worker threads
+            if rec["error"]:
+                failures += 1
+            out.write(line)
+            out.flush()
+
+    resolve_records(resolver, urls, write, batch=batch)
+    return failures
+
+
+def export_to_file(resolver: Resolver, urls: list[str], path: str, fmt: Optional[str] = None,
+                   resume: bool = False) -> int:
+    """Stream every track into an M3U / CSV / JSONL file; returns the exit code."""
+    from spotify_to_youtube_export import export_urls
+    try:
+        writer = export_urls(resolver, urls, path, fmt, resume=resume)
+    except (OSError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 2
+    skipped = f", {writer.skipped} already there" if writer.skipped else ""
+    print(f"Exported {writer.written} tracks to {path} ({writer.failed} not found{skipped}).", file=sys.stderr)
+    return 1 if writer.failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Resolve Spotify URLs to YouTube links (JSONL on stdout).")
+    p.add_argument("urls", nargs="*", help="Spotify track/playlist/album URLs; '-' reads them from stdin")
+    p.add_argument("-f", "--file", help="read URLs from this file, one per line")
+    p.add_argument("--client-id", default=None, help="Spotify Client ID (default: $SPOTIFY_CLIENT_ID or settings)")
+    p.add_argument("--client-secret", default=None,
+                   help="Spotify Client Secret (default: $SPOTIFY_CLIENT_SECRET or settings)")
+    p.add_argument("--concurrency", type=int, default=None, help="parallel YouTube searches")
+    p.add_argument("--no-cache", action="store_true", help="don't read or write the local resolution cache")
+    p.add_argument("--backend", default=None,
+                   help="YouTube search backends to try in order, e.g. 'innertube,html' or 'data_api,html' "
+                        "(default: settings, else innertube,html)")
+    p.add_argument("--metadata", default=None,
+                   help="where track title + artist come from, in order, e.g. 'embed,api,oembed' or 'api' "
+                        "(default: settings, else embed,api,oembed; embed and oembed need no credentials)")
+    p.add_argument("--youtube-api-key", default=None,
+                   help="YouTube Data API v3 key for the data_api backend (default: $YOUTUBE_API_KEY or settings)")
+    p.add_argument("--parse", choices=["thread", "process"], default=None,
+                   help="parse YouTube responses on the search threads or in a process pool (default: settings)")
+    p.add_argument("--hedge", choices=["off", "fixed", "adaptive"], default=None,
+                   help="race a second YouTube search when the first is slow: after hedge_delay_ms (fixed) or the "
+                        "recent p95 (adaptive), capped by hedges_per_min (default: settings, else off)")
+    p.add_argument("--engine", choices=["threads", "asyncio"], default=None,
+                   help="run lookups on worker threads or as coroutines on one event loop; with asyncio, "
+                        "--concurrency is the tracks in flight (default: settings, else threads)")
+    p.add_argument("--stats", action="store_true",
+                   help="print per-stage timings and per-host request counters (waits, 429s, retries) to stderr "
+                        "when done (S2Y_STATS_FILE / S2Y_STATS_LOG export them)")
+    exp = p.add_argument_group("export")
+    exp.add_argument("--export", metavar="PATH", default=None,
+                     help="write the tracks to an M3U / CSV / JSONL file (by extension) instead of stdout, "
+                          "flushed as they resolve")
+    exp.add_argument("--format", choices=["m3u", "csv", "jsonl"], default=None,
+                     help="export format when the extension doesn't say")
+    exp.add_argument("--resume", action="store_true",
+                     help="keep an existing export file and only resolve the tracks it doesn't have yet")
+    srv = p.add_argument_group("service mode")
+    srv.add_argument("--serve", action="store_true", help="serve GET/POST /resolve on localhost instead")
+    srv.add_argument("--host", default=None, help="address to bind (default: 127.0.0.1)")
+    srv.add_argument("--port", type=int, default=None, help="port to listen on (default: 8770)")
+    srv.add_argument("--workers", type=int, default=None, help="connections handled at once (default: 32)")
+    srv.add_argument("-v", "--verbose", action="store_true", help="log each HTTP request to stderr")
+    return p
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    settings = load_settings()
+    client_id = args.client_id or os.environ.get("SPOTIFY_CLIENT_ID") or settings["client_id"]
+    client_secret = args.client_secret or os.environ.get("SPOTIFY_CLIENT_SECRET") or settings["client_secret"]
+    concurrency = args.concurrency or settings.get("youtube_concurrency", DEFAULT_SETTINGS["youtube_concurrency"])
+    cache = None if args.no_cache else open_track_cache(settings)
+    resolver = Resolver(client_id, client_secret, cache=cache, concurrency=concurrency,
+                        candidates=settings.get("youtube_candidates", DEFAULT_SETTINGS["youtube_candidates"]),
+                        limiter=rate_limiter_for(settings), stats=StageStats() if args.stats else None,
+                        search_backends=args.backend or settings["search_backends"],
+                        youtube_api_key=(args.youtube_api_key or os.environ.get("YOUTUBE_API_KEY")
+                                         or settings["youtube_api_key"]),
+                        fuzzy_threshold=settings["fuzzy_threshold"],
+                        parse_mode=args.parse or settings["parse_mode"], parse_workers=settings["parse_workers"],
+                        hedge_mode=args.hedge or settings["hedge_mode"], hedge_delay_ms=settings["hedge_delay_ms"],
+                        hedges_per_min=settings["hedges_per_min"],
+                        metadata_providers=args.metadata or settings["metadata_providers"])
+    if (args.engine or settings["engine"]) == "asyncio":
+        from spotify_to_youtube_async import AsyncEngine
+        # Stands in for the Resolver below (blocking wrappers over the loop thread); closes it too
+        resolver = AsyncEngine(resolver, concurrency=args.concurrency or settings["async_concurrency"])
+
+    if args.serve:
+        from spotify_to_youtube_server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WORKERS, serve
+        try:
+            return serve(resolver, args.host or DEFAULT_HOST, args.port or DEFAULT_PORT,
+                         args.workers or DEFAULT_WORKERS, args.verbose)
+        finally:
+            resolver.close()
+
+    urls = [u for u in args.urls if u != "-"]
+    from_stdin = "-" in args.urls or (not args.urls and not args.file and not sys.stdin.isatty())
+    try:
+        failures = 0
+        if args.file:
+            with open(args.file, "r", encoding="utf-8") as f:
+                urls.extend(_iter_lines(f))
+        if args.export:
+            if from_stdin:
+                urls.extend(_iter_lines(sys.stdin))
+            if not urls:
+                build_parser().print_usage(sys.stderr)
+                return 2
+            return export_to_file(resolver, urls, args.export, args.format, args.resume)
+        if urls:
+            failures += resolve_urls(resolver, urls, sys.stdout)
+        if from_stdin:
+            # Line by line so a bot piping URLs in gets each answer straight away
+            failures += resolve_urls(resolver, _iter_lines(sys.stdin), sys.stdout, batch=False)
+        elif not urls:
+            build_parser().print_usage(sys.stderr)
+            return 2
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if args.stats:
+            report = {"stages": resolver.stats.snapshot(),
+                      "requests": resolver.limiter.stats() if resolver.limiter is not None else {},
+                      "hedging": resolver.hedger.stats() if resolver.hedger is not None else None}
+            print(json.dumps(report, indent=2), file=sys.stderr)
+        resolver.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
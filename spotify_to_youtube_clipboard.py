@@ -0,0 +1,271 @@
+"""
+spotify_to_youtube_clipboard.py — change-driven clipboard watcher for Auto Clipboard Mode
+
+Reads the clipboard only when it has (probably) changed:
+- X11: XFixes selection-owner events on CLIPBOARD, via ctypes on a helper
+  thread (works under Xvfb / XWayland). That thread only sets a flag, which
+  the Tk thread checks cheaply; full polling drops to a slow safety net.
+- Windows: GetClipboardSequenceNumber() is checked before every read, so an
+  unchanged clipboard costs one cheap call instead of a full text transfer.
+- Elsewhere: adaptive polling, fast right after activity, backing off when idle.
+
+Whatever is read is skipped cheaply when unchanged (length + hash), and only
+the first CLIP_SCAN_LIMIT characters are searched for a Spotify URL.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from spotify_to_youtube_core import SPOTIFY_URL_RE
+
+POLL_FAST_MS = 150
+POLL_MAX_MS = 2000
+POLL_BACKOFF = 1.5
+# With native change events, polling is only a safety net
+POLL_NATIVE_MS = 10000
+# How often the Tk thread looks at the change flag the X thread sets (no clipboard read)
+POLL_EVENT_MS = 100
+# A Spotify share URL is always near the start of what was copied
+CLIP_SCAN_LIMIT = 4096
+
+
+class _XEvent(ctypes.Union):
+    _fields_ = [("type", ctypes.c_int), ("pad", ctypes.c_long * 24)]
+
+
+class XFixesClipboardMonitor:
+    """Calls ``on_change`` (from its own thread) whenever the X11 CLIPBOARD owner changes."""
+
+    XFixesSetSelectionOwnerNotifyMask = 1
+    XFixesSelectionNotify = 0
+
+    def __init__(self, on_change: Callable[[], None]):
+        if not os.environ.get("DISPLAY"):
+            raise OSError("no X display")
+        x11_name = ctypes.util.find_library("X11")
+        xfixes_name = ctypes.util.find_library("Xfixes")
+        if not (x11_name and xfixes_name):
+            raise OSError("libX11 / libXfixes not found")
+        self._x11 = x11 = ctypes.CDLL(x11_name)
+        self._xfixes = xfixes = ctypes.CDLL(xfixes_name)
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        x11.XInternAtom.restype = ctypes.c_ulong
+        x11.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        x11.XPending.argtypes = [ctypes.c_void_p]
+        x11.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xfixes.XFixesQueryExtension.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                                ctypes.POINTER(ctypes.c_int)]
+        xfixes.XFixesSelectSelectionInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong,
+                                                      ctypes.c_ulong]
+        self._on_change = on_change
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._pipe_lock = threading.Lock()
+        self._pipe_open = True
+        self._ready = threading.Event()
+        self._error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="xfixes-clipboard", daemon=True)
+
+    def start(self) -> None:
+        """Start the event thread; raises OSError if the display or XFixes isn't usable."""
+        self._thread.start()
+        self._ready.wait(2.0)
+        if self._error or not self._ready.is_set():
+            self.stop()
+            raise OSError(self._error or "XFixes monitor did not start")
+
+    def stop(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+        # Still in select() / XNextEvent (stuck X server?): its fds must stay valid, the thread closes them
+        if not self._thread.is_alive():
+            self._close_pipe()
+
+    def _close_pipe(self) -> None:
+        with self._pipe_lock:
+            if self._pipe_open:
+                self._pipe_open = False
+                os.close(self._wake_r)
+                os.close(self._wake_w)
+
+    def _run(self) -> None:
+        x11, xfixes = self._x11, self._xfixes
+        # Our own connection: Tk's belongs to the main thread
+        dpy = x11.XOpenDisplay(None)
+        if not dpy:
+            self._error = "cannot open X display"
+            self._ready.set()
+            return
+        try:
+            event_base, error_base = ctypes.c_int(), ctypes.c_int()
+            if not xfixes.XFixesQueryExtension(dpy, ctypes.byref(event_base), ctypes.byref(error_base)):
+                self._error = "XFixes extension not available"
+                self._ready.set()
+                return
+            clipboard = x11.XInternAtom(dpy, b"CLIPBOARD", 0)
+            xfixes.XFixesSelectSelectionInput(dpy, x11.XDefaultRootWindow(dpy), clipboard,
+                                              self.XFixesSetSelectionOwnerNotifyMask)
+            fd = x11.XConnectionNumber(dpy)
+            self._ready.set()
+            notify_type = event_base.value + self.XFixesSelectionNotify
+            ev = _XEvent()
+            while not self._stop.is_set():
+                if not x11.XPending(dpy):
+                    # Sleep in select() so stop() can wake us through the pipe
+                    select.select([fd, self._wake_r], [], [], 5.0)
+                    continue
+                x11.XNextEvent(dpy, ctypes.byref(ev))
+                if ev.type == notify_type:
+                    self._on_change()
+        finally:
+            x11.XCloseDisplay(dpy)
+            if self._stop.is_set():
+                self._close_pipe()
+
+
+def _windows_sequence_number() -> Optional[Callable[[], int]]:
+    if not sys.platform.startswith("win"):
+        return None
+    try:
+        fn = ctypes.windll.user32.GetClipboardSequenceNumber  # type: ignore[attr-defined]
+        fn.restype = ctypes.c_uint32
+        fn()
+        return fn
+    except Exception:
+        return None
+
+
+class ClipboardWatcher:
+    """Watches the clipboard from the Tk thread and calls ``on_url`` with each new Spotify URL.
+
+    ``root`` is the Tk root (for ``after`` and ``clipboard_get``); nothing else
+    about Tk is assumed, so this module doesn't import tkinter itself.
+    """
+
+    def __init__(self, root, on_url: Callable[[str], None], pattern=SPOTIFY_URL_RE):
+        self.root = root
+        self.on_url = on_url
+        self.pattern = pattern
+        self.interval_ms = POLL_FAST_MS
+        self.native: Optional[str] = None
+        self._job = None
+        self._running = False
+        self._last_sig: Optional[tuple[int, int]] = None
+        self._last_url: Optional[str] = None
+        self._seq_fn = _windows_sequence_number()
+        self._last_seq: Optional[int] = None
+        self._monitor: Optional[XFixesClipboardMonitor] = None
+        # Set by the X thread on a change; only the Tk thread reads the clipboard
+        self._changed = threading.Event()
+        self._safety_due = 0.0
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._last_sig = None
+        self._last_url = None
+        self._last_seq = None
+        self._changed.clear()
+        if sys.platform.startswith("linux") or "bsd" in sys.platform:
+            try:
+                self._monitor = XFixesClipboardMonitor(self._on_native_change)
+                self._monitor.start()
+                self.native = "xfixes"
+            except Exception:
+                self._monitor = None
+        elif self._seq_fn is not None:
+            self.native = "sequence-number"
+        self.interval_ms = POLL_FAST_MS
+        self._schedule(POLL_FAST_MS)
+
+    def stop(self) -> None:
+        self._running = False
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        if self._monitor is not None:
+            self._monitor.stop()
+            self._monitor = None
+        self.native = None
+
+    def poke(self) -> None:
+        """Activity hint (focus change, paste…): go back to fast polling."""
+        if self._running and self._monitor is None and self.interval_ms > POLL_FAST_MS:
+            self.interval_ms = POLL_FAST_MS
+            self._schedule(POLL_FAST_MS)
+
+    def _on_native_change(self) -> None:
+        # Called on the X thread, so no Tk calls here: _poll picks the flag up
+        self._changed.set()
+
+    def _schedule(self, delay_ms: int) -> None:
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+        self._job = self.root.after(int(delay_ms), self._poll)
+
+    def _poll(self) -> None:
+        self._job = None
+        if not self._running:
+            return
+        if self._monitor is not None:
+            now = time.monotonic()
+            if self._changed.is_set() or now >= self._safety_due:
+                self._changed.clear()
+                self._safety_due = now + POLL_NATIVE_MS / 1000
+                self._read()
+            self._schedule(POLL_EVENT_MS)
+            return
+        changed = self._read()
+        if changed:
+            delay = self.interval_ms = POLL_FAST_MS
+        else:
+            delay = self.interval_ms = min(POLL_MAX_MS, int(self.interval_ms * POLL_BACKOFF))
+        self._schedule(delay)
+
+    def _read(self) -> bool:
+        """Read + scan the clipboard if it changed; returns True if it did."""
+        if self._seq_fn is not None:
+            seq = self._seq_fn()
+            if seq == self._last_seq:
+                return False
+            self._last_seq = seq
+        try:
+            text = self.root.clipboard_get()
+        except Exception:
+            text = ""
+        sig = (len(text), hash(text))
+        if sig == self._last_sig:
+            return False
+        self._last_sig = sig
+        m = self.pattern.search(text, 0, CLIP_SCAN_LIMIT)
+        if m:
+            url = m.group(0)
+            if url != self._last_url:
+                self._last_url = url
+                self.on_url(url)
+        return True
@@ -0,0 +1,2492 @@
+"""
+spotify_to_youtube_core.py — resolver core (no tkinter)
+
+Spotify track / playlist / album URL → title + artist (Spotify's public embed
+page, else the Web API) → YouTube search → share URL. Shared by the GUI and the
+headless CLI, so it must stay importable on machines without a display.
+
+Requirements:
+    pip install requests
+"""
+
+import base64
+import html
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import unicodedata
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import TYPE_CHECKING, Callable, Collection, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from spotify_to_youtube_stats import StageStats, stats_from_env
+
+if TYPE_CHECKING:
+    import requests
+
+
+def _requests():
+    """Import requests on first use: it's the slowest import here and the GUI's first frame doesn't need it."""
+    import requests
+    import requests.adapters
+    return requests
+
+APP_NAME = "SpotifyToYouTube"
+CONFIG_NAME = "settings.json"
+CACHE_NAME = "cache.sqlite3"
+
+DEFAULT_SETTINGS = {
+    "client_id": "",
+    "client_secret": "",
+    "auto_clipboard": False,
+    # GUI: a second launch hands its Spotify URL to the running window instead of opening another
+    "single_instance": True,
+    # GUI: View → History pane
+    "show_history": True,
+    # Resolution cache: entries older than this are refetched (0 = never expire)
+    "cache_ttl_days": 30,
+    # Least recently used entries are evicted past this many tracks (0 = cache off)
+    "cache_max_entries": 5000,
+    # Songs (normalized title + artist → video) remembered across track IDs, and how
+    # similar a new track must be (0-1) to reuse one without searching (0 = off)
+    "song_index_max_entries": 50000,
+    "fuzzy_threshold": 0.9,
+    # Parallel YouTube searches when resolving playlists / albums
+    "youtube_concurrency": 4,
+    # Results read from one YouTube page and ranked (duration, title, channel)
+    "youtube_candidates": 6,
+    # Search backends to try, in order (html, innertube, data_api); the next is used if one fails
+    "search_backends": "innertube,html",
+    # Where YouTube responses are parsed: "thread" (the searching thread) or "process" (a
+    # process pool, off this process's GIL); parse_workers 0 = one per core but one
+    "parse_mode": "thread",
+    "parse_workers": 0,
+    # Hedged searches: if YouTube hasn't answered after hedge_delay_ms ("fixed") or the recent
+    # p95 ("adaptive"), race a second request (next backend, else the same) and keep the first
+    # answer; at most hedges_per_min of those ("off" = never)
+    "hedge_mode": "off",
+    "hedge_delay_ms": 1500,
+    "hedges_per_min": 12,
+    # How lookups run: "threads" (blocking requests on worker threads) or "asyncio" (coroutines
+    # on one event-loop thread, see spotify_to_youtube_async); async_concurrency caps the
+    # tracks of a playlist in flight at once there
+    "engine": "threads",
+    "async_concurrency": 32,
+    # Where track title + artist come from, in order (embed, api, oembed): the public embed page
+    # needs no credentials or token; "api" (Web API) is skipped without credentials; oembed has
+    # the title only and is kept as a last resort. Playlists / albums always use the Web API
+    "metadata_providers": "embed,api,oembed",
+    # YouTube Data API v3 key; the data_api backend is skipped without one
+    "youtube_api_key": "",
+    # Requests per second per host (token bucket); bursts of up to 2 s worth are allowed
+    "spotify_rate_per_s": 8.0,
+    "youtube_rate_per_s": 4.0,
+    # Across all hosts, per minute (0 = no global budget)
+    "request_budget_per_min": 600,
+}
+
+
+# --------------------------- Config paths & storage ---------------------------
+def _platform_config_dir() -> str:
+    if sys.platform.startswith("win"):
+        base = os.environ.get("APPDATA") or os.path.expanduser(r"~\\AppData\\Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.path.expanduser("~/.config")
+    return os.path.join(base, APP_NAME)
+
+
+def _config_file_path() -> str:
+    return os.path.join(_platform_config_dir(), CONFIG_NAME)
+
+
+def load_settings() -> dict:
+    path = _config_file_path()
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            return settings
+        for key, default in DEFAULT_SETTINGS.items():
+            # Keep the default's type so a hand-edited file can't break the app
+            value = _setting_value(default, data.get(key, default))
+            if value is not None:
+                settings[key] = value
+        return settings
+    except Exception:
+        return settings
+
+
+def _setting_value(default, value):
+    """``value`` as the type of ``default``, or None if it isn't one (e.g. "false" for a bool)."""
+    if isinstance(default, bool):
+        return value if isinstance(value, bool) else None
+    if isinstance(value, bool):
+        return None  # true/false where a number or text belongs
+    if isinstance(default, int):
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value if isinstance(value, int) else None
+    if isinstance(default, float):
+        return float(value) if isinstance(value, (int, float)) and math.isfinite(value) else None
+    return value if isinstance(value, type(default)) else None
+
+
+def save_settings(client_id: str, client_secret: str, auto_clipboard: bool=False, **extra) -> None:
+    cfg_dir = _platform_config_dir()
+    os.makedirs(cfg_dir, exist_ok=True)
+    path = _config_file_path()
+    data = {
+        "client_id": client_id or "",
+        "client_secret": client_secret or "",
+        "auto_clipboard": bool(auto_clipboard),
+    }
+    data.update(extra)
+    # Try to restrict permissions where possible (best-effort)
+    try:
+        if not sys.platform.startswith("win"):
+            # 0o600 -> rw-------
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            fd = os.open(path, flags, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            return
+    except Exception:
+        pass
+    # Fallback simple write
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+# ------------------------------ Resolution cache ------------------------------
+_WORD_RE = re.compile(r"[^\W_]+")
+# Release / edition qualifiers that don't change which recording it is
+_QUALIFIER = (r"(?:feat\.?|ft\.?|featuring|with\s|(?:\d{4}\s+)?(?:digital(?:ly)?\s+)?re-?master(?:ed)?|deluxe|"
+              r"bonus\s+track|explicit|clean|(?:single|album|mono|stereo|original)\s+(?:version|mix)|from\s)")
+_TITLE_BRACKETS_RE = re.compile(rf"[(\[]\s*{_QUALIFIER}[^)\]]*[)\]]")
+_TITLE_SUFFIX_RE = re.compile(rf"\s+-\s+{_QUALIFIER}.*$")
+_ARTIST_NOISE = {"feat", "ft", "featuring", "and", "the", "with"}
+# Fuzzy matches whose durations differ more than this are different recordings
+FUZZY_DURATION_TOLERANCE_MS = 8000
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def normalize_song(title: str, artist: str) -> tuple[tuple[str, ...], frozenset]:
+    """(title words, artist words) with case, accents, punctuation, "feat." and remaster tags removed."""
+    t = _fold(title or "")
+    t = _TITLE_SUFFIX_RE.sub("", _TITLE_BRACKETS_RE.sub(" ", t))
+    words = tuple(_WORD_RE.findall(t))
+    artists = frozenset(w for w in _WORD_RE.findall(_fold(artist or "")) if w not in _ARTIST_NOISE)
+    return words, artists
+
+
+def _song_key(words: tuple, artists: frozenset) -> str:
+    return " ".join(words) + "|" + " ".join(sorted(artists))
+
+
+class _SongIndex:
+    """In-memory inverted index over the songs table: title word → song IDs."""
+
+    __slots__ = ("songs", "by_key", "postings")
+
+    def __init__(self):
+        # song id → (title words, artist words, video_id, duration_ms, title, artist, key)
+        self.songs: dict[int, tuple] = {}
+        self.by_key: dict[str, int] = {}
+        self.postings: dict[str, set[int]] = {}
+
+    def add(self, sid: int, title: str, artist: str, video_id: str, duration_ms: Optional[int]) -> None:
+        self.remove(sid)
+        words, artists = normalize_song(title, artist)
+        key = _song_key(words, artists)
+        self.songs[sid] = (frozenset(words), artists, video_id, duration_ms, title, artist, key)
+        self.by_key[key] = sid
+        for w in set(words):
+            self.postings.setdefault(w, set()).add(sid)
+
+    def remove(self, sid: int) -> None:
+        song = self.songs.pop(sid, None)
+        if song is None:
+            return
+        if self.by_key.get(song[6]) == sid:
+            del self.by_key[song[6]]
+        for w in song[0]:
+            ids = self.postings.get(w)
+            if ids is not None:
+                ids.discard(sid)
+                if not ids:
+                    del self.postings[w]
+
+    def match(self, words: tuple, artists: frozenset, duration_ms: Optional[int]) -> Optional[tuple[int, float]]:
+        """(song id, score) of the best match, scored 0.75 title-word Jaccard + 0.25 artist overlap."""
+        if not words:
+            return None
+        sid = self.by_key.get(_song_key(words, artists))
+        if sid is not None and self._duration_ok(sid, duration_ms):
+            return sid, 1.0
+        title = frozenset(words)
+        # Candidates share at least one of the two rarest title words
+        rare = sorted((self.postings.get(w, ()) for w in title), key=len)[:2]
+        best: Optional[tuple[int, float]] = None
+        for sid in set().union(*rare):
+            s_title, s_artists = self.songs[sid][0], self.songs[sid][1]
+            common = artists & s_artists
+            if artists and s_artists and not common:
+                continue
+            score = 0.75 * len(title & s_title) / len(title | s_title)
+            score += 0.25 * (len(common) / max(len(artists), len(s_artists)) if artists and s_artists else 0.5)
+            if (best is None or score > best[1]) and self._duration_ok(sid, duration_ms):
+                best = (sid, round(score, 4))
+        return best
+
+    def _duration_ok(self, sid: int, duration_ms: Optional[int]) -> bool:
+        known = self.songs[sid][3]
+        return not (duration_ms and known) or abs(duration_ms - known) <= FUZZY_DURATION_TOLERANCE_MS
+
+
+class TrackCache:
+    """SQLite cache of Spotify track ID → (title, artist, query, video ID).
+
+    Entries expire after ``ttl_seconds`` (0 = never) and the least recently
+    used ones are evicted once there are more than ``max_entries``.
+
+    Every resolution is also kept in a ``songs`` table keyed by the normalized
+    title + artist, so the same song under another track ID (single vs album,
+    regional re-release, compilation) can be found with ``find_song`` without
+    searching YouTube again. Its word index is built in memory on first use.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 0, max_entries: int = 5000,
+                 song_max_entries: int = DEFAULT_SETTINGS["song_index_max_entries"]):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.song_max_entries = song_max_entries
+        self._index: Optional[_SongIndex] = None
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tracks ("
+            " track_id TEXT PRIMARY KEY, title TEXT NOT NULL, artist TEXT NOT NULL,"
+            " query TEXT NOT NULL, video_id TEXT NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tracks_last_used ON tracks(last_used)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS songs ("
+            " id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, title TEXT NOT NULL, artist TEXT NOT NULL,"
+            " video_id TEXT NOT NULL, duration_ms INTEGER, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS songs_last_used ON songs(last_used)")
+
+    def get(self, track_id: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT title, artist, query, video_id, created FROM tracks WHERE track_id = ?", (track_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            title, artist, query, video_id, created = row
+            if self.ttl_seconds > 0 and now - created > self.ttl_seconds:
+                self._db.execute("DELETE FROM tracks WHERE track_id = ?", (track_id,))
+                return None
+            self._db.execute("UPDATE tracks SET last_used = ? WHERE track_id = ?", (now, track_id))
+        return {"track_id": track_id, "title": title, "artist": artist, "query": query, "video_id": video_id}
+
+    def put(self, track_id: str, title: str, artist: str, query: str, video_id: str,
+            duration_ms: Optional[int] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO tracks (track_id, title, artist, query, video_id, created, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (track_id, title, artist, query, video_id, now, now),
+            )
+            (count,) = self._db.execute("SELECT COUNT(*) FROM tracks").fetchone()
+            if count > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM tracks WHERE track_id IN"
+                    " (SELECT track_id FROM tracks ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            if self.song_max_entries > 0:
+                self._put_song(title, artist, video_id, duration_ms, now)
+
+    def _put_song(self, title: str, artist: str, video_id: str, duration_ms: Optional[int], now: float) -> None:
+        words, artists = normalize_song(title, artist)
+        if not words:
+            return
+        key = _song_key(words, artists)
+        self._db.execute(
+            "INSERT INTO songs (key, title, artist, video_id, duration_ms, created, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET title = excluded.title,"
+            " artist = excluded.artist, video_id = excluded.video_id,"
+            " duration_ms = COALESCE(excluded.duration_ms, duration_ms), created = excluded.created,"
+            " last_used = excluded.last_used",
+            (key, title, artist, video_id, duration_ms, now, now),
+        )
+        if self._index is not None:
+            (sid, duration_ms) = self._db.execute("SELECT id, duration_ms FROM songs WHERE key = ?", (key,)).fetchone()
+            self._index.add(sid, title, artist, video_id, duration_ms)
+        (count,) = self._db.execute("SELECT COUNT(*) FROM songs").fetchone()
+        if count > self.song_max_entries:
+            old = [sid for (sid,) in self._db.execute(
+                "SELECT id FROM songs ORDER BY last_used LIMIT ?", (count - self.song_max_entries,))]
+            self._db.executemany("DELETE FROM songs WHERE id = ?", [(sid,) for sid in old])
+            if self._index is not None:
+                for sid in old:
+                    self._index.remove(sid)
+
+    def _song_index(self) -> _SongIndex:
+        # Caller holds _lock
+        if self._index is None:
+            index = _SongIndex()
+            for sid, title, artist, video_id, duration_ms in self._db.execute(
+                    "SELECT id, title, artist, video_id, duration_ms FROM songs"):
+                index.add(sid, title, artist, video_id, duration_ms)
+            self._index = index
+        return self._index
+
+    def warm_index(self) -> None:
+        """Build the in-memory song index now (e.g. on a background thread) instead of on the first lookup."""
+        with self._lock:
+            self._song_index()
+
+    def find_song(self, title: str, artist: str, duration_ms: Optional[int] = None,
+                  threshold: float = DEFAULT_SETTINGS["fuzzy_threshold"]) -> Optional[dict]:
+        """A previously resolved song that matches (title, artist) with a score ≥ ``threshold``, else None."""
+        if threshold <= 0 or self.song_max_entries <= 0:
+            return None
+        words, artists = normalize_song(title, artist)
+        now = time.time()
+        with self._lock:
+            index = self._song_index()
+            found = index.match(words, artists, duration_ms)
+            if found is None or found[1] < threshold:
+                return None
+            sid, score = found
+            video_id, _d, s_title, s_artist = index.songs[sid][2:6]
+            row = self._db.execute("SELECT created FROM songs WHERE id = ?", (sid,)).fetchone()
+            if row is None or (self.ttl_seconds > 0 and now - row[0] > self.ttl_seconds):
+                return None
+            self._db.execute("UPDATE songs SET last_used = ? WHERE id = ?", (now, sid))
+        return {"video_id": video_id, "title": s_title, "artist": s_artist, "score": score}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM tracks")
+            self._db.execute("DELETE FROM songs")
+            self._index = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def open_track_cache(settings: dict) -> Optional[TrackCache]:
+    """Open the cache in the config folder, or None if disabled/unavailable."""
+    max_entries = int(settings.get("cache_max_entries", DEFAULT_SETTINGS["cache_max_entries"]))
+    if max_entries <= 0:
+        return None
+    ttl_days = float(settings.get("cache_ttl_days", DEFAULT_SETTINGS["cache_ttl_days"]))
+    try:
+        return TrackCache(os.path.join(_platform_config_dir(), CACHE_NAME),
+                          ttl_seconds=ttl_days * 86400, max_entries=max_entries,
+                          song_max_entries=int(settings.get("song_index_max_entries",
+                                                            DEFAULT_SETTINGS["song_index_max_entries"])))
+    except Exception:
+        return None
+
+
+# --------------------------- Spotify + YouTube logic --------------------------
+# Overridable so the GUI / CLI / benchmarks can be pointed at local stand-in servers
+SPOTIFY_ACCOUNTS_BASE = os.environ.get("S2Y_SPOTIFY_ACCOUNTS_BASE", "https://accounts.spotify.com")
+SPOTIFY_API_BASE = os.environ.get("S2Y_SPOTIFY_API_BASE", "https://api.spotify.com")
+SPOTIFY_OPEN_BASE = os.environ.get("S2Y_SPOTIFY_OPEN_BASE", "https://open.spotify.com")
+YOUTUBE_BASE = os.environ.get("S2Y_YOUTUBE_BASE", "https://www.youtube.com")
+YOUTUBE_API_BASE = os.environ.get("S2Y_YOUTUBE_API_BASE", "https://www.googleapis.com")
+# A desktop browser's headers, for public web pages (open.spotify.com, youtube.com)
+BROWSER_HEADERS = {"User-Agent":"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                   "Accept-Language":"en-US,en;q=0.9"}
+YOUTUBE_HEADERS = dict(BROWSER_HEADERS)
+# Refresh the cached token this many seconds before Spotify says it expires
+TOKEN_REFRESH_MARGIN = 60
+
+# Retries for 429 / transient 5xx / timeouts, with full-jitter exponential backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+# A Retry-After longer than this is reported as an error rather than waited out
+RETRY_AFTER_MAX = 120.0
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``. Not thread-safe (RateLimiter locks)."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take one token, going into debt if needed; returns how long the caller must wait for it."""
+        if self.rate <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+def _retry_after(resp) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), if present."""
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _throttled_page(resp) -> bool:
+    # YouTube answers bulk scraping with a redirect to its /sorry/ CAPTCHA page rather than a 429
+    return resp.status_code == 200 and "/sorry/" in (getattr(resp, "url", "") or "")
+
+
+class RateLimiter:
+    """Per-host token buckets, a global request budget and retry handling for every outgoing request.
+
+    A 429 (or 503) with Retry-After pauses that host for everyone, not just the
+    caller that saw it; transient 5xx and timeouts back off with full jitter.
+    ``stats()`` exposes per-host counters (queue depth, wait time, throttles,
+    retries) so throttling is visible instead of silent.
+    """
+
+    def __init__(self, rates: Optional[dict[str, float]] = None, default_rate: float = 0,
+                 budget_per_min: float = 0, max_retries: int = MAX_RETRIES):
+        self._lock = threading.Lock()
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.max_retries = max(0, int(max_retries))
+        self._buckets: dict[str, TokenBucket] = {}
+        self._budget = TokenBucket(budget_per_min / 60, max(1.0, budget_per_min / 10)) if budget_per_min > 0 else None
+        self._blocked_until: dict[str, float] = {}
+        self._stats: dict[str, dict] = {}
+
+    def _host_stats(self, host: str) -> dict:
+        st = self._stats.get(host)
+        if st is None:
+            st = self._stats[host] = {"requests": 0, "waits": 0, "wait_ms": 0.0, "max_wait_ms": 0.0, "queued": 0,
+                                      "max_queued": 0, "throttled": 0, "retries": 0, "errors": 0}
+        return st
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.rates.get(host, self.default_rate)
+            if rate <= 0:
+                return None
+            bucket = self._buckets[host] = TokenBucket(rate, rate * 2)
+        return bucket
+
+    def _wait_started(self, host: str) -> dict:
+        with self._lock:
+            st = self._host_stats(host)
+            st["queued"] += 1
+            st["max_queued"] = max(st["max_queued"], st["queued"])
+        return st
+
+    def _wait_done(self, st: dict, delay: float) -> None:
+        with self._lock:
+            st["queued"] -= 1
+            st["waits"] += 1
+            st["wait_ms"] = round(st["wait_ms"] + delay * 1000, 3)
+            st["max_wait_ms"] = max(st["max_wait_ms"], round(delay * 1000, 3))
+
+    def _sleep(self, host: str, delay: float, cancel: Optional[threading.Event]) -> None:
+        st = self._wait_started(host)
+        try:
+            if cancel is not None:
+                cancel.wait(delay)
+            else:
+                time.sleep(delay)
+        finally:
+            self._wait_done(st, delay)
+        _check_cancel(cancel)
+
+    async def _sleep_async(self, host: str, delay: float) -> None:
+        import asyncio
+        st = self._wait_started(host)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._wait_done(st, delay)
+
+    def _reserve(self, host: str) -> tuple[float, float]:
+        """(how long ``host`` is still paused for, else 0; how long to wait for the token just taken)."""
+        with self._lock:
+            now = time.monotonic()
+            blocked = self._blocked_until.get(host, 0.0) - now
+            if blocked > 0:
+                return blocked, 0.0
+            bucket = self._bucket(host)
+            delay = bucket.reserve(now) if bucket is not None else 0.0
+            if self._budget is not None:
+                delay = max(delay, self._budget.reserve(now))
+            self._host_stats(host)["requests"] += 1
+            return 0.0, delay
+
+    def acquire(self, host: str, cancel: Optional[threading.Event] = None) -> None:
+        """Block until ``host`` may be sent another request."""
+        while True:
+            _check_cancel(cancel)
+            blocked, delay = self._reserve(host)
+            if blocked > 0:
+                # Paused by a Retry-After: wait it out, then queue for a token like everyone else
+                self._sleep(host, blocked, cancel)
+                continue
+            if delay > 0:
+                self._sleep(host, delay, cancel)
+            return
+
+    async def acquire_async(self, host: str) -> None:
+        """acquire() for coroutines: waits on the event loop, and stops when the task is cancelled."""
+        while True:
+            blocked, delay = self._reserve(host)
+            if blocked > 0:
+                await self._sleep_async(host, blocked)
+                continue
+            if delay > 0:
+                await self._sleep_async(host, delay)
+            return
+
+    def pause(self, host: str, seconds: float) -> None:
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), until)
+
+    def _count(self, host: str, key: str) -> None:
+        with self._lock:
+            self._host_stats(host)[key] += 1
+
+    def request(self, session, method: str, url: str, cancel: Optional[threading.Event] = None, **kwargs):
+        """``session.request(method, url, **kwargs)`` behind the limiter, retrying throttled / transient failures.
+
+        Returns the last response once retries run out (the caller's raise_for_status reports it).
+        """
+        requests = _requests()
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            self.acquire(host, cancel)
+            try:
+                resp = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                backoff = self._after_error(host, attempt)
+                if backoff is None:
+                    raise
+                self._sleep(host, backoff, cancel)
+                continue
+            backoff = self._after_response(host, resp, attempt)
+            if backoff is None:
+                return resp
+            if backoff > 0:
+                self._sleep(host, backoff, cancel)
+        raise AssertionError("unreachable")
+
+    async def request_async(self, send: Callable, method: str, url: str, **kwargs):
+        """request() for coroutines: ``await send(method, url, **kwargs)`` with the same limits and retries.
+
+        ``send`` raises ConnectionError / TimeoutError for network failures
+        (see spotify_to_youtube_async.AsyncHttpClient).
+        """
+        import asyncio
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(host)
+            try:
+                resp = await send(method, url, **kwargs)
+            except (ConnectionError, asyncio.TimeoutError):
+                backoff = self._after_error(host, attempt)
+                if backoff is None:
+                    raise
+                await self._sleep_async(host, backoff)
+                continue
+            backoff = self._after_response(host, resp, attempt)
+            if backoff is None:
+                return resp
+            if backoff > 0:
+                await self._sleep_async(host, backoff)
+        raise AssertionError("unreachable")
+
+    def _after_error(self, host: str, attempt: int) -> Optional[float]:
+        """A connection error or timeout: the backoff before the next attempt, or None if that was the last."""
+        self._count(host, "errors")
+        if attempt == self.max_retries:
+            return None
+        self._count(host, "retries")
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    def _after_response(self, host: str, resp, attempt: int) -> Optional[float]:
+        """None if ``resp`` goes back to the caller, else the backoff before retrying (0: the host is paused)."""
+        throttled = resp.status_code == 429 or _throttled_page(resp)
+        if not throttled and resp.status_code not in RETRY_STATUSES:
+            return None
+        if throttled:
+            self._count(host, "throttled")
+        if attempt == self.max_retries:
+            if _throttled_page(resp):
+                resp.close()
+                raise RuntimeError(f"{host} is throttling requests; try again later.")
+            return None
+        backoff = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        wait = _retry_after(resp)
+        resp.close()
+        if wait is not None and wait > RETRY_AFTER_MAX:
+            raise RuntimeError(f"{host} asked us to wait {wait:.0f} s (rate limited); try again later.")
+        self._count(host, "retries")
+        if wait is not None or throttled:
+            # Everyone sending to this host waits, not just us
+            self.pause(host, wait if wait is not None else BACKOFF_BASE * 2 ** attempt + backoff)
+            return 0.0
+        return backoff
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {host: dict(st) for host, st in self._stats.items()}
+
+
+def _send(session, method: str, url: str, limiter: Optional[RateLimiter] = None,
+          cancel: Optional[threading.Event] = None, **kwargs):
+    if limiter is None:
+        return (session or _requests()).request(method, url, **kwargs)
+    return limiter.request(session or _requests(), method, url, cancel=cancel, **kwargs)
+
+
+# Each lookup's requests and response handling are written once, as a generator
+# ("flow") shared by both engines: it yields an HttpCall (or NeedToken) and is
+# sent the response (or token) back, or has the request's error thrown in.
+# run_flow drives a flow with blocking requests; the asyncio engine drives the
+# same flows on its event loop (AsyncResolver._drive).
+
+class HttpCall:
+    """One request a flow needs, sent through the rate limiter.
+
+    ``stage`` is the StageStats stage it counts toward (and, on the asyncio
+    engine, the stage timeout). With ``markers`` (the videoRenderer data
+    markers; () for a bare JSON body) the engine parses the response with its
+    ParseStage and sends back up to ``limit`` candidate dicts instead.
+    """
+
+    def __init__(self, method: str, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                 data=None, timeout: float = 15, stage: str = "spotify", markers: Optional[tuple] = None,
+                 limit: int = 0):
+        self.method = method
+        self.url = url
+        self.params = params
+        self.headers = headers
+        self.data = data
+        self.timeout = timeout
+        self.stage = stage
+        self.markers = markers
+        self.limit = limit
+
+    @property
+    def origin(self) -> str:
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+
+class NeedToken:
+    """Asks the engine for the Spotify bearer token; a fresh one if ``rejected`` was just refused."""
+
+    def __init__(self, rejected: Optional[str] = None):
+        self.rejected = rejected
+
+
+def run_flow(flow, session_for: Callable[[str], object], limiter: Optional[RateLimiter] = None,
+             cancel: Optional[threading.Event] = None, meter: Optional[dict] = None,
+             parse: Optional["ParseStage"] = None, token: Optional[Callable[[Optional[str]], str]] = None,
+             stats: Optional[StageStats] = None):
+    """Drive a flow with blocking requests and return what it returns.
+
+    ``session_for(origin)`` picks the session for each request and ``token(rejected)``
+    answers NeedToken. With a ``meter`` dict, fetch_ms and bytes add up over the
+    flow's requests and parse_ms is the rest of its time.
+    """
+    t0 = time.perf_counter()
+    if meter is not None:
+        meter.update(fetch_ms=0.0, bytes=0)
+    reply = error = None
+    try:
+        while True:
+            try:
+                step = flow.send(reply) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            reply = error = None
+            try:
+                if isinstance(step, NeedToken):
+                    reply = token(step.rejected)
+                else:
+                    reply = _run_call(step, session_for(step.origin), limiter, cancel, meter, parse, stats)
+            except Cancelled:
+                raise
+            except Exception as e:
+                error = e
+    finally:
+        flow.close()
+        if meter is not None:
+            meter["parse_ms"] = max(0.0, (time.perf_counter() - t0) * 1000 - meter["fetch_ms"])
+
+
+def _run_call(call: HttpCall, session, limiter: Optional[RateLimiter], cancel: Optional[threading.Event],
+              meter: Optional[dict], parse: Optional["ParseStage"], stats: Optional[StageStats]):
+    _check_cancel(cancel)
+    t0 = time.perf_counter()
+    if call.markers is not None:
+        resp = _send(session, call.method, call.url, limiter, cancel, params=call.params, headers=call.headers,
+                     data=call.data, timeout=call.timeout, stream=True)
+        if meter is not None:
+            meter["fetch_ms"] += (time.perf_counter() - t0) * 1000
+        return _stream_candidates(resp, call.limit, cancel, meter, call.markers, parse)
+    resp = _send(session, call.method, call.url, limiter, cancel, params=call.params, headers=call.headers,
+                 data=call.data, timeout=call.timeout)
+    _account(call, resp, _ms_since(t0), meter, stats)
+    return resp
+
+
+def _account(call: HttpCall, resp, ms: float, meter: Optional[dict], stats: Optional[StageStats]) -> None:
+    """Add a finished request to the flow's meter and, for the Spotify stages, to StageStats."""
+    nbytes = len(resp.content)
+    if meter is not None:
+        meter["fetch_ms"] += ms
+        meter["bytes"] += nbytes
+    if stats is not None and call.stage in ("token", "spotify") and resp.status_code < 400:
+        stats.add(call.stage, ms, nbytes)
+
+
+def _token_flow(base: str, client_id: str, client_secret: str):
+    """The client-credentials grant; returns (access_token, expires_in seconds)."""
+    headers, data = _token_request(client_id, client_secret)
+    resp = yield HttpCall("POST", f"{base}/api/token", headers=headers, data=data, stage="token")
+    resp.raise_for_status()
+    payload = resp.json()
+    return payload["access_token"], int(payload.get("expires_in") or 3600)
+
+
+def _spotify_get_flow(base: str, path: str, params: Optional[dict] = None):
+    """GET a Web API path (or an absolute ``next`` URL) with the bearer token; a 401 gets one fresh token and a retry."""
+    url = path if path.startswith("http") else f"{base}{path}"
+    rejected = None
+    for attempt in range(2):
+        token = yield NeedToken(rejected)
+        resp = yield HttpCall("GET", url, params=params, headers={"Authorization": f"Bearer {token}"})
+        if resp.status_code == 401 and attempt == 0:
+            rejected = token
+            continue
+        resp.raise_for_status()
+        return resp.json()
+    raise RuntimeError("Spotify API rejected the access token.")
+
+
+def _request_spotify_token(client_id: str, client_secret: str, session=None, base: Optional[str] = None,
+                           limiter: Optional[RateLimiter] = None) -> tuple[str, int]:
+    """POST the client-credentials grant; returns (access_token, expires_in seconds)."""
+    return run_flow(_token_flow(base or SPOTIFY_ACCOUNTS_BASE, client_id, client_secret),
+                    lambda _origin: session, limiter)
+
+
+def _token_request(client_id: str, client_secret: str) -> tuple[dict, dict]:
+    """Headers and form fields of the client-credentials grant."""
+    if not (client_id and client_secret):
+        raise RuntimeError("Spotify API credentials are missing. Use Settings → Spotify API Credentials…")
+    auth = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+    return {"Authorization": f"Basic {auth}"}, {"grant_type": "client_credentials"}
+
+
+def get_spotify_token(client_id: str, client_secret: str) -> str:
+    return _request_spotify_token(client_id, client_secret)[0]
+
+
+def extract_track_id(spotify_url: str) -> Optional[str]:
+    m = re.search(r"/track/([A-Za-z0-9]+)", spotify_url)
+    return m.group(1) if m else None
+
+
+SPOTIFY_URL_RE = re.compile(r"https?://open\.spotify\.com/(?:intl-[A-Za-z-]+/)?(track|playlist|album)/([A-Za-z0-9]+)")
+# Page sizes are the maxima the Web API accepts for each endpoint
+SPOTIFY_IDS_BATCH = 50
+SPOTIFY_PAGE_LIMITS = {"playlist": 100, "album": 50}
+
+
+def extract_spotify_ref(spotify_url: str) -> Optional[tuple[str, str]]:
+    """Return (kind, id) for a track / playlist / album URL, e.g. ("playlist", "37i9…")."""
+    m = SPOTIFY_URL_RE.search(spotify_url)
+    return (m.group(1), m.group(2)) if m else None
+
+
+class Cancelled(Exception):
+    """A lookup was superseded by a newer one and stopped early."""
+
+
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise Cancelled()
+
+
+def _cancellable(chunks: Iterable[bytes], cancel: Optional[threading.Event]) -> Iterator[bytes]:
+    for chunk in chunks:
+        _check_cancel(cancel)
+        yield chunk
+
+
+def _ms_since(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# (track_id, title, artist, duration_ms) as yielded by the batch/collection fetchers
+TrackMeta = tuple[str, str, str, Optional[int]]
+
+
+def _parse_track_meta(data: dict) -> tuple[str, str, Optional[int]]:
+    title = (data.get("name") or "").strip()
+    artists = [a.get("name") for a in data.get("artists", []) if isinstance(a, dict) and a.get("name")]
+    artist = " & ".join(artists)
+    if not title:
+        raise RuntimeError("Spotify API did not return a track title.")
+    duration = data.get("duration_ms")
+    return title, artist, int(duration) if isinstance(duration, (int, float)) and duration > 0 else None
+
+
+def _collection_request(kind: str, collection_id: str) -> tuple[str, dict]:
+    """Path and query of the first page of a playlist's or album's tracks."""
+    if kind == "playlist":
+        return f"/v1/playlists/{collection_id}/tracks", {
+            "limit": SPOTIFY_PAGE_LIMITS[kind], "additional_types": "track",
+            "fields": "next,items(track(id,name,type,duration_ms,artists(name)))"}
+    if kind == "album":
+        return f"/v1/albums/{collection_id}/tracks", {"limit": SPOTIFY_PAGE_LIMITS[kind]}
+    raise ValueError(f"Unsupported Spotify collection type: {kind}")
+
+
+def _collection_page(kind: str, data: dict) -> list[TrackMeta]:
+    page = []
+    for item in data.get("items") or []:
+        # Playlist items wrap the track; album items are the track
+        track = item.get("track") if kind == "playlist" else item
+        if not isinstance(track, dict) or track.get("type", "track") != "track" or not track.get("name"):
+            continue
+        page.append((track.get("id") or "", *_parse_track_meta(track)))
+    return page
+
+
+def _collection_page_flow(base: str, kind: str, path: str, params: Optional[dict] = None):
+    """One page of a playlist or album; returns (tracks, URL of the next page or None)."""
+    data = yield from _spotify_get_flow(base, path, params)
+    return _collection_page(kind, data), data.get("next")
+
+
+def _batch_metas(track_ids: list[str], found: list[TrackMeta]) -> dict:
+    """fetch_track_metas' answer for one /v1/tracks batch: IDs the API left out get a LookupError."""
+    metas = {meta[0]: meta[1:] for meta in found}
+    return {t: metas.get(t) or LookupError(f"Spotify has no track with ID {t}.") for t in track_ids}
+
+
+def _tracks_flow(base: str, track_ids: list[str]):
+    """Up to SPOTIFY_IDS_BATCH tracks from one /v1/tracks?ids= request; unknown IDs are left out."""
+    data = yield from _spotify_get_flow(base, "/v1/tracks", {"ids": ",".join(track_ids)})
+    return [(item["id"], *_parse_track_meta(item)) for item in data.get("tracks") or []
+            if isinstance(item, dict) and item.get("id")]
+
+
+# Shared by fetch_title_artist_from_spotify calls (created on first use)
+_lookup_resolver: Optional["Resolver"] = None
+_lookup_resolver_lock = threading.Lock()
+
+
+def fetch_title_artist_from_spotify(spotify_url: str, client_id: str = "", client_secret: str = "") -> tuple[str, str]:
+    """Title + artist from the public embed page; the Web API (credentials) if that page lacks them.
+
+    Runs Resolver's embed → api provider chain on one shared Resolver, so these
+    lookups get its rate limiter, provider cooldowns, 404 handling and token cache.
+    """
+    global _lookup_resolver
+    with _lookup_resolver_lock:
+        if _lookup_resolver is None:
+            _lookup_resolver = Resolver(metadata_providers="embed,api")
+        resolver = _lookup_resolver
+    resolver.set_credentials(client_id, client_secret)
+    return resolver.fetch_title_artist(spotify_url)
+
+
+_NEXT_DATA_RE = re.compile(rb'<script[^>]*\bid="__NEXT_DATA__"[^>]*>')
+
+
+def parse_embed_page(body: bytes) -> tuple[str, str, Optional[int]]:
+    """(title, artist, duration_ms) from the page data of an open.spotify.com/embed/track/… page."""
+    m = _NEXT_DATA_RE.search(body)
+    end = body.find(b"</script>", m.end()) if m else -1
+    if end == -1:
+        raise RuntimeError("Spotify embed page has no track data.")
+    data = json.loads(body[m.end():end])
+    try:
+        entity = data["props"]["pageProps"]["state"]["data"]["entity"]
+    except (KeyError, TypeError):
+        entity = None
+    if not isinstance(entity, dict):
+        # Layout moved: take the first track-like object anywhere in the page data
+        entity = next((d for d in _walk_dicts(data) if d.get("type") == "track" and isinstance(d.get("artists"), list)),
+                      None)
+    if entity is None:
+        raise RuntimeError("Spotify embed page has no track data.")
+    title = (entity.get("name") or entity.get("title") or "").strip()
+    if not title:
+        raise RuntimeError("Spotify embed page did not include a track title.")
+    artists = [a.get("name") for a in entity.get("artists") or [] if isinstance(a, dict) and a.get("name")]
+    artist = " & ".join(artists) or (entity.get("subtitle") or "").strip()
+    duration = entity.get("duration")
+    return title, artist, int(duration) if isinstance(duration, (int, float)) and duration > 0 else None
+
+
+def parse_oembed(body: bytes) -> tuple[str, str, Optional[int]]:
+    """(title, artist, None) from Spotify's oEmbed reply, which names the track but not (usually) the artist."""
+    data = json.loads(body)
+    title = (data.get("title") or "").strip() if isinstance(data, dict) else ""
+    if not title:
+        raise RuntimeError("Spotify oEmbed did not include a track title.")
+    return title, (data.get("author_name") or "").strip(), None
+
+
+class MetadataProvider:
+    """A way of turning a track ID into (title, artist, duration_ms); artist and duration may be missing."""
+
+    name = ""
+    # Needs the Client ID / Secret (and so a token round trip before the first lookup)
+    needs_credentials = False
+
+    def __init__(self, base: str):
+        self.base = base
+
+    def flow(self, track_id: str):
+        """The requests for ``track_id`` (see HttpCall); returns (title, artist, duration_ms)."""
+        url, params = self.request(track_id)
+        resp = yield HttpCall("GET", url, params=params, headers=BROWSER_HEADERS)
+        resp.raise_for_status()
+        return self.parse(resp.content)
+
+    def request(self, track_id: str) -> tuple[str, Optional[dict]]:
+        """URL and query of the one GET that answers for ``track_id``."""
+        raise NotImplementedError
+
+    def parse(self, body: bytes) -> tuple[str, str, Optional[int]]:
+        raise NotImplementedError
+
+
+class EmbedMeta(MetadataProvider):
+    """The public embed player page: title, artists and duration in its page data, no token."""
+
+    name = "embed"
+
+    def request(self, track_id):
+        return f"{self.base}/embed/track/{track_id}", None
+
+    def parse(self, body):
+        return parse_embed_page(body)
+
+
+class OEmbedMeta(MetadataProvider):
+    """Spotify's public oEmbed endpoint: a tiny JSON reply, but the title only."""
+
+    name = "oembed"
+
+    def request(self, track_id):
+        return f"{self.base}/oembed", {"url": f"https://open.spotify.com/track/{track_id}"}
+
+    def parse(self, body):
+        return parse_oembed(body)
+
+
+class WebApiMeta(MetadataProvider):
+    """The Web API's /v1/tracks/{id}, with the bearer token (and a fresh one after a 401)."""
+
+    name = "api"
+    needs_credentials = True
+
+    def flow(self, track_id):
+        return _parse_track_meta((yield from _spotify_get_flow(self.base, f"/v1/tracks/{track_id}")))
+
+
+METADATA_PROVIDERS = {p.name: p for p in (EmbedMeta, OEmbedMeta, WebApiMeta)}
+
+
+def _provider_names(spec) -> list[str]:
+    names = spec.split(",") if isinstance(spec, str) else list(spec)
+    names = [n.strip().lower() for n in names if n.strip().lower() in METADATA_PROVIDERS]
+    return list(dict.fromkeys(names)) or ["api"]
+
+
+def _http_status(e: Exception) -> Optional[int]:
+    """The HTTP status behind a requests HTTPError or the asyncio engine's HttpError, else None."""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status
+
+
+# What a failed provider lookup raises: requests' and the asyncio client's network
+# errors (OSError), HTTP errors and timeouts (RuntimeError), bad JSON (ValueError)
+LOOKUP_ERRORS = (OSError, ValueError, RuntimeError)
+
+
+# Tokens the brace matcher cares about: whole JSON strings (so braces inside
+# titles don't count), a lone quote (string cut off at the end of the buffer)
+# and the braces themselves. Everything else is skipped by the regex engine.
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|["{}]')
+_JSON_TOKEN_RE_B = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|["{}]')
+
+YT_INITIAL_DATA_MARKERS = ('var ytInitialData = ', 'window["ytInitialData"] = ', 'window.ytInitialData = ', 'ytInitialData = ')
+YT_VIDEO_RENDERER_KEY = b'"videoRenderer":'
+YT_CHUNK_SIZE = 64 * 1024
+# After an early exit, read at most this much more so the keep-alive
+# connection can go back to the pool; past it, dropping the socket is cheaper.
+YT_DRAIN_LIMIT = 256 * 1024
+
+
+def _match_brace(buf, start: int, token_re=_JSON_TOKEN_RE) -> int:
+    """Index just past the object opening at ``buf[start]``, or -1 if it isn't complete yet."""
+    depth = 0
+    for m in token_re.finditer(buf, start):
+        tok = m.group()
+        if len(tok) == 1:
+            c = tok[0]
+            if c in ("{", 0x7b):
+                depth += 1
+            elif c in ("}", 0x7d):
+                depth -= 1
+                if depth == 0:
+                    return m.end()
+            else:  # unterminated string: the rest hasn't arrived
+                return -1
+    return -1
+
+
+def _loads_lenient(s):
+    try:
+        return json.loads(s)
+    except Exception:
+        if isinstance(s, (bytes, bytearray)):
+            s = bytes(s).decode("utf-8", "replace")
+        s = s.replace("&quot;", '"').replace("&amp;", "&")
+        try:
+            return json.loads(s)
+        except Exception:
+            return None
+
+
+def _extract_json_block(html: str, marker: str):
+    start = html.find(marker)
+    if start == -1:
+        return None
+    i = html.find("{", start)
+    if i == -1:
+        return None
+    end = _match_brace(html, i)
+    if end == -1:
+        return None
+    return _loads_lenient(html[i:end])
+
+
+def _walk_dicts(obj):
+    if isinstance(obj, dict):
+        yield obj
+        for v in obj.values():
+            yield from _walk_dicts(v)
+    elif isinstance(obj, list):
+        for it in obj:
+            yield from _walk_dicts(it)
+
+
+def iter_video_renderers(chunks: Iterable[bytes], limit: int = 1,
+                         markers: Iterable[str] = YT_INITIAL_DATA_MARKERS) -> Iterator[dict]:
+    """Yield up to ``limit`` videoRenderer dicts from a results page as its bytes arrive.
+
+    Only each renderer object is parsed, never the whole ytInitialData blob, and
+    the caller can stop reading the response as soon as this generator finishes.
+    Bytes before ytInitialData and already-parsed renderers are dropped as we go.
+    ``markers=()`` is for bare JSON responses, where renderers start right away.
+    """
+    markers = [m.encode() for m in markers]
+    keep = max(len(m) for m in markers + [YT_VIDEO_RENDERER_KEY])
+    buf = bytearray()
+    in_data = not markers
+    found = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf += chunk
+        pos = 0
+        if not in_data:
+            hits = [i for i in (buf.find(m) for m in markers) if i != -1]
+            if not hits:
+                del buf[:-keep]
+                continue
+            in_data = True
+            pos = min(hits)
+        while True:
+            i = buf.find(YT_VIDEO_RENDERER_KEY, pos)
+            if i == -1:
+                pos = max(pos, len(buf) - keep)
+                break
+            obj_start = buf.find(b"{", i + len(YT_VIDEO_RENDERER_KEY))
+            end = -1 if obj_start == -1 else _match_brace(buf, obj_start, _JSON_TOKEN_RE_B)
+            if end == -1:
+                pos = i  # wait for the rest of this renderer
+                break
+            renderer = _loads_lenient(buf[obj_start:end])
+            pos = end
+            if isinstance(renderer, dict) and renderer.get("videoId"):
+                yield renderer
+                found += 1
+                if found >= limit:
+                    return
+        del buf[:pos]
+
+
+def _release_response(resp) -> None:
+    """Finish a streamed response we stopped reading early (drain a little, else close)."""
+    read = 0
+    try:
+        for chunk in resp.iter_content(YT_CHUNK_SIZE):
+            read += len(chunk)
+            if read > YT_DRAIN_LIMIT:
+                break
+        else:
+            return  # fully consumed: urllib3 returns the connection to the pool
+    except Exception:
+        pass
+    resp.close()
+
+
+def search_youtube_video_ids(query: str, limit: int = 1, session=None, base: Optional[str] = None,
+                             cancel: Optional[threading.Event] = None,
+                             limiter: Optional[RateLimiter] = None) -> list[str]:
+    """First ``limit`` video IDs for a query; stops downloading once they're parsed (or ``cancel`` is set).
+
+    Legacy helper: one results page, outside the search backends (no fallback,
+    cooldowns, ranking, parse stage, hedging or stats). Resolver searches with those.
+    """
+    resp = _send(session, "GET", f"{base or YOUTUBE_BASE}/results", limiter, cancel,
+                 params={"search_query": query}, headers=YOUTUBE_HEADERS, timeout=20, stream=True)
+    try:
+        resp.raise_for_status()
+        chunks = _cancellable(resp.iter_content(YT_CHUNK_SIZE), cancel)
+        return [r["videoId"] for r in iter_video_renderers(chunks, limit=limit)]
+    finally:
+        if cancel is not None and cancel.is_set():
+            resp.close()
+        else:
+            _release_response(resp)
+
+
+def search_youtube_first_video_id(query: str, session=None, base: Optional[str] = None,
+                                  cancel: Optional[threading.Event] = None, limiter: Optional[RateLimiter] = None):
+    """Legacy helper: the first search_youtube_video_ids result, or None."""
+    ids = search_youtube_video_ids(query, limit=1, session=session, base=base, cancel=cancel, limiter=limiter)
+    return ids[0] if ids else None
+
+
+def _text(obj) -> str:
+    """Plain text of a YouTube {"simpleText": …} / {"runs": [{"text": …}]} field."""
+    if not isinstance(obj, dict):
+        return ""
+    if "simpleText" in obj:
+        return str(obj["simpleText"])
+    return "".join(str(r.get("text", "")) for r in obj.get("runs") or [] if isinstance(r, dict))
+
+
+def _parse_length(text: str) -> Optional[int]:
+    """"1:02:03" / "3:45" → seconds."""
+    try:
+        parts = [int(p) for p in text.strip().split(":")]
+    except ValueError:
+        return None
+    seconds = 0
+    for p in parts:
+        seconds = seconds * 60 + p
+    return seconds if parts else None
+
+
+def candidate_from_renderer(r: dict) -> dict:
+    """The fields of a videoRenderer used for ranking."""
+    channel = _text(r.get("ownerText")) or _text(r.get("longBylineText"))
+    badges = [b.get("metadataBadgeRenderer", {}).get("style", "") for b in r.get("ownerBadges") or []
+              if isinstance(b, dict)]
+    return {
+        "video_id": r.get("videoId"),
+        "title": _text(r.get("title")),
+        "channel": channel,
+        "duration_s": _parse_length(_text(r.get("lengthText"))),
+        "badges": [b for b in badges if b],
+    }
+
+
+def _metered(chunks: Iterable[bytes], meter: dict) -> Iterator[bytes]:
+    """Pass chunks through, adding the time spent waiting for each to meter["fetch_ms"] and its size to ["bytes"]."""
+    it = iter(chunks)
+    while True:
+        t0 = time.perf_counter()
+        chunk = next(it, None)
+        meter["fetch_ms"] += (time.perf_counter() - t0) * 1000
+        if chunk is None:
+            return
+        meter["bytes"] += len(chunk)
+        yield chunk
+
+
+def parse_candidates(data: bytes, limit: int, markers: Iterable[str] = YT_INITIAL_DATA_MARKERS) -> list[dict]:
+    """Candidates from (part of) a results page or JSON response; the process-pool side of ParseStage."""
+    return [candidate_from_renderer(r) for r in iter_video_renderers([data], limit, markers)]
+
+
+def _collect_renderer_bytes(chunks: Iterator[bytes], buf: bytearray, want: int,
+                            markers: Iterable[str] = YT_INITIAL_DATA_MARKERS) -> bool:
+    """Read chunks into ``buf`` until it holds ``want`` renderer keys past the data marker.
+
+    Everything before the marker is dropped as it arrives. Only bytes.find runs
+    here, so the reading thread barely holds the GIL. Returns False at the end
+    of the stream.
+    """
+    markers = [m.encode() for m in markers]
+    keep = max(len(m) for m in markers + [YT_VIDEO_RENDERER_KEY])
+    in_data = not markers
+    while True:
+        if not in_data:
+            hits = [i for i in (buf.find(m) for m in markers) if i != -1]
+            if hits:
+                del buf[:min(hits)]
+                in_data = True
+            else:
+                del buf[:-keep]
+        if in_data and buf.count(YT_VIDEO_RENDERER_KEY) >= want:
+            return True
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        buf += chunk
+
+
+class ParseStage:
+    """Where YouTube responses are parsed: on the searching thread, or in a process pool.
+
+    ``"thread"`` parses renderers as the bytes arrive and stops reading early.
+    ``"process"`` reads just far enough to hold the wanted renderers (a cheap
+    byte search), hands those bytes to a worker process and gets back only the
+    candidate dicts, so parsing neither holds this process's GIL (Tk stays
+    smooth) nor is capped at one core for bulk resolution.
+    """
+
+    MODES = ("thread", "process")
+
+    def __init__(self, mode: str = "thread", workers: int = 0):
+        self.mode = mode if mode in self.MODES else "thread"
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 2) - 1)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn, not fork: forking a process with Tk and worker threads isn't safe
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def warm_up(self) -> None:
+        """Start the worker processes now instead of on the first search."""
+        if self.mode == "process":
+            pool = self._executor()
+            for fut in [pool.submit(parse_candidates, b"", 1, ()) for _ in range(self.workers)]:
+                fut.result()
+
+    def parse(self, chunks: Iterable[bytes], limit: int, markers: Iterable[str] = YT_INITIAL_DATA_MARKERS,
+              cancel: Optional[threading.Event] = None) -> list[dict]:
+        if self.mode == "thread":
+            return [candidate_from_renderer(r) for r in iter_video_renderers(chunks, limit, markers)]
+        markers = tuple(markers)
+        chunks = iter(chunks)
+        buf = bytearray()
+        # One key past the last wanted renderer means that one is complete; read on
+        # if some renderers turn out not to be videos (no videoId)
+        want = limit + 1
+        while True:
+            more = _collect_renderer_bytes(chunks, buf, want, markers)
+            found = self._executor().submit(parse_candidates, bytes(buf), limit, markers).result()
+            _check_cancel(cancel)
+            if len(found) >= limit or not more:
+                return found
+            want *= 2
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_INLINE_PARSE = ParseStage("thread")
+
+
+def search_youtube_candidates(query: str, limit: int = DEFAULT_SETTINGS["youtube_candidates"], session=None,
+                              base: Optional[str] = None, cancel: Optional[threading.Event] = None,
+                              limiter: Optional[RateLimiter] = None, meter: Optional[dict] = None,
+                              parse: Optional[ParseStage] = None) -> list[dict]:
+    """The first ``limit`` videos of one results page as candidate dicts (page order).
+
+    With a ``meter`` dict, fills in fetch_ms (request + waiting on the body),
+    parse_ms (everything else) and bytes read. ``parse`` picks where the
+    page is parsed (default: on this thread).
+    """
+    return run_flow(_html_search_flow(base or YOUTUBE_BASE, query, limit), lambda _origin: session, limiter,
+                    cancel, meter, parse)
+
+
+def _html_search_flow(base: str, query: str, limit: int):
+    return (yield HttpCall("GET", f"{base}/results", params={"search_query": query}, headers=YOUTUBE_HEADERS,
+                           timeout=20, stage="youtube", markers=YT_INITIAL_DATA_MARKERS, limit=limit))
+
+
+def _stream_candidates(resp, limit: int, cancel: Optional[threading.Event], meter: Optional[dict],
+                       markers: Iterable[str] = YT_INITIAL_DATA_MARKERS,
+                       parse: Optional[ParseStage] = None) -> list[dict]:
+    """Candidates from a streamed response holding videoRenderers; releases the response either way.
+
+    With a ``meter``, the time spent waiting on the body and its size are added to it.
+    """
+    parse = parse or _INLINE_PARSE
+    try:
+        resp.raise_for_status()
+        chunks = _cancellable(resp.iter_content(YT_CHUNK_SIZE), cancel)
+        return parse.parse(chunks if meter is None else _metered(chunks, meter), limit, markers, cancel)
+    finally:
+        if cancel is not None and cancel.is_set():
+            resp.close()
+        else:
+            _release_response(resp)
+
+
+# YouTube's own web client talks to this JSON API; a minimal context is enough for search
+INNERTUBE_CLIENT = {"clientName": "WEB", "clientVersion": "2.20240101.00.00", "hl": "en", "gl": "US"}
+# Search filter: videos only (no channels / playlists / shorts shelves)
+INNERTUBE_VIDEOS_ONLY = "EgIQAQ%3D%3D"
+INNERTUBE_HEADERS = dict(YOUTUBE_HEADERS, **{"Content-Type": "application/json", "X-YouTube-Client-Name": "1",
+                                             "X-YouTube-Client-Version": INNERTUBE_CLIENT["clientVersion"]})
+
+
+def search_innertube_candidates(query: str, limit: int = DEFAULT_SETTINGS["youtube_candidates"], session=None,
+                                base: Optional[str] = None, cancel: Optional[threading.Event] = None,
+                                limiter: Optional[RateLimiter] = None, meter: Optional[dict] = None,
+                                parse: Optional[ParseStage] = None) -> list[dict]:
+    """Like search_youtube_candidates, via the JSON search endpoint: no HTML or scripts to download."""
+    return run_flow(_innertube_search_flow(base or YOUTUBE_BASE, query, limit), lambda _origin: session, limiter,
+                    cancel, meter, parse)
+
+
+def _innertube_search_flow(base: str, query: str, limit: int):
+    return (yield HttpCall("POST", f"{base}/youtubei/v1/search", params={"prettyPrint": "false"},
+                           data=_innertube_body(query), headers=INNERTUBE_HEADERS, timeout=20, stage="youtube",
+                           markers=(), limit=limit))
+
+
+def _innertube_body(query: str) -> str:
+    return json.dumps({"context": {"client": INNERTUBE_CLIENT}, "query": query, "params": INNERTUBE_VIDEOS_ONLY})
+
+
+_ISO_DURATION_RE = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def _parse_iso_duration(text: str) -> Optional[int]:
+    """"PT3M45S" → 225."""
+    m = _ISO_DURATION_RE.match(text or "")
+    if not m or not any(m.groups()):
+        return None
+    d, h, mi, sec = (int(g or 0) for g in m.groups())
+    return ((d * 24 + h) * 60 + mi) * 60 + sec
+
+
+def search_data_api_candidates(query: str, api_key: str, limit: int = DEFAULT_SETTINGS["youtube_candidates"],
+                               session=None, base: Optional[str] = None, cancel: Optional[threading.Event] = None,
+                               limiter: Optional[RateLimiter] = None, meter: Optional[dict] = None) -> list[dict]:
+    """Candidates from the YouTube Data API v3: search.list, then videos.list for the durations."""
+    return run_flow(_data_api_search_flow(base or YOUTUBE_API_BASE, api_key, query, limit),
+                    lambda _origin: session, limiter, cancel, meter)
+
+
+def _data_api_search_flow(base: str, api_key: str, query: str, limit: int):
+    resp = yield HttpCall("GET", f"{base}/youtube/v3/search", stage="youtube", params={
+        "part": "snippet", "type": "video", "maxResults": limit, "q": query, "key": api_key})
+    resp.raise_for_status()
+    items = _data_api_items(resp.json())
+    videos = {}
+    if items:
+        resp = yield HttpCall("GET", f"{base}/youtube/v3/videos", stage="youtube", params={
+            "part": "contentDetails", "id": ",".join(it["id"]["videoId"] for it in items), "key": api_key})
+        resp.raise_for_status()
+        videos = resp.json()
+    return _data_api_candidates(items, videos)
+
+
+def _data_api_items(search: dict) -> list[dict]:
+    """The video hits of a search.list response."""
+    return [it for it in search.get("items") or [] if isinstance(it.get("id"), dict) and it["id"].get("videoId")]
+
+
+def _data_api_candidates(items: list[dict], videos: dict) -> list[dict]:
+    """Candidate dicts from search.list hits plus the videos.list response holding their durations."""
+    durations = {v.get("id"): _parse_iso_duration((v.get("contentDetails") or {}).get("duration", ""))
+                 for v in videos.get("items") or []}
+    found = []
+    for it in items:
+        snippet = it.get("snippet") or {}
+        vid = it["id"]["videoId"]
+        found.append({"video_id": vid, "title": html.unescape(snippet.get("title") or ""),
+                      "channel": html.unescape(snippet.get("channelTitle") or ""),
+                      "duration_s": durations.get(vid), "badges": []})
+    return found
+
+
+class SearchBackend:
+    """A way of turning a query into candidate dicts (see candidate_from_renderer), in the site's order."""
+
+    name = ""
+
+    def __init__(self, base: str, parse: Optional[ParseStage] = None):
+        self.base = base
+        self.parse = parse
+
+    def available(self) -> bool:
+        return True
+
+    def flow(self, query: str, limit: int):
+        """The requests of one search (see HttpCall); returns up to ``limit`` candidate dicts."""
+        raise NotImplementedError
+
+    def search(self, query: str, limit: int, session, limiter: Optional[RateLimiter] = None,
+               cancel: Optional[threading.Event] = None, meter: Optional[dict] = None) -> list[dict]:
+        return run_flow(self.flow(query, limit), lambda _origin: session, limiter, cancel, meter, self.parse)
+
+
+class HtmlSearch(SearchBackend):
+    """Scrape the youtube.com/results page (large, but needs nothing)."""
+
+    name = "html"
+
+    def flow(self, query, limit):
+        return _html_search_flow(self.base, query, limit)
+
+
+class InnertubeSearch(SearchBackend):
+    """POST to YouTube's internal JSON search API: the same renderers without the page around them."""
+
+    name = "innertube"
+
+    def flow(self, query, limit):
+        return _innertube_search_flow(self.base, query, limit)
+
+
+class DataApiSearch(SearchBackend):
+    """The official Data API v3; needs an API key and spends quota (100 units per search)."""
+
+    name = "data_api"
+
+    def __init__(self, base: str, api_key: str = ""):
+        super().__init__(base)
+        self.api_key = api_key
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def flow(self, query, limit):
+        return _data_api_search_flow(self.base, self.api_key, query, limit)
+
+
+SEARCH_BACKENDS = {b.name: b for b in (HtmlSearch, InnertubeSearch, DataApiSearch)}
+# After a backend fails, the next ones are tried first for this long
+BACKEND_COOLDOWN_S = 300.0
+
+
+# Adaptive hedging: recent search latencies kept, samples needed before trusting their p95, lowest delay
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_MS = 250.0
+# How often a hedged search re-checks the caller's cancel event
+HEDGE_POLL_S = 0.05
+
+
+class Hedger:
+    """When to send a second, racing search request, how many are allowed, and what they bought.
+
+    ``mode`` is "fixed" (always ``delay_ms``) or "adaptive" (the p95 of recent
+    search latencies, ``delay_ms`` until there are enough of them). At most
+    ``per_min`` hedges go out in any 60 s, so a slow YouTube doesn't get twice
+    the traffic.
+    """
+
+    MODES = ("off", "fixed", "adaptive")
+
+    def __init__(self, mode: str = "fixed", delay_ms: float = DEFAULT_SETTINGS["hedge_delay_ms"],
+                 per_min: int = DEFAULT_SETTINGS["hedges_per_min"]):
+        self.mode = mode if mode in self.MODES else "off"
+        self.delay_ms = float(delay_ms)
+        self.per_min = int(per_min)
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=HEDGE_WINDOW)
+        self._sent: deque = deque()
+        self.counts = {"searches": 0, "hedged": 0, "hedge_wins": 0, "capped": 0, "saved_ms": 0.0}
+
+    def delay_s(self) -> float:
+        with self._lock:
+            if self.mode == "adaptive" and len(self._latencies) >= HEDGE_MIN_SAMPLES:
+                vals = sorted(self._latencies)
+                return max(HEDGE_MIN_DELAY_MS, vals[int(0.95 * (len(vals) - 1))]) / 1000
+        return max(HEDGE_MIN_DELAY_MS, self.delay_ms) / 1000
+
+    def observe(self, ms: float) -> None:
+        """Time until a search answered (hedged or not)."""
+        with self._lock:
+            self._latencies.append(ms)
+            self.counts["searches"] += 1
+
+    def allow(self) -> bool:
+        """Take a hedge from this minute's allowance, if there's any left."""
+        now = time.monotonic()
+        with self._lock:
+            while self._sent and now - self._sent[0] > 60:
+                self._sent.popleft()
+            if len(self._sent) >= self.per_min:
+                self.counts["capped"] += 1
+                return False
+            self._sent.append(now)
+            self.counts["hedged"] += 1
+            return True
+
+    def won(self, saved_ms: float) -> None:
+        """The hedge answered first; the slower request answered ``saved_ms`` later."""
+        with self._lock:
+            self.counts["hedge_wins"] += 1
+            self.counts["saved_ms"] = round(self.counts["saved_ms"] + saved_ms, 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            c = dict(self.counts)
+        c["hedge_rate"] = round(c["hedged"] / c["searches"], 3) if c["searches"] else 0.0
+        c["delay_ms"] = round(self.delay_s() * 1000, 1)
+        c["mode"] = self.mode
+        return c
+
+
+def _backend_names(spec) -> list[str]:
+    names = spec.split(",") if isinstance(spec, str) else list(spec)
+    names = [n.strip().lower() for n in names if n.strip().lower() in SEARCH_BACKENDS]
+    return list(dict.fromkeys(names)) or ["html"]
+
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# Words that mark a different recording than the studio track, unless the Spotify title has them too
+_VERSION_WORDS = {"live", "cover", "karaoke", "instrumental", "remix", "nightcore", "reaction", "slowed",
+                  "sped", "8d", "acoustic", "tutorial", "lesson", "reverb", "bass", "boosted", "mashup", "1hour",
+                  "hour", "loop"}
+# Title noise that says nothing about which recording it is
+_NOISE_WORDS = {"official", "video", "audio", "music", "lyrics", "lyric", "hd", "hq", "4k", "mv", "visualizer",
+                "the", "a", "an", "ft", "feat", "featuring", "and", "x", "with", "topic", "vevo"}
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.casefold()))
+
+
+def score_candidate(c: dict, title: str, artist: str, duration_ms: Optional[int] = None) -> float:
+    """Match score (higher is better, roughly 0-1) of one candidate against the Spotify track."""
+    want_title = _tokens(title) - _NOISE_WORDS or _tokens(title)
+    want_artist = _tokens(artist.replace("&", " ")) - _NOISE_WORDS
+    got_title = _tokens(c.get("title") or "")
+    got_channel = _tokens(c.get("channel") or "")
+    score = 0.0
+    # Duration: the strongest signal against intros, live cuts and extended edits
+    if duration_ms and c.get("duration_s"):
+        delta = abs(c["duration_s"] - duration_ms / 1000)
+        score += 0.40 * max(0.0, 1.0 - delta / 30)
+    else:
+        score += 0.15
+    if want_title:
+        score += 0.30 * len(want_title & got_title) / len(want_title)
+    if want_artist:
+        score += 0.15 * len(want_artist & (got_title | got_channel)) / len(want_artist)
+    unwanted = (got_title & _VERSION_WORDS) - _tokens(title)
+    score -= 0.15 * min(2, len(unwanted))
+    # Official upload signals
+    channel = (c.get("channel") or "").casefold()
+    badges = c.get("badges") or []
+    if channel.endswith(" - topic"):
+        score += 0.15
+    if "BADGE_STYLE_TYPE_VERIFIED_ARTIST" in badges or channel.endswith("vevo"):
+        score += 0.10
+    elif "BADGE_STYLE_TYPE_VERIFIED" in badges:
+        score += 0.04
+    return round(score, 4)
+
+
+def rank_candidates(candidates: list[dict], title: str, artist: str, duration_ms: Optional[int] = None) -> list[dict]:
+    """Candidates with a ``score``, best first; ties keep YouTube's order."""
+    n = len(candidates)
+    ranked = []
+    for i, c in enumerate(candidates):
+        # A small nudge towards YouTube's own ordering
+        ranked.append(dict(c, score=round(score_candidate(c, title, artist, duration_ms) + 0.03 * (n - i) / n, 4)))
+    ranked.sort(key=lambda c: -c["score"])
+    return ranked
+
+
+def rate_limiter_for(settings: dict, spotify_accounts_base: str = SPOTIFY_ACCOUNTS_BASE,
+                     spotify_api_base: str = SPOTIFY_API_BASE, youtube_base: str = YOUTUBE_BASE,
+                     youtube_api_base: str = YOUTUBE_API_BASE,
+                     spotify_open_base: str = SPOTIFY_OPEN_BASE) -> RateLimiter:
+    """A RateLimiter using the rate settings for the given hosts."""
+    spotify = float(settings.get("spotify_rate_per_s", DEFAULT_SETTINGS["spotify_rate_per_s"]))
+    youtube = float(settings.get("youtube_rate_per_s", DEFAULT_SETTINGS["youtube_rate_per_s"]))
+    rates = {urlsplit(youtube_api_base).netloc: youtube, urlsplit(youtube_base).netloc: youtube}
+    # Spotify's rate wins if the bases share a host (e.g. the bench stand-in)
+    rates.update({urlsplit(spotify_accounts_base).netloc: spotify, urlsplit(spotify_api_base).netloc: spotify,
+                  urlsplit(spotify_open_base).netloc: spotify})
+    return RateLimiter(rates, budget_per_min=float(settings.get("request_budget_per_min",
+                                                                 DEFAULT_SETTINGS["request_budget_per_min"])))
+
+
+class Resolver:
+    """Holds the Spotify token cache and one pooled keep-alive session per host.
+
+    Safe to share between worker threads: the token is refreshed under a lock
+    shortly before it expires, and a 401 from the Web API forces one refresh + retry.
+    With a ``cache``, ``resolve_track`` answers repeat tracks without any network.
+    Every request goes through ``limiter`` (per-host rate, global budget, 429 /
+    Retry-After and transient-error retries); pass ``limiter=False`` to send directly.
+    With ``stats`` (default: from S2Y_STATS*, see spotify_to_youtube_stats) each
+    stage of each lookup is timed; ``stats=False`` turns that off.
+    A track the cache doesn't know by ID is still answered from it when an
+    earlier song matches its normalized title + artist at ``fuzzy_threshold``.
+    ``parse_mode="process"`` parses YouTube responses in worker processes (see ParseStage).
+    ``hedge_mode`` "fixed" / "adaptive" races a second search when the first is slow (see Hedger).
+    ``metadata_providers`` are tried in order for a track's title + artist (see MetadataProvider);
+    with "embed" first, a track needs no credentials and no token round trip.
+    The ``*_base`` arguments point it at other hosts (e.g. the bench stand-in server).
+
+    Other engines (spotify_to_youtube_async) drive a lookup through its steps:
+    cached_result, check_credentials, track_meta_flow / use_batch_meta,
+    song_hit, search_order + search_flow and pick_result.
+    """
+
+    def __init__(self, client_id: str = "", client_secret: str = "", cache: Optional[TrackCache] = None,
+                 concurrency: int = DEFAULT_SETTINGS["youtube_concurrency"],
+                 candidates: int = DEFAULT_SETTINGS["youtube_candidates"],
+                 spotify_accounts_base: Optional[str] = None, spotify_api_base: Optional[str] = None,
+                 youtube_base: Optional[str] = None, limiter=None, stats=None,
+                 search_backends=DEFAULT_SETTINGS["search_backends"], youtube_api_key: str = "",
+                 youtube_api_base: Optional[str] = None,
+                 fuzzy_threshold: float = DEFAULT_SETTINGS["fuzzy_threshold"],
+                 parse_mode: str = DEFAULT_SETTINGS["parse_mode"],
+                 parse_workers: int = DEFAULT_SETTINGS["parse_workers"],
+                 hedge_mode: str = DEFAULT_SETTINGS["hedge_mode"],
+                 hedge_delay_ms: float = DEFAULT_SETTINGS["hedge_delay_ms"],
+                 hedges_per_min: int = DEFAULT_SETTINGS["hedges_per_min"],
+                 metadata_providers=DEFAULT_SETTINGS["metadata_providers"],
+                 spotify_open_base: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._token_fetch_lock = threading.Lock()
+        self.spotify_accounts_base = spotify_accounts_base or SPOTIFY_ACCOUNTS_BASE
+        self.spotify_api_base = spotify_api_base or SPOTIFY_API_BASE
+        self.youtube_base = youtube_base or YOUTUBE_BASE
+        self.youtube_api_base = youtube_api_base or YOUTUBE_API_BASE
+        self.spotify_open_base = spotify_open_base or SPOTIFY_OPEN_BASE
+        self.cache = cache
+        self.concurrency = max(1, int(concurrency))
+        self.candidates = max(1, int(candidates))
+        self.fuzzy_threshold = float(fuzzy_threshold)
+        if limiter is None:
+            limiter = rate_limiter_for(DEFAULT_SETTINGS, self.spotify_accounts_base, self.spotify_api_base,
+                                       self.youtube_base, self.youtube_api_base, self.spotify_open_base)
+        self.limiter: Optional[RateLimiter] = limiter or None
+        self.stats: Optional[StageStats] = (stats_from_env() if stats is None else stats) or None
+        self.parse = ParseStage(parse_mode, parse_workers)
+        self.hedger: Optional[Hedger] = None
+        if hedge_mode in ("fixed", "adaptive"):
+            self.hedger = Hedger(hedge_mode, hedge_delay_ms, hedges_per_min)
+        self._search_pool: Optional[ThreadPoolExecutor] = None
+        self.backends: list[SearchBackend] = []
+        self._backend_down_until: dict[str, float] = {}
+        self.set_search_backends(search_backends, youtube_api_key)
+        self.providers: list[MetadataProvider] = []
+        self._provider_down_until: dict[str, float] = {}
+        self.set_metadata_providers(metadata_providers)
+        self._sessions: dict[str, "requests.Session"] = {}
+        self._token: Optional[str] = None
+        self._token_expiry = 0.0
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    def set_credentials(self, client_id: str, client_secret: str) -> None:
+        with self._lock:
+            if (client_id, client_secret) != (self.client_id, self.client_secret):
+                self._token, self._token_expiry = None, 0.0
+            self.client_id, self.client_secret = client_id, client_secret
+
+    def set_search_backends(self, names, youtube_api_key: str = "") -> None:
+        """Backends to try in order, e.g. "innertube,html" (unknown names are ignored)."""
+        backends = []
+        for name in _backend_names(names):
+            if name == "data_api":
+                backends.append(DataApiSearch(self.youtube_api_base, youtube_api_key))
+            else:
+                backends.append(SEARCH_BACKENDS[name](self.youtube_base, self.parse))
+        with self._lock:
+            self.backends = backends
+            self._backend_down_until = {}
+
+    def set_metadata_providers(self, names) -> None:
+        """Track metadata sources to try in order, e.g. "embed,api,oembed" (unknown names are ignored)."""
+        providers = []
+        for name in _provider_names(names):
+            cls = METADATA_PROVIDERS[name]
+            providers.append(cls(self.spotify_api_base if cls.needs_credentials else self.spotify_open_base))
+        with self._lock:
+            self.providers = providers
+            self._provider_down_until = {}
+
+    def session(self, base: str) -> "requests.Session":
+        """Pooled session for a scheme://host base URL (created on first use)."""
+        with self._lock:
+            sess = self._sessions.get(base)
+            if sess is None:
+                requests = _requests()
+                sess = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(8, self.concurrency))
+                sess.mount(base, adapter)
+                self._sessions[base] = sess
+            return sess
+
+    def cached_token(self) -> Optional[str]:
+        """The current token if it's still good, without fetching one."""
+        with self._lock:
+            return self._token if self._token and time.monotonic() < self._token_expiry else None
+
+    def store_token(self, token: str, expires_in: int) -> None:
+        """Keep a token fetched elsewhere (the asyncio engine shares this cache)."""
+        with self._lock:
+            self._token = token
+            self._token_expiry = time.monotonic() + max(0, expires_in - TOKEN_REFRESH_MARGIN)
+
+    def token(self, force_refresh: bool = False) -> str:
+        with self._lock:
+            if not force_refresh and self._token and time.monotonic() < self._token_expiry:
+                return self._token
+            stale = self._token
+        # One POST at a time; threads that waited here reuse the token it got.
+        # Kept separate from _lock so a slow POST doesn't block session lookups.
+        with self._token_fetch_lock:
+            with self._lock:
+                if self._token and self._token != stale and time.monotonic() < self._token_expiry:
+                    return self._token
+                client_id, client_secret = self.client_id, self.client_secret
+            token, expires_in = run_flow(_token_flow(self.spotify_accounts_base, client_id, client_secret),
+                                         self.session, self.limiter, stats=self.stats)
+            self.store_token(token, expires_in)
+            return token
+
+    def invalidate_token(self) -> None:
+        with self._lock:
+            self._token, self._token_expiry = None, 0.0
+
+    def spotify_get(self, path: str, params: Optional[dict] = None, cancel: Optional[threading.Event] = None) -> dict:
+        """GET a Web API path (or an absolute ``next`` URL) with the cached bearer token; retries once on 401."""
+        return self._drive(_spotify_get_flow(self.spotify_api_base, path, params), cancel)
+
+    def _drive(self, flow, cancel: Optional[threading.Event] = None, meter: Optional[dict] = None):
+        """run_flow with this resolver's sessions, limiter, parse stage, token and stats."""
+        return run_flow(flow, self.session, self.limiter, cancel, meter, self.parse,
+                        lambda rejected: self.token(force_refresh=rejected is not None), self.stats)
+
+    def fetch_title_artist(self, spotify_url: str, cancel: Optional[threading.Event] = None) -> tuple[str, str]:
+        return self.fetch_track_meta(spotify_url, cancel=cancel)[:2]
+
+    def fetch_track_meta(self, spotify_url: str,
+                         cancel: Optional[threading.Event] = None) -> tuple[str, str, Optional[int]]:
+        """(title, artist, duration_ms) for a track URL, from the first provider that names title and artist.
+
+        A provider that errors is skipped for BACKEND_COOLDOWN_S (not for a 404:
+        that's the track). If none names the artist, the first title found is used.
+        """
+        track_id = extract_track_id(spotify_url)
+        if not track_id:
+            raise ValueError("Please paste a valid Spotify *track* URL.")
+        return self._track_meta(track_id, cancel)
+
+    def _track_meta(self, track_id: str, cancel: Optional[threading.Event] = None) -> tuple[str, str, Optional[int]]:
+        return self._drive(self.track_meta_flow(track_id), cancel)
+
+    def track_meta_flow(self, track_id: str):
+        """fetch_track_meta's provider chain as a flow (the asyncio engine drives it too)."""
+        partial = None
+        errors: list[tuple[str, Exception]] = []
+        for provider in self.meta_order():
+            try:
+                meta = yield from provider.flow(track_id)
+            except LOOKUP_ERRORS as e:
+                errors.append((provider.name, e))
+                self._provider_failed(provider, e)
+                continue
+            if meta[1]:
+                return meta
+            partial = partial or meta
+        if partial is not None:
+            return partial
+        if len(errors) == 1:
+            raise errors[0][1]
+        if errors:
+            reasons = "; ".join(f"{name}: {e}" for name, e in errors)
+            raise RuntimeError(f"No track data for {track_id} from any source ({reasons})") from errors[-1][1]
+        raise RuntimeError("Spotify API credentials are missing. Use Settings → Spotify API Credentials…")
+
+    def meta_order(self) -> list[MetadataProvider]:
+        """Usable providers (the Web API only with credentials) not cooling down (all of them if every one is)."""
+        now = time.monotonic()
+        with self._lock:
+            has_credentials = bool(self.client_id and self.client_secret)
+            providers = [p for p in self.providers if has_credentials or not p.needs_credentials]
+            ready = [p for p in providers if self._provider_down_until.get(p.name, 0.0) <= now]
+        return ready or providers
+
+    def _provider_failed(self, provider: MetadataProvider, error: Exception) -> None:
+        if _http_status(error) == 404:
+            return
+        with self._lock:
+            self._provider_down_until[provider.name] = time.monotonic() + BACKEND_COOLDOWN_S
+        if self.stats is not None:
+            self.stats.incr(f"provider_{provider.name}_failures")
+
+    def use_batch_meta(self, track_ids: list[str]) -> bool:
+        """Several tracks at once: one Web API request per 50 beats a page fetch per track, if we can sign in."""
+        return (len(track_ids) > 1 and bool(self.client_id and self.client_secret)
+                and any(p.needs_credentials for p in self.providers))
+
+    def fetch_tracks(self, track_ids: list[str], cancel: Optional[threading.Event] = None) -> Iterator[TrackMeta]:
+        """Yield (track_id, title, artist, duration_ms) for the tracks fetch_track_metas found; the rest are left out."""
+        for track_id, meta in self.fetch_track_metas(track_ids, cancel).items():
+            if not isinstance(meta, Exception):
+                yield (track_id, *meta)
+
+    def fetch_track_metas(self, track_ids: list[str], cancel: Optional[threading.Event] = None) -> dict:
+        """{track_id: (title, artist, duration_ms), or the exception its lookup raised} for every ID given.
+
+        Uses the multi-ID /v1/tracks?ids= endpoint, 50 per call, when use_batch_meta allows.
+        Otherwise each track goes through fetch_track_meta, ``concurrency`` at a time.
+        """
+        if not self.use_batch_meta(track_ids):
+            def one(track_id: str):
+                try:
+                    return self._track_meta(track_id, cancel)
+                except Cancelled:
+                    raise
+                except Exception as e:
+                    return e
+
+            with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(track_ids)))) as pool:
+                return dict(zip(track_ids, pool.map(one, track_ids)))
+        metas: dict = {}
+        for batch in _chunks(track_ids, SPOTIFY_IDS_BATCH):
+            try:
+                metas.update(_batch_metas(batch, self._drive(_tracks_flow(self.spotify_api_base, batch), cancel)))
+            except Cancelled:
+                raise
+            except Exception as e:
+                metas.update(dict.fromkeys(batch, e))
+        return metas
+
+    def iter_collection_tracks(self, kind: str, collection_id: str,
+                               cancel: Optional[threading.Event] = None) -> Iterator[list[TrackMeta]]:
+        """Yield one page at a time of (track_id, title, artist, duration_ms) for a playlist or album."""
+        url, params = _collection_request(kind, collection_id)
+        while url:
+            page, url = self._drive(_collection_page_flow(self.spotify_api_base, kind, url, params), cancel)
+            params = None  # the "next" URL already carries offset/limit
+            yield page
+
+    def search_youtube(self, query: str, cancel: Optional[threading.Event] = None) -> Optional[str]:
+        """Video ID of the first candidate for ``query`` (backend order, not ranked), or None."""
+        found = self.search_candidates(query, cancel)
+        return found[0]["video_id"] if found else None
+
+    def search_candidates(self, query: str, cancel: Optional[threading.Event] = None,
+                          meter: Optional[dict] = None) -> list[dict]:
+        return self._search(query, cancel, meter)[0]
+
+    def _search(self, query: str, cancel: Optional[threading.Event] = None,
+                meter: Optional[dict] = None) -> tuple[list[dict], Optional[str]]:
+        """(candidates, backend name) from the first backend that answers.
+
+        A backend that errors (or finds nothing) is skipped for BACKEND_COOLDOWN_S,
+        unless every backend is cooling down, in which case they're all tried.
+        """
+        backends = self.search_order()
+        if self.hedger is not None and backends:
+            return self._hedged_search(query, backends, cancel, meter)
+        return self._search_chain(query, backends, cancel, meter)
+
+    def search_order(self) -> list[SearchBackend]:
+        """Usable backends that aren't cooling down after a failure (all of them if every one is)."""
+        now = time.monotonic()
+        with self._lock:
+            backends = [b for b in self.backends if b.available()]
+            ready = [b for b in backends if self._backend_down_until.get(b.name, 0.0) <= now]
+        return ready or backends
+
+    def _backend_failed(self, backend: SearchBackend) -> None:
+        with self._lock:
+            self._backend_down_until[backend.name] = time.monotonic() + BACKEND_COOLDOWN_S
+        if self.stats is not None:
+            self.stats.incr(f"backend_{backend.name}_failures")
+
+    def _search_chain(self, query: str, backends: list[SearchBackend], cancel: Optional[threading.Event],
+                      meter: Optional[dict]) -> tuple[list[dict], Optional[str]]:
+        return self._drive(self.search_flow(query, backends), cancel, meter)
+
+    def search_flow(self, query: str, backends: list[SearchBackend]):
+        """The backends in turn until one finds something, as a flow; returns (candidates, backend name)."""
+        last_error: Optional[Exception] = None
+        for backend in backends:
+            try:
+                found = yield from backend.flow(query, self.candidates)
+            except Exception as e:
+                last_error = e
+                found = []
+            if found:
+                return found, backend.name
+            self._backend_failed(backend)
+        if last_error is not None:
+            raise last_error
+        return [], None
+
+    def _hedged_search(self, query: str, backends: list[SearchBackend], cancel: Optional[threading.Event],
+                       meter: Optional[dict]) -> tuple[list[dict], Optional[str]]:
+        """_search_chain, plus a racing second request (next backend first) if the first is slow.
+
+        The first non-empty answer wins; the other request is cancelled.
+        """
+        hedger = self.hedger
+        with self._lock:
+            if self._search_pool is None:
+                self._search_pool = ThreadPoolExecutor(2 * self.concurrency + 2, thread_name_prefix="s2y-search")
+            pool = self._search_pool
+        attempts: list[tuple] = []  # (future, cancel event, meter)
+
+        def launch(chain: list[SearchBackend]) -> None:
+            ev = threading.Event()
+            m = {} if meter is not None else None
+            attempts.append((pool.submit(self._search_chain, query, chain, ev, m), ev, m))
+
+        t0 = time.perf_counter()
+        launch(backends)
+        deadline = time.monotonic() + hedger.delay_s()
+        hedge_pending = True
+        consumed: set[int] = set()
+        last_error: Optional[Exception] = None
+        try:
+            while True:
+                _check_cancel(cancel)
+                timeout = HEDGE_POLL_S
+                if hedge_pending:
+                    timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+                wait([a[0] for i, a in enumerate(attempts) if i not in consumed], timeout, FIRST_COMPLETED)
+                for i, (fut, _ev, m) in enumerate(attempts):
+                    if i in consumed or not fut.done():
+                        continue
+                    consumed.add(i)
+                    try:
+                        found, name = fut.result()
+                    except Cancelled:
+                        continue
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if not found:
+                        continue
+                    hedger.observe(_ms_since(t0))
+                    if meter is not None:
+                        meter.update(m)
+                    won_at = time.perf_counter()
+                    for j, (other, other_ev, _m) in enumerate(attempts):
+                        if j != i and not other.done():
+                            other_ev.set()
+                            if i > 0:
+                                # Saved: until the slower request's response showed up (and got cancelled)
+                                other.add_done_callback(lambda _f: hedger.won((time.perf_counter() - won_at) * 1000))
+                    return found, name
+                if len(consumed) == len(attempts):
+                    # Every request came back empty or failed (each already tried its fallbacks)
+                    if last_error is not None:
+                        raise last_error
+                    return [], None
+                if hedge_pending and time.monotonic() >= deadline:
+                    hedge_pending = False
+                    if hedger.allow():
+                        launch(backends[1:] + backends[:1] if len(backends) > 1 else backends)
+        finally:
+            for fut, ev, _m in attempts:
+                if not fut.done():
+                    ev.set()
+
+    def check_credentials(self, spotify_urls: Iterable[str] = ()) -> None:
+        """Raise unless the URLs can be looked up: tracks need credentials only if every provider is the Web API."""
+        if self.client_id and self.client_secret:
+            return
+        kinds = {(extract_spotify_ref(url) or ("track",))[0] for url in spotify_urls}
+        if kinds - {"track"}:
+            raise RuntimeError("Playlists and albums need Spotify API credentials. "
+                               "Use Settings → Spotify API Credentials…")
+        if all(p.needs_credentials for p in self.providers):
+            raise RuntimeError("Spotify API credentials are missing. Use Settings → Spotify API Credentials…")
+
+    def cached_result(self, track_id: str) -> Optional[dict]:
+        """The cached result for a track ID (``cached`` set), else None; reads SQLite."""
+        if self.cache is None or not track_id:
+            return None
+        t0 = time.perf_counter()
+        hit = self.cache.get(track_id)
+        if hit is not None:
+            hit["cached"] = True
+            hit["timings"] = {"cache_ms": _ms_since(t0)}
+        if self.stats is not None:
+            self.stats.add("cache", _ms_since(t0))
+            self.stats.incr("cache_hits" if hit is not None else "cache_misses")
+            if hit is not None:
+                self.stats.lookup_done(hit)
+        return hit
+
+    def song_hit(self, track_id: str, title: str, artist: str, duration_ms: Optional[int],
+                  query: str, timings: dict) -> Optional[dict]:
+        """The cached video of an already resolved song that matches this one, else None."""
+        if self.cache is None or self.fuzzy_threshold <= 0:
+            return None
+        t0 = time.perf_counter()
+        song = self.cache.find_song(title, artist, duration_ms, self.fuzzy_threshold)
+        timings["index_ms"] = _ms_since(t0)
+        if self.stats is not None:
+            self.stats.add("index", timings["index_ms"])
+            self.stats.incr("index_hits" if song is not None else "index_misses")
+        if song is None:
+            return None
+        if track_id:
+            self.cache.put(track_id, title, artist, query, song["video_id"], duration_ms)
+        res = {"track_id": track_id, "title": title, "artist": artist, "query": query,
+               "video_id": song["video_id"], "cached": True, "timings": timings, "duration_ms": duration_ms,
+               "score": song["score"], "alternatives": [],
+               "matched": {"title": song["title"], "artist": song["artist"], "score": song["score"]}}
+        if self.stats is not None:
+            self.stats.lookup_done(res)
+        return res
+
+    def _finish(self, track_id: str, title: str, artist: str, duration_ms: Optional[int] = None,
+                timings: Optional[dict] = None, cancel: Optional[threading.Event] = None) -> dict:
+        """YouTube search + ranking for known metadata, stored in the cache on success.
+
+        The best-scoring candidate becomes ``video_id``; the rest are returned,
+        best first, in ``alternatives``. A match in the song index skips the
+        search (``matched`` then names the song it was taken from).
+        """
+        timings = {} if timings is None else timings
+        query = build_query(title, artist)
+        hit = self.song_hit(track_id, title, artist, duration_ms, query, timings)
+        if hit is not None:
+            return hit
+        meter = {} if self.stats is not None else None
+        t0 = time.perf_counter()
+        candidates, backend = self._search(query, cancel, meter)
+        timings["youtube_ms"] = _ms_since(t0)
+        return self.pick_result(track_id, title, artist, duration_ms, query, candidates, backend, timings, meter)
+
+    def pick_result(self, track_id: str, title: str, artist: str, duration_ms: Optional[int], query: str,
+              candidates: list[dict], backend: Optional[str], timings: dict, meter: Optional[dict]) -> dict:
+        """The result of one search: ranked, cached and counted (``meter`` as filled in by the backend)."""
+        if not candidates:
+            raise RuntimeError("No YouTube results found for that track.")
+        stats = self.stats
+        t0 = time.perf_counter()
+        ranked = rank_candidates(candidates, title, artist, duration_ms)
+        vid = ranked[0]["video_id"]
+        if self.cache is not None and track_id:
+            self.cache.put(track_id, title, artist, query, vid, duration_ms)
+        res = {"track_id": track_id, "title": title, "artist": artist, "query": query, "video_id": vid,
+               "cached": False, "timings": timings, "duration_ms": duration_ms,
+               "score": ranked[0]["score"], "alternatives": ranked[1:], "backend": backend}
+        if stats is not None:
+            stats.add("rank", _ms_since(t0))
+            stats.add("youtube_fetch", meter["fetch_ms"], meter["bytes"])
+            stats.add("youtube_parse", meter["parse_ms"])
+            timings["youtube_parse_ms"] = round(meter["parse_ms"], 2)
+            timings["youtube_bytes"] = meter["bytes"]
+            stats.lookup_done(res)
+        return res
+
+    def resolve_track(self, spotify_url: str, cancel: Optional[threading.Event] = None) -> dict:
+        """Spotify track URL → dict(track_id, title, artist, query, video_id, cached, timings).
+
+        Raises Cancelled between (or during) network stages once ``cancel`` is set.
+        """
+        track_id = extract_track_id(spotify_url)
+        if not track_id:
+            raise ValueError("Please paste a valid Spotify *track* URL.")
+        hit = self.cached_result(track_id)
+        if hit is not None:
+            return hit
+        self.check_credentials([spotify_url])
+        t0 = time.perf_counter()
+        title, artist, duration_ms = self.fetch_track_meta(spotify_url, cancel=cancel)
+        return self._finish(track_id, title, artist, duration_ms, {"spotify_ms": _ms_since(t0)}, cancel=cancel)
+
+    def iter_tracks(self, spotify_urls: Iterable[str],
+                    cancel: Optional[threading.Event] = None) -> Iterator[list[TrackMeta]]:
+        """Expand track / playlist / album URLs into batches of (track_id, title, artist, duration_ms).
+
+        Single track URLs are grouped so their metadata comes from the multi-ID endpoint.
+        """
+        track_ids: list[str] = []
+        for url in spotify_urls:
+            ref = extract_spotify_ref(url)
+            if ref is None:
+                raise ValueError(f"Not a Spotify track, playlist or album URL: {url}")
+            kind, ref_id = ref
+            if kind == "track":
+                track_ids.append(ref_id)
+            else:
+                yield from self.iter_collection_tracks(kind, ref_id, cancel=cancel)
+        if track_ids:
+            yield list(self.fetch_tracks(track_ids, cancel=cancel))
+
+    def resolve_many(self, spotify_urls: Iterable[str], on_result: Optional[Callable[[dict], None]] = None,
+                     cancel: Optional[threading.Event] = None, skip: Collection[str] = ()) -> list[dict]:
+        """Resolve every track behind the given URLs, searching YouTube on a bounded pool.
+
+        Results stream to ``on_result`` as they finish (from worker threads); each
+        carries its position in ``index`` and an ``error`` string instead of a video
+        ID when that track failed. Cached tracks skip both Spotify and YouTube.
+        Track IDs in ``skip`` (e.g. already exported) are left out but keep their index.
+        Setting ``cancel`` drops the queued searches and raises Cancelled.
+        """
+        spotify_urls = list(spotify_urls)
+        results: list[dict] = []
+        lock = threading.Lock()
+
+        def emit(res: dict) -> None:
+            with lock:
+                results.append(res)
+            if on_result is not None:
+                on_result(res)
+
+        def work(index: int, track_id: str, title: str, artist: str, duration_ms: Optional[int]) -> None:
+            timings: dict = {}
+            try:
+                res = self._finish(track_id, title, artist, duration_ms, timings, cancel=cancel)
+            except Cancelled:
+                return
+            except Exception as e:
+                res = failed_result(track_id, e, title, artist, timings)
+            res["index"] = index
+            emit(res)
+
+        # One pass in input order, so every track's index is its position in the expanded
+        # input: skipped tracks keep theirs, cache hits answer without the network, and
+        # uncached track URLs are numbered now but fetched together (multi-ID endpoint)
+        # once the playlists / albums around them are expanded
+        refs = []
+        for url in spotify_urls:
+            ref = extract_spotify_ref(url)
+            if ref is None:
+                raise ValueError(f"Not a Spotify track, playlist or album URL: {url}")
+            refs.append(ref)
+        collections = [url for url, ref in zip(spotify_urls, refs) if ref[0] != "track"]
+        if collections:
+            self.check_credentials(collections)
+        deferred: list[tuple[int, str]] = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = []
+
+            def take(index: int, track_id: str, meta: Optional[tuple] = None) -> None:
+                if track_id in skip:
+                    return
+                hit = self.cached_result(track_id)
+                if hit is not None:
+                    hit["index"] = index
+                    emit(hit)
+                elif meta is None:
+                    deferred.append((index, track_id))
+                else:
+                    futures.append(pool.submit(work, index, track_id, *meta))
+
+            index = 0
+            for kind, ref_id in refs:
+                if kind == "track":
+                    take(index, ref_id)
+                    index += 1
+                    continue
+                for page in self.iter_collection_tracks(kind, ref_id, cancel=cancel):
+                    for track_id, *meta in page:
+                        take(index, track_id, tuple(meta))
+                        index += 1
+            if deferred:
+                self.check_credentials()
+                metas = self.fetch_track_metas(list(dict.fromkeys(t for _, t in deferred)), cancel=cancel)
+                for index, track_id in deferred:
+                    meta = metas[track_id]
+                    if isinstance(meta, Exception):
+                        # No metadata for it: still one (failed) result at its index
+                        emit(dict(failed_result(track_id, meta), index=index))
+                    else:
+                        futures.append(pool.submit(work, index, track_id, *meta))
+            for fut in as_completed(futures):
+                if cancel is not None and cancel.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+                fut.result()
+        _check_cancel(cancel)
+        results.sort(key=lambda r: r["index"])
+        return results
+
+    def warm_up(self) -> None:
+        """Open keep-alive connections (and fetch a token if credentials are set) before the first lookup."""
+        bases = [p.base for p in self.meta_order()] + [self.spotify_api_base, self.youtube_base]
+        for base in dict.fromkeys(bases):
+            try:
+                self.session(base).head(base, headers=BROWSER_HEADERS, timeout=5).close()
+            except Exception:
+                pass
+        if self.client_id and self.client_secret:
+            try:
+                self.token()
+            except Exception:
+                pass
+        if self.cache is not None and self.fuzzy_threshold > 0:
+            self.cache.warm_index()
+        self.parse.warm_up()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for sess in sessions:
+            sess.close()
+        self.parse.close()
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache is not None:
+            self.cache.close()
+
+
+# ------------------------- JSON records (CLI + server) -------------------------
+def result_record(res: dict, source: str) -> dict:
+    """The public JSON shape of one resolved (or failed) track."""
+    vid = res.get("video_id")
+    return {
+        "source": source,
+        "index": res.get("index", 0),
+        "track_id": res.get("track_id") or None,
+        "title": res.get("title") or None,
+        "artist": res.get("artist") or None,
+        "query": res.get("query") or None,
+        "video_url": f"https://youtu.be/{vid}" if vid else None,
+        "duration_ms": res.get("duration_ms"),
+        "cached": bool(res.get("cached")),
+        "score": res.get("score"),
+        "alternatives": [f"https://youtu.be/{a['video_id']}" for a in res.get("alternatives") or []],
+        "timings": res.get("timings") or {},
+        "matched": res.get("matched"),
+        "error": res.get("error"),
+    }
+
+
+def failed_result(track_id: str, error: Exception, title: str = "", artist: str = "",
+                  timings: Optional[dict] = None) -> dict:
+    """A resolve_many result for a track that couldn't be resolved (``error`` says why)."""
+    return {"track_id": track_id, "title": title, "artist": artist,
+            "query": build_query(title, artist) if title else "", "video_id": None, "cached": False,
+            "timings": timings if timings is not None else {}, "error": str(error)}
+
+
+def error_record(source: str, error: str, elapsed_ms: float) -> dict:
+    return {"source": source, "index": 0, "track_id": None, "title": None, "artist": None, "query": None,
+            "video_url": None, "duration_ms": None, "cached": False, "score": None, "alternatives": [], "timings": {"total_ms": elapsed_ms},
+            "matched": None, "error": error}
+
+
+def resolve_records(resolver: "Resolver", urls: Iterable[str], on_record: Callable[[dict], None],
+                    batch: bool = True, skip: Collection[str] = (),
+                    cancel: Optional[threading.Event] = None) -> None:
+    """Resolve URLs into result_record dicts, handed to ``on_record`` as each track finishes (from worker threads).
+
+    With ``batch``, all plain track URLs go through one resolve_many call (so their
+    metadata shares /v1/tracks?ids= requests); playlists and albums are always
+    resolved one URL at a time so one bad link doesn't sink the rest.
+    ``skip`` and ``cancel`` are passed to resolve_many (Cancelled propagates).
+    """
+    def run(group: list[str], source: str) -> None:
+        t0 = time.perf_counter()
+        # Batched track URLs: report each result against the URL it came from
+        by_id = {ref[1]: url for url in group for ref in [extract_spotify_ref(url)] if ref and ref[0] == "track"}
+        try:
+            resolver.resolve_many(group, on_result=lambda res: on_record(
+                result_record(res, by_id.get(res.get("track_id"), source))), cancel=cancel, skip=skip)
+        except Cancelled:
+            raise
+        except Exception as e:
+            on_record(error_record(source, str(e), _ms_since(t0)))
+
+    tracks: list[str] = []
+    for url in urls:
+        ref = extract_spotify_ref(url)
+        if ref is None:
+            on_record(error_record(url, "Not a Spotify track, playlist or album URL.", 0.0))
+        elif ref[0] == "track" and batch:
+            tracks.append(url)
+        else:
+            run([url], url)
+    if tracks:
+        run(tracks, tracks[0])
+
+
+class FetchJob:
+    """One submitted lookup: its generation, coalescing key and cancel flag."""
+
+    def __init__(self, scheduler: "FetchScheduler", generation: int, key, fn: Callable[["FetchJob"], None]):
+        self.scheduler = scheduler
+        self.generation = generation
+        self.key = key
+        self.fn = fn
+        self.cancel = threading.Event()
+
+    def is_current(self) -> bool:
+        """True while no newer job has been submitted; only then may results reach the UI."""
+        return not self.cancel.is_set() and self.scheduler.generation == self.generation
+
+
+class FetchScheduler:
+    """Single-flight lookup scheduler with a fixed number of worker threads.
+
+    Every ``submit`` starts a new generation: queued jobs that haven't started are
+    dropped and running ones get their ``cancel`` event set, so they stop at the
+    next network stage or chunk. Submitting the key that is already the newest
+    job (same track pasted twice, clipboard + typing racing) returns that job
+    instead of starting another. Thread count never exceeds ``workers``.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self.generation = 0
+        self._cond = threading.Condition()
+        self._queue: list[FetchJob] = []
+        self._running: list[FetchJob] = []
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, key, fn: Callable[[FetchJob], None]) -> FetchJob:
+        with self._cond:
+            latest = (self._queue or self._running or [None])[-1]
+            if latest is not None and latest.key == key and latest.is_current():
+                return latest
+            self.generation += 1
+            for job in self._queue + self._running:
+                job.cancel.set()
+            self._queue.clear()
+            job = FetchJob(self, self.generation, key, fn)
+            self._queue.append(job)
+            if len(self._threads) < self.workers and len(self._running) + len(self._queue) > len(self._threads):
+                t = threading.Thread(target=self._worker, name=f"fetch-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+            self._cond.notify()
+            return job
+
+    def cancel_all(self) -> None:
+        with self._cond:
+            self.generation += 1
+            for job in self._queue + self._running:
+                job.cancel.set()
+            self._queue.clear()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.cancel_all()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job = self._queue.pop(0)
+                self._running.append(job)
+            try:
+                if not job.cancel.is_set():
+                    job.fn(job)
+            except Cancelled:
+                pass
+            except Exception:
+                traceback.print_exc()  # keep the worker alive; job functions report their own errors
+            finally:
+                with self._cond:
+                    self._running.remove(job)
+
+
+def build_query(title: str, artist: str) -> str:
+    return f"{title} {artist}".strip() if (title and artist) else (title or artist)
+
+
+def is_probably_spotify_track_url(s: str) -> bool:
+    """Track URL, by the same rules the resolver uses (extract_spotify_ref)."""
+    return (extract_spotify_ref(s) or (None,))[0] == "track"
+
+
+def is_probably_spotify_url(s: str) -> bool:
+    """Track, playlist or album URL, by the same rules the resolver uses (extract_spotify_ref)."""
+    return extract_spotify_ref(s) is not None
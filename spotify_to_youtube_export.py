@@ -0,0 +1,217 @@
+"""
+spotify_to_youtube_export.py — streaming playlist export (M3U / CSV / JSONL)
+
+Each resolved track is written as soon as it finishes, never collected in
+memory, and the file is flushed (and fsynced) every few rows / seconds, so a
+crash halfway through a 5,000-track playlist keeps everything done so far.
+
+Resuming reads the track IDs already in the file and passes them to the
+resolver as ``skip``, so only the missing tracks are searched again. A torn
+last line from a crash is cut off first. Failed tracks are never counted as
+done: M3U leaves them out, CSV / JSONL record the error and retry them.
+
+    M3U    a "# spotify:track:<id>" comment, #EXTINF:<seconds>,<artist> - <title>, the link
+    CSV    index, track_id, title, artist, video_url, duration_s, score, error
+    JSONL  the CLI's records (see result_record)
+
+Used by the GUI's Export… button and ``spotify_to_youtube_cli.py --export``.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from spotify_to_youtube_core import Resolver, resolve_records
+
+EXPORT_FORMATS = ("m3u", "csv", "jsonl")
+EXPORT_FLUSH_ROWS = 50
+EXPORT_FLUSH_S = 2.0
+CSV_FIELDS = ("index", "track_id", "title", "artist", "video_url", "duration_s", "score", "error")
+_M3U_TRACK_RE = re.compile(r"^#\s*spotify:track:([A-Za-z0-9]+)\s*$")
+
+
+def export_format(path: str) -> Optional[str]:
+    """The export format implied by a file name (.m3u / .m3u8 / .csv / .jsonl / .ndjson), else None."""
+    ext = os.path.splitext(path)[1].lower()
+    return {".m3u": "m3u", ".m3u8": "m3u", ".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(ext)
+
+
+def _cut_torn_line(path: str) -> None:
+    """Drop a partial last line (the process died mid-write)."""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Walk back to the previous newline
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            nl = chunk.rfind(b"\n")
+            if nl >= 0:
+                f.truncate(pos - step + nl + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+
+def exported_track_ids(path: str, fmt: str) -> set[str]:
+    """Track IDs successfully written to an earlier export at ``path`` (empty if there is none)."""
+    done: set[str] = set()
+    try:
+        f = open(path, "r", encoding="utf-8", newline="")
+    except FileNotFoundError:
+        return done
+    with f:
+        if fmt == "m3u":
+            # An ID only counts once its link line made it to disk
+            pending = None
+            for line in f:
+                m = _M3U_TRACK_RE.match(line)
+                if m:
+                    pending = m.group(1)
+                elif pending and line.strip() and not line.startswith("#"):
+                    done.add(pending)
+                    pending = None
+        elif fmt == "csv":
+            for row in csv.DictReader(f):
+                if row.get("track_id") and row.get("video_url"):
+                    done.add(row["track_id"])
+        else:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(rec, dict) and rec.get("track_id") and rec.get("video_url"):
+                    done.add(rec["track_id"])
+    return done
+
+
+class ExportWriter:
+    """Appends result records to an export file from any thread, flushing every few rows / seconds.
+
+    With ``resume``, an existing file is kept and ``done`` holds the track IDs
+    it already has; otherwise the file is replaced.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, resume: bool = False,
+                 flush_rows: int = EXPORT_FLUSH_ROWS, flush_s: float = EXPORT_FLUSH_S):
+        fmt = fmt or export_format(path)
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format for {path!r}; use one of: {', '.join(EXPORT_FORMATS)}")
+        self.path = path
+        self.fmt = fmt
+        self.flush_rows = flush_rows
+        self.flush_s = flush_s
+        self.done: set[str] = set()
+        self.written = 0
+        self.failed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        existing = resume and os.path.exists(path) and os.path.getsize(path) > 0
+        if existing:
+            _cut_torn_line(path)
+            self.done = exported_track_ids(path, fmt)
+            self.skipped = len(self.done)
+        self._f = open(path, "a" if existing else "w", encoding="utf-8", newline="")
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        if not existing or os.path.getsize(path) == 0:
+            self._write_header()
+
+    def _write_header(self) -> None:
+        if self.fmt == "m3u":
+            self._f.write("#EXTM3U\n")
+        elif self.fmt == "csv":
+            self._f.write(self._csv_line(CSV_FIELDS))
+
+    @staticmethod
+    def _csv_line(values) -> str:
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow(values)
+        return buf.getvalue()
+
+    def _format(self, rec: dict) -> str:
+        if self.fmt == "jsonl":
+            return json.dumps(rec, ensure_ascii=False) + "\n"
+        seconds = round(rec["duration_ms"] / 1000) if rec.get("duration_ms") else None
+        if self.fmt == "csv":
+            return self._csv_line([rec.get("index"), rec.get("track_id") or "", rec.get("title") or "",
+                                   rec.get("artist") or "", rec.get("video_url") or "",
+                                   "" if seconds is None else seconds,
+                                   "" if rec.get("score") is None else rec["score"], rec.get("error") or ""])
+        if not rec.get("video_url"):
+            return ""
+        name = " - ".join(x.replace("\n", " ") for x in (rec.get("artist"), rec.get("title")) if x)
+        lines = f"# spotify:track:{rec['track_id']}\n" if rec.get("track_id") else ""
+        return lines + f"#EXTINF:{-1 if seconds is None else seconds},{name}\n{rec['video_url']}\n"
+
+    def write(self, rec: dict) -> None:
+        """Append one result_record (thread-safe); one record is always whole lines."""
+        text = self._format(rec)
+        with self._lock:
+            if rec.get("error"):
+                self.failed += 1
+            else:
+                self.written += 1
+                if rec.get("track_id"):
+                    self.done.add(rec["track_id"])
+            if not text:
+                return
+            self._f.write(text)
+            self._unflushed += 1
+            if self._unflushed >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_s:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._f.flush()
+        try:
+            os.fsync(self._f.fileno())
+        except OSError:
+            pass
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._f.closed:
+                self._flush()
+                self._f.close()
+
+    def __enter__(self) -> "ExportWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_urls(resolver: Resolver, urls: Iterable[str], path: str, fmt: Optional[str] = None,
+                resume: bool = False, cancel: Optional[threading.Event] = None,
+                on_record: Optional[Callable[[dict], None]] = None) -> ExportWriter:
+    """Resolve ``urls`` into an export file, streaming each track as it finishes.
+
+    Returns the (closed) writer for its counts: ``written``, ``failed`` and, when
+    resuming, ``skipped``. ``on_record`` also sees every record (from worker threads).
+    Raises Cancelled once ``cancel`` is set; what was written so far stays on disk.
+    """
+    with ExportWriter(path, fmt, resume=resume) as writer:
+        skip = frozenset(writer.done)
+
+        def write(rec: dict) -> None:
+            writer.write(rec)
+            if on_record is not None:
+                on_record(rec)
+
+        resolve_records(resolver, urls, write, skip=skip, cancel=cancel)
+    return writer
@@ -0,0 +1,328 @@
+"""
+spotify_to_youtube_history.py — session history pane for the GUI
+
+Every resolved track lands in a HistoryStore (compact ``__slots__`` records in
+one list). HistoryView draws only the rows that fit in its canvas from a fixed
+pool of canvas items, so scrolling, filtering and appending cost the same with
+10 rows or 100k. Worker threads hand results over through TkBatcher, which
+delivers them to the Tk thread in batches (one ``after`` per batch, not per row).
+
+Double-click / Enter re-opens a row's link, Ctrl+C copies it, right-click for more.
+"""
+
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+
+# Oldest rows are dropped past this many (a long night is a few thousand)
+HISTORY_MAX_ROWS = 100000
+HISTORY_ROW_PX = 20
+HISTORY_BATCH_MS = 100
+FILTER_DEBOUNCE_MS = 120
+
+
+class HistoryEntry:
+    __slots__ = ("ts", "title", "artist", "video_id", "track_id")
+
+    def __init__(self, ts: float, title: str, artist: str, video_id: str, track_id: Optional[str] = None):
+        self.ts = ts
+        self.title = title
+        self.artist = artist
+        self.video_id = video_id
+        self.track_id = track_id
+
+    @classmethod
+    def from_result(cls, res: dict) -> Optional["HistoryEntry"]:
+        """An entry for a resolver result, or None if it has no video."""
+        if not res.get("video_id"):
+            return None
+        return cls(time.time(), res.get("title") or "", res.get("artist") or "", res["video_id"], res.get("track_id"))
+
+    @property
+    def url(self) -> str:
+        return f"https://youtu.be/{self.video_id}"
+
+    def label(self) -> str:
+        return f"{self.title} — {self.artist}" if self.artist else self.title
+
+
+class HistoryStore:
+    """Append-only rows (oldest first) plus the indices of the rows matching the current filter."""
+
+    def __init__(self, max_rows: int = HISTORY_MAX_ROWS):
+        self.max_rows = max_rows
+        self.rows: list[HistoryEntry] = []
+        # Casefolded "title artist video_id" per row, so filtering is plain substring tests
+        self._keys: list[str] = []
+        self.query = ""
+        # Indices into rows, oldest first; None = no filter, every row
+        self.view: Optional[list[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows) if self.view is None else len(self.view)
+
+    def visible(self, i: int) -> HistoryEntry:
+        """The i-th row shown, newest first."""
+        n = len(self)
+        return self.rows[n - 1 - i] if self.view is None else self.rows[self.view[n - 1 - i]]
+
+    def _match(self, indices, words: list[str]) -> list[int]:
+        keys = self._keys
+        if len(words) == 1:
+            w = words[0]
+            return [i for i in indices if w in keys[i]]
+        return [i for i in indices if all(w in keys[i] for w in words)]
+
+    def extend(self, entries: list[HistoryEntry]) -> int:
+        """Append rows; returns how many of them are visible under the current filter."""
+        start = len(self.rows)
+        self.rows.extend(entries)
+        self._keys.extend(f"{e.title} {e.artist} {e.video_id}".casefold() for e in entries)
+        if len(self.rows) > self.max_rows:
+            # Trim in chunks so a full store doesn't pay for a list shift per append
+            drop = len(self.rows) - self.max_rows + self.max_rows // 10
+            del self.rows[:drop]
+            del self._keys[:drop]
+            start -= drop
+            if self.view is not None:
+                self.set_filter(self.query, force=True)
+                return len(entries)
+        if self.view is None:
+            return len(entries)
+        added = self._match(range(max(start, 0), len(self.rows)), self.query.casefold().split())
+        self.view.extend(added)
+        return len(added)
+
+    def set_filter(self, query: str, force: bool = False) -> None:
+        query = query.strip()
+        if query == self.query and not force:
+            return
+        words = query.casefold().split()
+        if not words:
+            self.view = None
+        elif self.view is not None and not force and query.casefold().startswith(self.query.casefold()):
+            # Typing more only narrows what already matched
+            self.view = self._match(self.view, words)
+        else:
+            self.view = self._match(range(len(self.rows)), words)
+        self.query = query
+
+
+class TkBatcher:
+    """Thread-safe ``put``; ``deliver(items)`` runs on the Tk thread at most once per ``delay_ms``."""
+
+    def __init__(self, root, deliver: Callable[[list], None], delay_ms: int = HISTORY_BATCH_MS):
+        self.root = root
+        self.deliver = deliver
+        self.delay_ms = delay_ms
+        self._lock = threading.Lock()
+        self._items: list = []
+        self._scheduled = False
+
+    def put(self, item) -> None:
+        with self._lock:
+            self._items.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self.root.after(self.delay_ms, self.flush)
+        except (RuntimeError, tk.TclError):
+            pass  # window already gone
+
+    def flush(self) -> None:
+        """Deliver whatever is pending now (Tk thread), e.g. before showing a final result."""
+        with self._lock:
+            items, self._items = self._items, []
+            self._scheduled = False
+        if items:
+            self.deliver(items)
+
+
+class HistoryView(ttk.Frame):
+    """Filter box + virtualized list over a HistoryStore (newest first)."""
+
+    def __init__(self, master, store: HistoryStore, on_open: Callable[[HistoryEntry], None],
+                 on_copy: Callable[[HistoryEntry], None], rows: int = 8, bg: str = "#2b2d31",
+                 fg: str = "#e6e6e6", sub_fg: str = "#9aa0a6", select_bg: str = "#4a4d53"):
+        super().__init__(master)
+        self.store = store
+        self.on_open = on_open
+        self.on_copy = on_copy
+        self.colors = (bg, fg, sub_fg, select_bg)
+        self.top = 0
+        self.selected: Optional[HistoryEntry] = None
+        self._items: list[tuple[int, int, int]] = []
+        self._redraw_pending = False
+        self._filter_job = None
+
+        bar = ttk.Frame(self); bar.pack(fill="x")
+        ttk.Label(bar, text="History").pack(side="left")
+        self.count_label = ttk.Label(bar, text="", style="Sub.TLabel")
+        self.count_label.pack(side="right")
+        self.filter_var = tk.StringVar()
+        ent = ttk.Entry(bar, textvariable=self.filter_var, width=28, style="Dark.TEntry")
+        ent.pack(side="right", padx=(0, 8))
+        ttk.Label(bar, text="Filter:").pack(side="right", padx=(0, 4))
+        self.filter_var.trace_add("write", lambda *_a: self._schedule_filter())
+
+        body = ttk.Frame(self); body.pack(fill="both", expand=True, pady=(4, 0))
+        self.canvas = tk.Canvas(body, height=rows * HISTORY_ROW_PX, bg=bg, highlightthickness=0, bd=0,
+                                takefocus=1)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._yview)
+        self.scrollbar.pack(side="right", fill="y")
+        c = self.canvas
+        c.bind("<Configure>", lambda _e: self._layout())
+        c.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        c.bind("<Button-4>", lambda _e: self.scroll(-1, "units"))
+        c.bind("<Button-5>", lambda _e: self.scroll(1, "units"))
+        c.bind("<Button-1>", self._click)
+        c.bind("<Double-Button-1>", lambda e: self._activate(e, self.on_open))
+        c.bind("<Button-3>", self._context_menu)
+        c.bind("<Button-2>", self._context_menu)
+        c.bind("<Return>", lambda _e: self.selected and self.on_open(self.selected))
+        c.bind("<Control-c>", lambda _e: self.selected and self.on_copy(self.selected))
+        c.bind("<Up>", lambda _e: self._move(-1))
+        c.bind("<Down>", lambda _e: self._move(1))
+        c.bind("<Prior>", lambda _e: self.scroll(-1, "pages"))
+        c.bind("<Next>", lambda _e: self.scroll(1, "pages"))
+
+    # ---- Data ----
+    def append(self, entries: list[HistoryEntry]) -> None:
+        """Add rows (Tk thread). A scrolled-down view keeps showing the same rows."""
+        if not entries:
+            return
+        shown = self.store.extend(entries)
+        if self.top > 0:
+            self.top += shown
+        self.redraw()
+
+    def _schedule_filter(self) -> None:
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DEBOUNCE_MS, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._filter_job = None
+        self.store.set_filter(self.filter_var.get())
+        self.top = 0
+        self.redraw()
+
+    # ---- Drawing ----
+    def _page_rows(self) -> int:
+        return max(1, self.canvas.winfo_height() // HISTORY_ROW_PX)
+
+    def _layout(self) -> None:
+        """(Re)build the canvas item pool for the current height: one slot per visible row."""
+        bg, fg, sub_fg, _sel = self.colors
+        c = self.canvas
+        c.delete("all")
+        width = c.winfo_width()
+        self._items = []
+        for r in range(self._page_rows() + 1):
+            y = r * HISTORY_ROW_PX
+            rect = c.create_rectangle(0, y, width, y + HISTORY_ROW_PX, fill=bg, width=0)
+            text = c.create_text(6, y + HISTORY_ROW_PX // 2, anchor="w", fill=fg, text="")
+            link = c.create_text(width - 6, y + HISTORY_ROW_PX // 2, anchor="e", fill=sub_fg, text="")
+            self._items.append((rect, text, link))
+        self.redraw(now=True)
+
+    def redraw(self, now: bool = False) -> None:
+        """Refresh the visible rows; coalesced into one idle callback unless ``now``."""
+        if not now:
+            if not self._redraw_pending:
+                self._redraw_pending = True
+                self.after_idle(self.redraw, True)
+            return
+        self._redraw_pending = False
+        bg, _fg, _sub, sel_bg = self.colors
+        n = len(self.store)
+        page = self._page_rows()
+        self.top = max(0, min(self.top, n - page))
+        c = self.canvas
+        # Leave room for the link + time on the right
+        max_chars = max(10, (c.winfo_width() - 150) // 7)
+        for r, (rect, text, link) in enumerate(self._items):
+            i = self.top + r
+            if i < n:
+                e = self.store.visible(i)
+                label = e.label()
+                if len(label) > max_chars:
+                    label = label[:max_chars - 1] + "…"
+                c.itemconfigure(text, text=label)
+                c.itemconfigure(link, text=f"{e.url}  {time.strftime('%H:%M', time.localtime(e.ts))}")
+                c.itemconfigure(rect, fill=sel_bg if e is self.selected else bg)
+            else:
+                c.itemconfigure(text, text="")
+                c.itemconfigure(link, text="")
+                c.itemconfigure(rect, fill=bg)
+        if n:
+            self.scrollbar.set(self.top / n, min(1.0, (self.top + page) / n))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        total = len(self.store.rows)
+        self.count_label.config(text=f"{n} of {total}" if self.store.view is not None else f"{total}")
+
+    # ---- Scrolling + selection ----
+    def _yview(self, *args) -> None:
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.store))
+            self.redraw(now=True)
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, n: int, what: str = "units") -> None:
+        self.top += n * (self._page_rows() if what == "pages" else 3)
+        self.redraw(now=True)
+
+    def _row_at(self, y: int) -> Optional[HistoryEntry]:
+        i = self.top + int(self.canvas.canvasy(y)) // HISTORY_ROW_PX
+        return self.store.visible(i) if 0 <= i < len(self.store) else None
+
+    def _click(self, event) -> None:
+        self.canvas.focus_set()
+        self.selected = self._row_at(event.y)
+        self.redraw(now=True)
+
+    def _activate(self, event, action: Callable[[HistoryEntry], None]) -> None:
+        entry = self._row_at(event.y)
+        if entry is not None:
+            action(entry)
+
+    def _move(self, step: int) -> None:
+        n = len(self.store)
+        if not n:
+            return
+        # Finding the selection is O(rows on screen) as long as it's visible
+        page = self._page_rows()
+        pos = next((self.top + r for r in range(page) if self.top + r < n and self.store.visible(self.top + r)
+                    is self.selected), None)
+        pos = 0 if pos is None else max(0, min(n - 1, pos + step))
+        self.selected = self.store.visible(pos)
+        if pos < self.top:
+            self.top = pos
+        elif pos >= self.top + page:
+            self.top = pos - page + 1
+        self.redraw(now=True)
+
+    def _context_menu(self, event) -> None:
+        entry = self._row_at(event.y)
+        if entry is None:
+            return
+        self.selected = entry
+        self.redraw(now=True)
+        menu = tk.Menu(self, tearoff=0)
+        menu.add_command(label="Copy link", command=lambda: self.on_copy(entry))
+        menu.add_command(label="Open", command=lambda: self.on_open(entry))
+        menu.add_command(label="Copy title — artist", command=lambda: self._copy_text(entry.label()))
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
+
+    def _copy_text(self, text: str) -> None:
+        self.clipboard_clear()
+        self.clipboard_append(text)
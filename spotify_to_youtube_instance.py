@@ -0,0 +1,154 @@
+"""
+spotify_to_youtube_instance.py — single-instance mode for the GUI
+
+The first window takes an exclusive lock on ``instance.lock`` in the config
+folder and listens on a random localhost port, written with a random token to
+``instance.json`` next to it (readable by this user only). A second launch
+(file association, hotkey, browser "open with") fails to take the lock, sends
+its Spotify URLs to that port and exits, so the running window resolves them
+with its warm token, connections and caches. The OS drops the lock when the
+process dies, so a crash never leaves a stale instance behind.
+
+The check runs before the window is created, so a forwarding launch never
+initializes Tk, reads the cache or touches the network.
+"""
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from spotify_to_youtube_core import _platform_config_dir
+
+INSTANCE_LOCK = "instance.lock"
+INSTANCE_INFO = "instance.json"
+# A second launch waits this long for a window that's still starting to listen
+FORWARD_WAIT_S = 2.0
+FORWARD_TIMEOUT_S = 1.0
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def _try_lock(f) -> bool:
+    """Non-blocking exclusive lock on an open file (released when it's closed or the process exits)."""
+    try:
+        if sys.platform.startswith("win"):
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    buf = b""
+    while b"\n" not in buf and len(buf) < MAX_MESSAGE_BYTES:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        buf += chunk
+    return buf.split(b"\n", 1)[0]
+
+
+class SingleInstance:
+    """The running window's end: holds the lock and hands forwarded URL lists to ``on_urls``.
+
+    ``acquire`` is False when another instance holds the lock. ``listen`` then
+    serves forwards on a background thread; ``on_urls`` runs on that thread
+    (an empty list means "just come to the front").
+    """
+
+    def __init__(self, config_dir: Optional[str] = None):
+        self.config_dir = config_dir or _platform_config_dir()
+        self.token = secrets.token_hex(16)
+        self._lock_file = None
+        self._sock: Optional[socket.socket] = None
+
+    @property
+    def info_path(self) -> str:
+        return os.path.join(self.config_dir, INSTANCE_INFO)
+
+    def acquire(self) -> bool:
+        try:
+            os.makedirs(self.config_dir, exist_ok=True)
+            f = open(os.path.join(self.config_dir, INSTANCE_LOCK), "a+b")
+        except OSError:
+            return True  # no usable config folder: run without single-instance mode
+        if not _try_lock(f):
+            f.close()
+            return False
+        self._lock_file = f
+        return True
+
+    def listen(self, on_urls: Callable[[list[str]], None]) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        self._sock = sock
+        data = json.dumps({"pid": os.getpid(), "port": sock.getsockname()[1], "token": self.token})
+        tmp = self.info_path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.info_path)
+        threading.Thread(target=self._serve, args=(sock, on_urls), name="s2y-instance", daemon=True).start()
+
+    def _serve(self, sock: socket.socket, on_urls: Callable[[list[str]], None]) -> None:
+        while True:
+            try:
+                conn, _addr = sock.accept()
+            except OSError:
+                return  # closed
+            with conn:
+                try:
+                    conn.settimeout(FORWARD_TIMEOUT_S)
+                    msg = json.loads(_read_line(conn))
+                    if not hmac.compare_digest(str(msg.get("token", "")), self.token):
+                        continue
+                    urls = [u for u in msg.get("urls") or [] if isinstance(u, str)]
+                    conn.sendall(b"ok\n")
+                except (OSError, ValueError, AttributeError):
+                    continue
+            on_urls(urls)
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def forward_urls(urls: list[str], config_dir: Optional[str] = None, wait_s: float = FORWARD_WAIT_S) -> bool:
+    """Hand ``urls`` to the running instance; False if it didn't take them within ``wait_s``."""
+    path = os.path.join(config_dir or _platform_config_dir(), INSTANCE_INFO)
+    message = None
+    deadline = time.monotonic() + wait_s
+    while True:
+        try:
+            if message is None:
+                with open(path, "r", encoding="utf-8") as f:
+                    info = json.load(f)
+                message = (json.dumps({"token": info["token"], "urls": list(urls)}) + "\n").encode()
+                port = int(info["port"])
+            with socket.create_connection(("127.0.0.1", port), timeout=FORWARD_TIMEOUT_S) as conn:
+                conn.sendall(message)
+                if _read_line(conn) == b"ok":
+                    return True
+        except (OSError, ValueError, KeyError, TypeError):
+            message = None  # not written yet, or left by an instance that is still starting
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
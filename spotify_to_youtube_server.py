@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+spotify_to_youtube_server.py — local HTTP resolver service
+
+Lets overlays, chat bots and stream-deck buttons resolve Spotify URLs without
+the Tk window. Every client shares one Resolver, so the Spotify token, the
+pooled keep-alive connections, the rate limiter and the SQLite cache are all
+shared as well.
+
+    GET  /resolve?url=<spotify url>     {"results": [record, …]}
+    POST /resolve                       same, for many URLs: {"urls": [...]}, a JSON list,
+                                        or text/plain with one URL per line
+    GET  /health                        {"ok": true}
+    GET  /stats                         server + per-host request counters, hedging counters (+ stage timings
+                                        with S2Y_STATS=1)
+
+Records have the CLI's JSONL shape (video_url, alternatives, timings, error…).
+Connections are HTTP/1.1 keep-alive and are served on a bounded thread pool.
+Identical track lookups that arrive while one is in flight share its result.
+
+Usage:
+    python spotify_to_youtube_cli.py --serve [--port 8770]
+    python spotify_to_youtube_server.py [--port 8770]
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from spotify_to_youtube_core import (
+    Resolver,
+    error_record,
+    extract_spotify_ref,
+    resolve_records,
+    result_record,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8770
+# Each keep-alive connection holds a worker while it's open, so idle ones are dropped quickly
+DEFAULT_WORKERS = 32
+KEEPALIVE_IDLE_S = 5.0
+MAX_BODY_BYTES = 1 << 20
+MAX_BATCH_URLS = 500
+
+
+class ResolveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Small JSON responses: don't let Nagle + delayed ACK hold them back
+    disable_nagle_algorithm = True
+    timeout = KEEPALIVE_IDLE_S
+    server_version = "SpotifyToYouTube"
+    server: "ResolveServer"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            sys.stderr.write("%s - %s\n" % (self.address_string(), fmt % args))
+
+    def _send_json(self, code: int, payload) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code: int, message: str) -> None:
+        self._send_json(code, {"error": message})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/resolve":
+            target = (parse_qs(url.query).get("url") or [""])[0].strip()
+            if not target:
+                self._error(400, "missing ?url=")
+                return
+            self._send_json(200, self.server.resolve([target]))
+        elif url.path == "/health":
+            self._send_json(200, {"ok": True})
+        elif url.path == "/stats":
+            self._send_json(200, self.server.stats())
+        else:
+            self._error(404, "not found")
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/resolve":
+            self._error(404, "not found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Can't tell where the body ends, so the connection can't be reused
+            self.close_connection = True
+            self._error(400, "invalid Content-Length")
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._error(413, "request body too large")
+            return
+        raw = self.rfile.read(length)
+        urls = self._parse_urls(raw)
+        if urls is None:
+            self._error(400, 'expected {"urls": [...]}, a JSON list, or one URL per line')
+        elif len(urls) > MAX_BATCH_URLS:
+            self._error(413, f"at most {MAX_BATCH_URLS} URLs per request")
+        else:
+            self._send_json(200, self.server.resolve(urls))
+
+    def _parse_urls(self, raw: bytes) -> Optional[list[str]]:
+        text = raw.decode("utf-8", "replace")
+        if "json" not in (self.headers.get("Content-Type") or "") and not text.lstrip().startswith(("{", "[")):
+            return [line.strip() for line in text.splitlines() if line.strip()]
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if isinstance(data, dict):
+            data = data.get("urls")
+        if not isinstance(data, list) or not all(isinstance(u, str) for u in data):
+            return None
+        return [u.strip() for u in data if u.strip()]
+
+
+class ResolveServer(HTTPServer):
+    """HTTP front end for one shared Resolver, handling connections on a bounded pool."""
+
+    def __init__(self, resolver: Resolver, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 workers: int = DEFAULT_WORKERS, verbose: bool = False):
+        super().__init__((host, port), ResolveHandler)
+        self.resolver = resolver
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="s2y-http")
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.counts = {"requests": 0, "tracks": 0, "errors": 0, "coalesced": 0}
+
+    # socketserver hooks: hand each connection to the pool instead of a new thread
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up on keep-alive connections is routine
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += n
+
+    def resolve(self, urls: list[str]) -> dict:
+        """Records for ``urls``, in request order (tracks of a playlist in playlist order)."""
+        t0 = time.perf_counter()
+        self._count("requests")
+        if len(urls) == 1 and (extract_spotify_ref(urls[0]) or ("",))[0] == "track":
+            records = [self._resolve_track(urls[0])]
+        else:
+            records = []
+            lock = threading.Lock()
+
+            def on_record(rec: dict) -> None:
+                with lock:
+                    records.append(rec)
+
+            resolve_records(self.resolver, urls, on_record)
+            order = {url: i for i, url in reversed(list(enumerate(urls)))}
+            records.sort(key=lambda r: (order.get(r["source"], len(urls)), r["index"]))
+        failures = sum(1 for r in records if r["error"])
+        self._count("tracks", len(records))
+        self._count("errors", failures)
+        return {"results": records, "failures": failures, "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+    def _resolve_track(self, url: str) -> dict:
+        """One track, sharing the lookup with any identical request already in flight."""
+        t0 = time.perf_counter()
+        key = extract_spotify_ref(url)[1]
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+            else:
+                self.counts["coalesced"] += 1
+        if owner:
+            try:
+                fut.set_result(self.resolver.resolve_track(url))
+            except Exception as e:
+                fut.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        try:
+            return result_record(dict(fut.result()), url)
+        except Exception as e:
+            return error_record(url, str(e), round((time.perf_counter() - t0) * 1000, 2))
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts, inflight=len(self._inflight))
+        limiter, stats = self.resolver.limiter, self.resolver.stats
+        hedger = self.resolver.hedger
+        return {"server": counts, "hosts": limiter.stats() if limiter is not None else {},
+                "stages": stats.snapshot() if stats is not None else None,
+                "hedging": hedger.stats() if hedger is not None else None}
+
+    def start(self) -> "ResolveServer":
+        """Serve on a background thread (for embedding and benchmarks)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="s2y-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(resolver: Resolver, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS,
+          verbose: bool = False) -> int:
+    """Run the service in the foreground until Ctrl+C."""
+    try:
+        srv = ResolveServer(resolver, host, port, workers, verbose)
+    except OSError as e:
+        print(f"Cannot listen on {host}:{port}: {e}", file=sys.stderr)
+        return 1
+    print(f"Resolving on {srv.base_url}/resolve?url=… (Ctrl+C to stop)", file=sys.stderr)
+    # Pre-connect + token, so the first client doesn't pay for them
+    threading.Thread(target=resolver.warm_up, daemon=True).start()
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    from spotify_to_youtube_cli import main
+    sys.exit(main(["--serve", *sys.argv[1:]]))
@@ -0,0 +1,146 @@
+"""
+spotify_to_youtube_stats.py — per-stage timing for the resolver
+
+Rolling histograms (count, p50/p95/p99, bytes) for each stage of a lookup:
+token, spotify, index, youtube_fetch, youtube_parse, rank, cache and total,
+plus cache / song-index hit and miss counters. The Resolver only touches this
+when a StageStats is attached, so with stats off a lookup pays for nothing but
+an ``is None``.
+
+Environment (picked up by the CLI and the server; the GUI always collects):
+    S2Y_STATS=1              collect (see --stats, GET /stats)
+    S2Y_STATS_FILE=path      also write a JSON snapshot there at exit
+    S2Y_STATS_LOG=path       also append one JSON line per lookup (its timings)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+# Samples kept per stage for the percentiles
+STATS_WINDOW = 512
+STAGES = ("token", "spotify", "index", "youtube_fetch", "youtube_parse", "rank", "cache", "total")
+
+
+def _percentile(sorted_vals: list[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+class StageStats:
+    """Thread-safe rolling per-stage latencies and byte counts."""
+
+    def __init__(self, window: int = STATS_WINDOW, log_path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self.window = window
+        self.log_path = log_path
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples: dict[str, deque] = {}
+            self._count: dict[str, int] = {}
+            self._bytes: dict[str, int] = {}
+            self.counters: dict[str, int] = {}
+            self.since = time.time()
+
+    def add(self, stage: str, ms: float, nbytes: int = 0) -> None:
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(ms)
+            self._count[stage] = self._count.get(stage, 0) + 1
+            if nbytes:
+                self._bytes[stage] = self._bytes.get(stage, 0) + nbytes
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def lookup_done(self, res: dict) -> None:
+        """Record a finished lookup's total and, with a log file, append its timings."""
+        timings = res.get("timings") or {}
+        total = sum(v for k, v in timings.items() if k.endswith("_ms") and k != "youtube_parse_ms")
+        self.add("total", total)
+        if self.log_path:
+            line = json.dumps({"ts": round(time.time(), 3), "track_id": res.get("track_id"),
+                               "cached": bool(res.get("cached")), "timings": timings})
+            try:
+                with self._lock, open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {}
+            for stage in sorted(self._samples, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+                vals = sorted(self._samples[stage])
+                stages[stage] = {
+                    "count": self._count[stage],
+                    "p50_ms": round(_percentile(vals, 50), 2),
+                    "p95_ms": round(_percentile(vals, 95), 2),
+                    "p99_ms": round(_percentile(vals, 99), 2),
+                    "max_ms": round(vals[-1], 2) if vals else 0.0,
+                    "bytes": self._bytes.get(stage, 0),
+                }
+            counters = dict(self.counters)
+        lookups = counters.get("cache_hits", 0) + counters.get("cache_misses", 0)
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.since)),
+            "stages": stages,
+            "counters": counters,
+            "cache_hit_ratio": round(counters.get("cache_hits", 0) / lookups, 3) if lookups else None,
+        }
+
+    def summary(self, timings: Optional[dict] = None) -> str:
+        """One line for a status label: this lookup's stages, then the running p95."""
+        parts = []
+        t = timings or {}
+        if "cache_ms" in t and len(t) == 1:
+            parts.append(f"cache {t['cache_ms']:.1f} ms")
+        for key, label in (("spotify_ms", "Spotify"), ("youtube_ms", "YouTube")):
+            if key in t:
+                parts.append(f"{label} {t[key]:.0f} ms")
+        if "index_ms" in t and "youtube_ms" not in t:
+            parts.append(f"song index {t['index_ms']:.1f} ms")
+        if "youtube_parse_ms" in t:
+            parts.append(f"parse {t['youtube_parse_ms']:.1f} ms")
+        if t.get("youtube_bytes"):
+            parts.append(f"{t['youtube_bytes'] / 1024:.0f} KiB")
+        total = self.snapshot()["stages"].get("total")
+        if total:
+            parts.append(f"p95 {total['p95_ms']:.0f} ms / {total['count']}")
+        return " · ".join(parts)
+
+    def export(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def stats_from_env() -> Optional[StageStats]:
+    """A StageStats if S2Y_STATS / S2Y_STATS_FILE / S2Y_STATS_LOG ask for one, else None."""
+    out = os.environ.get("S2Y_STATS_FILE")
+    log = os.environ.get("S2Y_STATS_LOG")
+    if not (out or log or os.environ.get("S2Y_STATS", "").lower() in ("1", "true", "yes")):
+        return None
+    stats = StageStats(log_path=log)
+    if out:
+        atexit.register(_export_quietly, stats, out)
+    return stats
+
+
+def _export_quietly(stats: StageStats, path: str) -> None:
+    try:
+        stats.export(path)
+    except OSError:
+        pass
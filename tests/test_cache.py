@@ -0,0 +1,155 @@
+import itertools
+
+import pytest
+
+import spotify_to_youtube_core as core
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A wall clock that moves one second per call, so LRU order never ties."""
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(core.time, "time", lambda: float(next(ticks)))
+
+
+@pytest.fixture
+def cache():
+    c = core.TrackCache(":memory:")
+    yield c
+    c.close()
+
+
+# --------------------------------- normalize_song --------------------------------
+
+def test_normalize_song_drops_noise():
+    assert core.normalize_song("Héllo (feat. Someone) - 2011 Remaster", "The Band") == \
+        core.normalize_song("hello", "Band")
+
+
+# ----------------------------------- _SongIndex ----------------------------------
+
+def _index(*songs):
+    index = core._SongIndex()
+    for sid, (title, artist, duration_ms) in enumerate(songs, 1):
+        index.add(sid, title, artist, f"vid{sid}", duration_ms)
+    return index
+
+
+def test_song_index_exact_key():
+    index = _index(("Yellow Submarine", "The Beatles", 160_000))
+    assert index.match(*core.normalize_song("Yellow Submarine", "Beatles"), 160_000) == (1, 1.0)
+
+
+def test_song_index_fuzzy_match():
+    index = _index(("Yellow Submarine", "Beatles", None), ("Submarine Blues", "Other", None))
+    sid, score = index.match(*core.normalize_song("Yellow Submarine Song", "Beatles"), None)
+    assert sid == 1 and 0.5 < score < 1.0
+
+
+def test_song_index_different_artist_never_matches():
+    index = _index(("Yellow Submarine", "Beatles", None))
+    assert index.match(*core.normalize_song("Yellow Submarine", "Cover Band"), None) is None
+
+
+def test_song_index_duration_must_agree():
+    index = _index(("Yellow Submarine", "Beatles", 160_000))
+    words, artists = core.normalize_song("Yellow Submarine", "Beatles")
+    assert index.match(words, artists, 160_000 + core.FUZZY_DURATION_TOLERANCE_MS) == (1, 1.0)
+    assert index.match(words, artists, 160_000 + core.FUZZY_DURATION_TOLERANCE_MS + 1) is None
+    assert index.match(words, artists, None) == (1, 1.0)
+
+
+def test_song_index_remove_and_replace():
+    index = _index(("Yellow Submarine", "Beatles", None))
+    index.add(1, "Something", "Beatles", "vid9", None)
+    assert index.match(*core.normalize_song("Yellow Submarine", "Beatles"), None) is None
+    assert "yellow" not in index.postings
+    index.remove(1)
+    assert index.songs == {} and index.by_key == {} and index.postings == {}
+
+
+def test_song_index_empty_title():
+    assert _index(("Song", "A", None)).match((), frozenset(), None) is None
+
+
+# ----------------------------------- TrackCache ----------------------------------
+
+def test_get_put(cache):
+    assert cache.get("t1") is None
+    cache.put("t1", "Title", "Artist", "Artist - Title", "vid1")
+    assert cache.get("t1") == {"track_id": "t1", "title": "Title", "artist": "Artist",
+                               "query": "Artist - Title", "video_id": "vid1"}
+
+
+def test_ttl_expires_entries(clock):
+    cache = core.TrackCache(":memory:", ttl_seconds=5)
+    cache.put("t1", "Title", "Artist", "q", "vid1")
+    assert cache.get("t1") is not None
+    for _ in range(5):
+        core.time.time()
+    assert cache.get("t1") is None
+    assert cache.find_song("Title", "Artist") is None
+
+
+def test_evicts_least_recently_used(clock):
+    cache = core.TrackCache(":memory:", max_entries=2)
+    cache.put("t1", "One", "A", "q", "v1")
+    cache.put("t2", "Two", "A", "q", "v2")
+    cache.get("t1")
+    cache.put("t3", "Three", "A", "q", "v3")
+    assert cache.get("t2") is None
+    assert cache.get("t1") is not None and cache.get("t3") is not None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = core.TrackCache(":memory:", max_entries=0)
+    cache.put("t1", "Title", "Artist", "q", "vid1")
+    assert cache.get("t1") is None
+
+
+def test_find_song_across_track_ids(cache):
+    cache.put("single", "Yellow Submarine", "The Beatles", "q", "vid1", 160_000)
+    found = cache.find_song("Yellow Submarine - 2009 Remaster", "Beatles", 161_000)
+    assert found == {"video_id": "vid1", "title": "Yellow Submarine", "artist": "The Beatles", "score": 1.0}
+    assert cache.find_song("Yellow Submarine", "Beatles", 200_000) is None
+
+
+def test_find_song_threshold(cache):
+    cache.put("t1", "Yellow Submarine", "Beatles", "q", "vid1")
+    assert cache.find_song("Yellow Submarine Song", "Beatles", threshold=0.99) is None
+    assert cache.find_song("Yellow Submarine Song", "Beatles", threshold=0.5)["video_id"] == "vid1"
+    assert cache.find_song("Yellow Submarine", "Beatles", threshold=0) is None
+
+
+def test_index_follows_later_writes(cache):
+    cache.warm_index()
+    cache.put("t1", "Yellow Submarine", "Beatles", "q", "vid1")
+    cache.put("t2", "Yellow Submarine", "Beatles", "q", "vid2")
+    assert cache.find_song("Yellow Submarine", "Beatles")["video_id"] == "vid2"
+
+
+def test_song_eviction_updates_index(clock):
+    cache = core.TrackCache(":memory:", song_max_entries=1)
+    cache.warm_index()
+    cache.put("t1", "Yellow Submarine", "Beatles", "q", "vid1")
+    cache.put("t2", "Something", "Beatles", "q", "vid2")
+    assert cache.find_song("Yellow Submarine", "Beatles") is None
+    assert cache.find_song("Something", "Beatles")["video_id"] == "vid2"
+
+
+def test_index_built_from_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = core.TrackCache(path)
+    first.put("t1", "Yellow Submarine", "Beatles", "q", "vid1")
+    first.close()
+    second = core.TrackCache(path)
+    assert second.find_song("Yellow Submarine", "Beatles")["video_id"] == "vid1"
+    second.close()
+
+
+def test_clear(cache):
+    cache.put("t1", "Yellow Submarine", "Beatles", "q", "vid1")
+    cache.find_song("Yellow Submarine", "Beatles")
+    cache.clear()
+    assert cache.get("t1") is None
+    assert cache.find_song("Yellow Submarine", "Beatles") is None
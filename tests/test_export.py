@@ -0,0 +1,151 @@
+import csv
+import json
+
+import pytest
+
+import spotify_to_youtube_core as core
+from spotify_to_youtube_export import ExportWriter, _cut_torn_line, export_urls, exported_track_ids
+
+
+def _record(track_id, index=0, error=None):
+    res = {"track_id": track_id, "index": index, "title": f"Song {track_id}", "artist": "Artist",
+           "duration_ms": 200_000}
+    if error:
+        res["error"] = error
+    else:
+        res["video_id"] = f"v{track_id}"
+    return core.result_record(res, f"https://open.spotify.com/track/{track_id}")
+
+
+class FakeResolver:
+    """resolve_many over track URLs: every ID in ``fail`` comes back as an error."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.resolved = []
+
+    def resolve_many(self, urls, on_result=None, cancel=None, skip=()):
+        for index, url in enumerate(urls):
+            track_id = core.extract_track_id(url)
+            if track_id in skip:
+                continue
+            self.resolved.append(track_id)
+            res = {"index": index, "track_id": track_id, "title": f"Song {track_id}", "artist": "Artist"}
+            if track_id in self.fail:
+                res["error"] = "not found"
+            else:
+                res["video_id"] = f"v{track_id}"
+            on_result(res)
+
+
+def _urls(*ids):
+    return [f"https://open.spotify.com/track/{i}" for i in ids]
+
+
+# --------------------------------- _cut_torn_line --------------------------------
+
+@pytest.mark.parametrize("content, kept", [
+    (b"", b""),
+    (b"one\ntwo\n", b"one\ntwo\n"),
+    (b"one\ntwo\nthr", b"one\ntwo\n"),
+    (b"no newline at all", b""),
+])
+def test_cut_torn_line(tmp_path, content, kept):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(content)
+    _cut_torn_line(str(path))
+    assert path.read_bytes() == kept
+
+
+def test_cut_torn_line_longer_than_a_block(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b"first\n" + b"x" * 10_000)
+    _cut_torn_line(str(path))
+    assert path.read_bytes() == b"first\n"
+
+
+# ------------------------------ exported_track_ids ------------------------------
+
+@pytest.mark.parametrize("fmt", ["m3u", "csv", "jsonl"])
+def test_exported_ids_skip_failures(tmp_path, fmt):
+    path = str(tmp_path / f"out.{fmt}")
+    with ExportWriter(path, fmt) as w:
+        w.write(_record("a1"))
+        w.write(_record("b2", error="not found"))
+        w.write(_record("c3"))
+    assert exported_track_ids(path, fmt) == {"a1", "c3"}
+
+
+def test_exported_ids_missing_file(tmp_path):
+    assert exported_track_ids(str(tmp_path / "none.csv"), "csv") == set()
+
+
+def test_m3u_id_needs_its_link(tmp_path):
+    path = tmp_path / "out.m3u"
+    path.write_text("#EXTM3U\n# spotify:track:a1\n#EXTINF:200,Artist - Song\nhttps://youtu.be/va1\n"
+                    "# spotify:track:b2\n#EXTINF:200,Artist - Song\n")
+    assert exported_track_ids(str(path), "m3u") == {"a1"}
+
+
+# --------------------------------- ExportWriter ---------------------------------
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ExportWriter(str(tmp_path / "out.txt"))
+
+
+def test_csv_layout(tmp_path):
+    path = tmp_path / "out.csv"
+    with ExportWriter(str(path)) as w:
+        w.write(_record("a1", index=3))
+    (row,) = csv.DictReader(path.open(newline=""))
+    assert row["index"] == "3" and row["track_id"] == "a1" and row["video_url"] == "https://youtu.be/va1"
+    assert row["duration_s"] == "200" and row["error"] == ""
+
+
+def test_without_resume_the_file_is_replaced(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text(json.dumps(_record("old")) + "\n")
+    with ExportWriter(str(path)) as w:
+        assert w.done == set()
+        w.write(_record("a1"))
+    assert [json.loads(line)["track_id"] for line in path.read_text().splitlines()] == ["a1"]
+
+
+# ------------------------------------ resume ------------------------------------
+
+@pytest.mark.parametrize("fmt", ["m3u", "csv", "jsonl"])
+def test_resume_only_resolves_missing_tracks(tmp_path, fmt):
+    path = str(tmp_path / f"out.{fmt}")
+    first = FakeResolver(fail={"b2"})
+    writer = export_urls(first, _urls("a1", "b2", "c3"), path)
+    assert (writer.written, writer.failed) == (2, 1)
+
+    second = FakeResolver()
+    writer = export_urls(second, _urls("a1", "b2", "c3", "d4"), path, resume=True)
+    assert second.resolved == ["b2", "d4"]
+    assert (writer.written, writer.failed, writer.skipped) == (2, 0, 2)
+    assert exported_track_ids(path, fmt) == {"a1", "b2", "c3", "d4"}
+
+
+def test_resume_after_torn_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text(json.dumps(_record("a1")) + "\n" + json.dumps(_record("b2"))[:25])
+    resolver = FakeResolver()
+    export_urls(resolver, _urls("a1", "b2"), str(path), resume=True)
+    assert resolver.resolved == ["b2"]
+    assert [json.loads(line)["track_id"] for line in path.read_text().splitlines()] == ["a1", "b2"]
+
+
+def test_resume_keeps_a_single_header(tmp_path):
+    path = tmp_path / "out.csv"
+    export_urls(FakeResolver(), _urls("a1"), str(path))
+    export_urls(FakeResolver(), _urls("a1", "b2"), str(path), resume=True)
+    assert path.read_text().count("track_id") == 1
+
+
+def test_resume_without_a_file_starts_fresh(tmp_path):
+    path = tmp_path / "out.m3u"
+    writer = export_urls(FakeResolver(), _urls("a1"), str(path), resume=True)
+    assert writer.skipped == 0
+    assert path.read_text().startswith("#EXTM3U\n")
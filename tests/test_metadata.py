@@ -0,0 +1,144 @@
+import pytest
+
+import spotify_to_youtube_core as core
+from bench.stand_in import StandInServer, track_json
+from spotify_to_youtube_async import AsyncEngine
+
+TRACK = "https://open.spotify.com/track/{}"
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(broken=()):
+        srv = StandInServer(broken=broken).start()
+        servers.append(srv)
+        return srv
+
+    yield start
+    for srv in servers:
+        srv.stop()
+
+
+@pytest.fixture(params=["threads", "asyncio"])
+def make_resolver(request, stand_in):
+    """Resolver (or AsyncEngine) factory pointed at a fresh stand-in server."""
+    made = []
+
+    def make(providers="embed,api,oembed", credentials=True, broken=()):
+        srv = stand_in(broken)
+        resolver = core.Resolver("id" if credentials else "", "secret" if credentials else "",
+                                 limiter=core.RateLimiter(), stats=core.StageStats(),
+                                 metadata_providers=providers, **srv.resolver_kwargs())
+        engine = AsyncEngine(resolver) if request.param == "asyncio" else resolver
+        made.append(engine)
+        return engine, srv
+
+    yield make
+    for engine in made:
+        engine.close()
+
+
+def _expected(track_id):
+    t = track_json(track_id)
+    return t["name"], " & ".join(a["name"] for a in t["artists"]), t["duration_ms"]
+
+
+def _meta(resolver, track_id):
+    res = resolver.resolve_track(TRACK.format(track_id))
+    return res["title"], res["artist"], res["duration_ms"]
+
+
+# -------------------------------- provider chain ---------------------------------
+
+def test_embed_page_needs_no_credentials(make_resolver):
+    resolver, srv = make_resolver(credentials=False)
+    assert _meta(resolver, "abc123") == _expected("abc123")
+    assert srv.counts.get("embed") == 1 and "spotify" not in srv.counts
+
+
+def test_broken_embed_falls_back_to_the_web_api(make_resolver):
+    resolver, srv = make_resolver(broken=("embed",))
+    assert _meta(resolver, "abc123") == _expected("abc123")
+    assert srv.counts.get("spotify") == 1
+
+
+def test_title_only_from_oembed_without_credentials(make_resolver):
+    resolver, _ = make_resolver(credentials=False, broken=("embed",))
+    title, artist, duration_ms = _meta(resolver, "abc123")
+    assert (title, artist, duration_ms) == (_expected("abc123")[0], "", None)
+
+
+def test_api_alone_needs_credentials(make_resolver):
+    resolver, _ = make_resolver(providers="api", credentials=False)
+    with pytest.raises(RuntimeError, match="credentials"):
+        resolver.resolve_track(TRACK.format("abc123"))
+
+
+def test_every_provider_failing_names_each_error(make_resolver):
+    resolver, _ = make_resolver(providers="embed,oembed", credentials=False, broken=("embed", "oembed"))
+    with pytest.raises(RuntimeError, match="from any source") as err:
+        resolver.resolve_track(TRACK.format("abc123"))
+    assert "embed:" in str(err.value) and "oembed:" in str(err.value)
+
+
+def test_failed_provider_cools_down():
+    resolver = core.Resolver(metadata_providers="embed,oembed")
+    embed = resolver.meta_order()[0]
+    resolver._provider_failed(embed, RuntimeError("down"))
+    assert [p.name for p in resolver.meta_order()] == ["oembed"]
+    resolver._provider_failed(resolver.meta_order()[0], RuntimeError("down"))
+    # Everything cooling down: try them all rather than nothing
+    assert [p.name for p in resolver.meta_order()] == ["embed", "oembed"]
+    resolver.close()
+
+
+def test_not_found_does_not_cool_down():
+    class NotFound(RuntimeError):
+        response = type("R", (), {"status_code": 404})()
+
+    resolver = core.Resolver(metadata_providers="embed,oembed")
+    resolver._provider_failed(resolver.meta_order()[0], NotFound("404"))
+    assert [p.name for p in resolver.meta_order()] == ["embed", "oembed"]
+    resolver.close()
+
+
+def test_provider_names():
+    assert core._provider_names("Embed, nope,api,embed") == ["embed", "api"]
+    assert core._provider_names("") == ["api"]
+
+
+# ------------------------------ fetch_track_metas --------------------------------
+
+def test_batch_metas_reports_missing_ids():
+    metas = core._batch_metas(["a", "b"], [("a", "Song", "Artist", 1000)])
+    assert metas["a"] == ("Song", "Artist", 1000)
+    assert isinstance(metas["b"], LookupError)
+
+
+def test_fetch_track_metas_batches_with_credentials(stand_in):
+    srv = stand_in()
+    resolver = core.Resolver("id", "secret", **srv.resolver_kwargs())
+    ids = [f"t{i}" for i in range(core.SPOTIFY_IDS_BATCH + 1)]
+    metas = resolver.fetch_track_metas(ids)
+    resolver.close()
+    assert list(metas) == ids
+    assert all(metas[t] == _expected(t) for t in ids)
+    assert srv.counts.get("spotify") == 2 and "embed" not in srv.counts
+
+
+def test_fetch_track_metas_keeps_each_failure(stand_in):
+    srv = stand_in(("embed", "oembed"))
+    resolver = core.Resolver(metadata_providers="embed,oembed", **srv.resolver_kwargs())
+    metas = resolver.fetch_track_metas(["t1", "t2"])
+    resolver.close()
+    assert set(metas) == {"t1", "t2"}
+    assert all(isinstance(m, RuntimeError) for m in metas.values())
+
+
+def test_resolve_many_reports_tracks_without_metadata(make_resolver):
+    resolver, _ = make_resolver(providers="embed,oembed", credentials=False, broken=("embed", "oembed"))
+    results = resolver.resolve_many([TRACK.format(t) for t in ("t0", "t1", "t2")])
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    assert all(r["track_id"] and "from any source" in r["error"] for r in results)
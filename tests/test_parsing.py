@@ -0,0 +1,178 @@
+import json
+
+import pytest
+
+import spotify_to_youtube_core as core
+
+
+def _renderer(video_id, title="Song", channel="Artist - Topic", length="3:30"):
+    return {"videoId": video_id, "title": {"runs": [{"text": title}]},
+            "ownerText": {"runs": [{"text": channel}]}, "lengthText": {"simpleText": length}}
+
+
+def _page(*renderers, marker="var ytInitialData = "):
+    data = {"contents": [{"videoRenderer": r} for r in renderers]}
+    return f"<html><script>var x = {{}};</script><script>{marker}{json.dumps(data)};</script></html>".encode()
+
+
+def _split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+# --------------------------------- _match_brace ---------------------------------
+
+def test_match_brace_returns_index_past_closing_brace():
+    text = 'x = {"a": {"b": 1}, "c": 2} tail'
+    start = text.index("{")
+    end = core._match_brace(text, start)
+    assert text[start:end] == '{"a": {"b": 1}, "c": 2}'
+
+
+def test_match_brace_ignores_braces_inside_strings():
+    text = '{"title": "a } b { c", "esc": "q\\"}"}'
+    assert core._match_brace(text, 0) == len(text)
+
+
+def test_match_brace_incomplete_object():
+    assert core._match_brace('{"a": {"b": 1}', 0) == -1
+
+
+def test_match_brace_string_cut_off():
+    assert core._match_brace('{"a": "unterminated }', 0) == -1
+
+
+def test_match_brace_bytes():
+    data = bytearray(b'{"t": "}"} rest')
+    assert core._match_brace(data, 0, core._JSON_TOKEN_RE_B) == 10
+
+
+# ------------------------------ iter_video_renderers ----------------------------
+
+def test_iter_video_renderers_whole_page():
+    page = _page(_renderer("aaaaaaaaaaa"), _renderer("bbbbbbbbbbb"), _renderer("ccccccccccc"))
+    ids = [r["videoId"] for r in core.iter_video_renderers([page], limit=10)]
+    assert ids == ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1000])
+def test_iter_video_renderers_any_chunk_split(size):
+    page = _page(_renderer("aaaaaaaaaaa", title="Brace } in { title"), _renderer("bbbbbbbbbbb"))
+    ids = [r["videoId"] for r in core.iter_video_renderers(_split(page, size), limit=10)]
+    assert ids == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+
+
+def test_iter_video_renderers_stops_at_limit_without_reading_on():
+    page = _page(*(_renderer(f"vid{i:08d}") for i in range(5)))
+    chunks = iter(_split(page, 32))
+    found = list(core.iter_video_renderers(chunks, limit=2))
+    assert [r["videoId"] for r in found] == ["vid00000000", "vid00000001"]
+    assert next(chunks, None) is not None
+
+
+@pytest.mark.parametrize("marker", core.YT_INITIAL_DATA_MARKERS)
+def test_iter_video_renderers_each_marker(marker):
+    page = _page(_renderer("aaaaaaaaaaa"), marker=marker)
+    assert [r["videoId"] for r in core.iter_video_renderers(_split(page, 5))] == ["aaaaaaaaaaa"]
+
+
+def test_iter_video_renderers_ignores_renderers_before_the_data():
+    page = (b'<script>{"videoRenderer": {"videoId": "early000000"}}</script>'
+            + _page(_renderer("aaaaaaaaaaa")))
+    assert [r["videoId"] for r in core.iter_video_renderers([page])] == ["aaaaaaaaaaa"]
+
+
+def test_iter_video_renderers_skips_renderers_without_video_id():
+    page = _page({"title": {"simpleText": "ad"}}, _renderer("aaaaaaaaaaa"))
+    assert [r["videoId"] for r in core.iter_video_renderers([page])] == ["aaaaaaaaaaa"]
+
+
+def test_iter_video_renderers_bare_json():
+    body = json.dumps({"contents": [{"videoRenderer": _renderer("aaaaaaaaaaa")}]}).encode()
+    assert [r["videoId"] for r in core.iter_video_renderers(_split(body, 3), markers=())] == ["aaaaaaaaaaa"]
+
+
+def test_iter_video_renderers_no_marker():
+    body = json.dumps({"videoRenderer": _renderer("aaaaaaaaaaa")}).encode()
+    assert list(core.iter_video_renderers([body])) == []
+
+
+def test_parse_candidates_fields():
+    (c,) = core.parse_candidates(_page(_renderer("aaaaaaaaaaa", "Title", "Chan", "1:02:03")), 5)
+    assert c == {"video_id": "aaaaaaaaaaa", "title": "Title", "channel": "Chan", "duration_s": 3723, "badges": []}
+
+
+# -------------------------------- rank_candidates -------------------------------
+
+def _cand(video_id, title, channel="Someone", duration_s=200, badges=()):
+    return {"video_id": video_id, "title": title, "channel": channel, "duration_s": duration_s,
+            "badges": list(badges)}
+
+
+def test_rank_candidates_prefers_matching_duration():
+    ranked = core.rank_candidates([_cand("long", "Song Name", duration_s=400), _cand("right", "Song Name")],
+                                  "Song Name", "Band", 200_000)
+    assert [c["video_id"] for c in ranked] == ["right", "long"]
+
+
+def test_rank_candidates_penalizes_unwanted_versions():
+    ranked = core.rank_candidates([_cand("live", "Song Name (Live)"), _cand("studio", "Song Name")],
+                                  "Song Name", "Band", 200_000)
+    assert ranked[0]["video_id"] == "studio"
+
+
+def test_rank_candidates_keeps_version_the_track_asks_for():
+    ranked = core.rank_candidates([_cand("studio", "Song Name"), _cand("live", "Song Name (Live)")],
+                                  "Song Name - Live", "Band", 200_000)
+    assert ranked[0]["video_id"] == "live"
+
+
+def test_rank_candidates_prefers_topic_channel():
+    ranked = core.rank_candidates([_cand("fan", "Band - Song Name", "Fan Uploads"),
+                                   _cand("topic", "Song Name", "Band - Topic")],
+                                  "Song Name", "Band", 200_000)
+    assert ranked[0]["video_id"] == "topic"
+
+
+def test_rank_candidates_ties_keep_youtube_order():
+    ranked = core.rank_candidates([_cand("first", "Song Name"), _cand("second", "Song Name")],
+                                  "Song Name", "Band", 200_000)
+    assert [c["video_id"] for c in ranked] == ["first", "second"]
+    assert ranked[0]["score"] > ranked[1]["score"]
+
+
+def test_rank_candidates_does_not_modify_input():
+    cands = [_cand("a", "Song Name")]
+    core.rank_candidates(cands, "Song Name", "Band")
+    assert "score" not in cands[0]
+
+
+# -------------------------------- _setting_value --------------------------------
+
+@pytest.mark.parametrize("default, value, expected", [
+    (False, True, True),
+    (False, "false", None),
+    (False, 1, None),
+    (4, 8, 8),
+    (4, 8.0, 8),
+    (4, 8.5, None),
+    (4, True, None),
+    (4, "8", None),
+    (8.0, 3, 3.0),
+    (8.0, float("nan"), None),
+    (8.0, float("inf"), None),
+    ("threads", "asyncio", "asyncio"),
+    ("threads", 3, None),
+])
+def test_setting_value(default, value, expected):
+    result = core._setting_value(default, value)
+    assert result == expected and type(result) is type(expected)
+
+
+def test_load_settings_keeps_defaults_for_wrong_types(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"auto_clipboard": "false", "youtube_concurrency": 9, "engine": "asyncio"}))
+    monkeypatch.setattr(core, "_config_file_path", lambda: str(path))
+    settings = core.load_settings()
+    assert settings["auto_clipboard"] is core.DEFAULT_SETTINGS["auto_clipboard"]
+    assert settings["youtube_concurrency"] == 9
+    assert settings["engine"] == "asyncio"
@@ -0,0 +1,196 @@
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+import spotify_to_youtube_core as core
+
+URL = "https://api.example.test/v1/thing"
+HOST = "api.example.test"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None, url=URL):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.url = url
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Answers each request with the next item of ``replies`` (raised if it's an exception)."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record RateLimiter._sleep calls instead of sleeping; backoff always picks its upper bound."""
+    calls = []
+    monkeypatch.setattr(core.RateLimiter, "_sleep", lambda self, host, delay, cancel: calls.append(delay))
+    monkeypatch.setattr(core.random, "uniform", lambda lo, hi: hi)
+    return calls
+
+
+# -------------------------------- _retry_after ---------------------------------
+
+def test_retry_after_seconds():
+    assert core._retry_after(FakeResponse(headers={"Retry-After": " 7 "})) == 7.0
+
+
+def test_retry_after_negative_is_zero():
+    assert core._retry_after(FakeResponse(headers={"Retry-After": "-3"})) == 0.0
+
+
+def test_retry_after_http_date():
+    wait = core._retry_after(FakeResponse(headers={"Retry-After": formatdate(time.time() + 30, usegmt=True)}))
+    assert 25 <= wait <= 31
+
+
+def test_retry_after_missing_or_garbage():
+    assert core._retry_after(FakeResponse()) is None
+    assert core._retry_after(FakeResponse(headers={"Retry-After": "soon"})) is None
+
+
+# ------------------------------- request / retries ------------------------------
+
+def test_success_is_returned_untouched(sleeps):
+    ok = FakeResponse(200)
+    assert core.RateLimiter().request(FakeSession(ok), "GET", URL) is ok
+    assert sleeps == [] and not ok.closed
+
+
+@pytest.mark.parametrize("status", sorted(core.RETRY_STATUSES - {429}))
+def test_transient_5xx_backs_off_exponentially(sleeps, status):
+    session = FakeSession(FakeResponse(status), FakeResponse(status), FakeResponse(200))
+    limiter = core.RateLimiter()
+    resp = limiter.request(session, "GET", URL)
+    assert resp.status_code == 200 and session.calls == 3
+    assert sleeps == [core.BACKOFF_BASE, core.BACKOFF_BASE * 2]
+    assert limiter.stats()[HOST]["retries"] == 2
+
+
+def test_backoff_is_capped(sleeps):
+    limiter = core.RateLimiter(max_retries=10)
+    for attempt in range(10):
+        backoff = limiter._after_response(HOST, FakeResponse(500), attempt)
+        assert backoff == min(core.BACKOFF_MAX, core.BACKOFF_BASE * 2 ** attempt)
+
+
+def test_last_attempt_returns_the_failure(sleeps):
+    replies = [FakeResponse(503) for _ in range(core.MAX_RETRIES + 1)]
+    resp = core.RateLimiter().request(FakeSession(*replies), "GET", URL)
+    assert resp is replies[-1] and not resp.closed
+    assert len(sleeps) == core.MAX_RETRIES
+
+
+def test_non_retry_status_is_returned(sleeps):
+    resp = core.RateLimiter().request(FakeSession(FakeResponse(404)), "GET", URL)
+    assert resp.status_code == 404 and sleeps == []
+
+
+def test_retry_after_pauses_the_host_for_everyone(sleeps):
+    limiter = core.RateLimiter()
+    first = FakeResponse(429, {"Retry-After": "30"})
+    assert limiter._after_response(HOST, first, 0) == 0.0
+    assert first.closed
+    blocked, _ = limiter._reserve(HOST)
+    assert 29 < blocked <= 30
+    # Other hosts are unaffected
+    assert limiter._reserve("other.example.test") == (0.0, 0.0)
+    assert limiter.stats()[HOST]["throttled"] == 1
+
+
+def test_429_without_retry_after_still_pauses(sleeps):
+    limiter = core.RateLimiter()
+    assert limiter._after_response(HOST, FakeResponse(429), 1) == 0.0
+    blocked, _ = limiter._reserve(HOST)
+    assert 0 < blocked <= core.BACKOFF_BASE * 2 + core.BACKOFF_BASE * 2
+
+
+def test_request_waits_out_retry_after():
+    session = FakeSession(FakeResponse(429, {"Retry-After": "0.2"}), FakeResponse(200))
+    t0 = time.monotonic()
+    resp = core.RateLimiter().request(session, "GET", URL)
+    assert resp.status_code == 200
+    assert time.monotonic() - t0 >= 0.18
+
+
+def test_retry_after_too_long_is_an_error(sleeps):
+    session = FakeSession(FakeResponse(429, {"Retry-After": str(core.RETRY_AFTER_MAX + 1)}))
+    with pytest.raises(RuntimeError, match="rate limited"):
+        core.RateLimiter().request(session, "GET", URL)
+    assert session.calls == 1
+
+
+def test_sorry_page_is_throttling(sleeps):
+    sorry = "https://www.youtube.com/sorry/index?continue=x"
+    replies = [FakeResponse(200, url=sorry) for _ in range(3)]
+    limiter = core.RateLimiter(max_retries=2)
+    pauses = []
+    limiter.pause = lambda host, seconds: pauses.append(seconds)
+    with pytest.raises(RuntimeError, match="throttling"):
+        limiter.request(FakeSession(*replies), "GET", URL)
+    assert len(pauses) == 2 and replies[-1].closed
+
+
+@pytest.mark.parametrize("error", [requests.ConnectionError("reset"), requests.Timeout("slow")])
+def test_network_errors_are_retried_then_raised(sleeps, error):
+    limiter = core.RateLimiter(max_retries=2)
+    session = FakeSession(error, error, error)
+    with pytest.raises(type(error)):
+        limiter.request(session, "GET", URL)
+    assert session.calls == 3
+    assert sleeps == [core.BACKOFF_BASE, core.BACKOFF_BASE * 2]
+    assert limiter.stats()[HOST]["errors"] == 3
+
+
+def test_network_error_then_success(sleeps):
+    session = FakeSession(requests.ConnectionError("reset"), FakeResponse(200))
+    assert core.RateLimiter().request(session, "GET", URL).status_code == 200
+
+
+def test_cancel_stops_waiting():
+    cancel = core.threading.Event()
+    cancel.set()
+    with pytest.raises(core.Cancelled):
+        core.RateLimiter().request(FakeSession(FakeResponse(200)), "GET", URL, cancel=cancel)
+
+
+# --------------------------------- token buckets --------------------------------
+
+def test_token_bucket_burst_then_rate():
+    bucket = core.TokenBucket(rate=10, burst=2)
+    now = bucket.stamp
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == pytest.approx(0.1)
+    assert bucket.reserve(now) == pytest.approx(0.2)
+
+
+def test_token_bucket_refills():
+    bucket = core.TokenBucket(rate=10, burst=1)
+    now = bucket.stamp
+    bucket.reserve(now)
+    assert bucket.reserve(now + 0.1) == pytest.approx(0.0)
+
+
+def test_per_host_rates():
+    limiter = core.RateLimiter(rates={HOST: 1})
+    limiter._reserve(HOST)
+    limiter._reserve(HOST)
+    assert limiter._reserve(HOST)[1] > 0
+    assert limiter._reserve("unlimited.example.test") == (0.0, 0.0)
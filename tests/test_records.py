@@ -0,0 +1,185 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import spotify_to_youtube_core as core
+from spotify_to_youtube_server import MAX_BATCH_URLS, MAX_BODY_BYTES, ResolveServer
+
+TRACK = "https://open.spotify.com/track/{}"
+PLAYLIST = "https://open.spotify.com/playlist/{}"
+
+
+class FakeResolver:
+    """resolve_many that answers out of order; a playlist "plN" has N tracks, "bad" ones raise."""
+
+    limiter = stats = hedger = None
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _tracks(self, url):
+        kind, ref = core.extract_spotify_ref(url)
+        if kind == "track":
+            return [ref]
+        if ref.startswith("bad"):
+            raise RuntimeError(f"no such playlist {ref}")
+        return [f"{ref}t{i}" for i in range(int(ref[2:]))]
+
+    def resolve_many(self, urls, on_result=None, cancel=None, skip=()):
+        with self.lock:
+            self.calls.append(list(urls))
+        results = [{"index": i, "track_id": t, "video_id": f"v{t}"}
+                   for i, t in enumerate(t for url in urls for t in self._tracks(url))]
+        for res in reversed(results):
+            if res["track_id"] not in skip:
+                on_result(res)
+        return results
+
+    def resolve_track(self, url, cancel=None):
+        return {"index": 0, "track_id": core.extract_track_id(url), "video_id": "v"}
+
+
+def _collect(resolver, urls, **kwargs):
+    records = []
+    core.resolve_records(resolver, urls, records.append, **kwargs)
+    return records
+
+
+# -------------------------------- resolve_records -------------------------------
+
+def test_track_urls_share_one_batch_after_collections():
+    resolver = FakeResolver()
+    urls = [TRACK.format("a1"), PLAYLIST.format("pl2"), TRACK.format("b2")]
+    records = _collect(resolver, urls)
+    assert resolver.calls == [[PLAYLIST.format("pl2")], [TRACK.format("a1"), TRACK.format("b2")]]
+    assert [(r["source"], r["track_id"]) for r in records] == [
+        (PLAYLIST.format("pl2"), "pl2t1"), (PLAYLIST.format("pl2"), "pl2t0"),
+        (TRACK.format("b2"), "b2"), (TRACK.format("a1"), "a1")]
+
+
+def test_without_batch_each_url_resolves_alone():
+    resolver = FakeResolver()
+    _collect(resolver, [TRACK.format("a1"), TRACK.format("b2")], batch=False)
+    assert resolver.calls == [[TRACK.format("a1")], [TRACK.format("b2")]]
+
+
+def test_bad_urls_and_failed_collections_become_error_records():
+    records = _collect(FakeResolver(), ["not a url", PLAYLIST.format("bad1"), PLAYLIST.format("pl1")])
+    assert [(r["source"], r["error"] is not None) for r in records] == [
+        ("not a url", True), (PLAYLIST.format("bad1"), True), (PLAYLIST.format("pl1"), False)]
+    assert "no such playlist" in records[1]["error"]
+
+
+def test_skip_is_passed_through():
+    records = _collect(FakeResolver(), [PLAYLIST.format("pl3")], skip={"pl3t1"})
+    assert sorted(r["track_id"] for r in records) == ["pl3t0", "pl3t2"]
+
+
+def test_cancelled_propagates():
+    class Cancelling(FakeResolver):
+        def resolve_many(self, urls, on_result=None, cancel=None, skip=()):
+            raise core.Cancelled()
+
+    with pytest.raises(core.Cancelled):
+        _collect(Cancelling(), [PLAYLIST.format("pl1")])
+
+
+def test_server_puts_records_in_request_order():
+    srv = ResolveServer(FakeResolver(), port=0)
+    try:
+        urls = [PLAYLIST.format("pl3"), TRACK.format("a1"), "nope", PLAYLIST.format("pl2"), TRACK.format("b2")]
+        out = srv.resolve(urls)
+    finally:
+        srv.server_close()
+    assert [(r["source"], r["track_id"]) for r in out["results"]] == [
+        (urls[0], "pl3t0"), (urls[0], "pl3t1"), (urls[0], "pl3t2"), (urls[1], "a1"), (urls[2], None),
+        (urls[3], "pl2t0"), (urls[3], "pl2t1"), (urls[4], "b2")]
+    assert out["failures"] == 1
+
+
+# ------------------------------------ server ------------------------------------
+
+@pytest.fixture(scope="module")
+def server():
+    srv = ResolveServer(FakeResolver(), port=0).start()
+    yield srv
+    srv.stop()
+
+
+def _post(srv, body: bytes, headers=None):
+    conn = http.client.HTTPConnection(*srv.server_address[:2], timeout=5)
+    try:
+        conn.putrequest("POST", "/resolve")
+        for name, value in (headers or {}).items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read() or b"null")
+    finally:
+        conn.close()
+
+
+def _closed_after_reply(srv, head: bytes, wait: float = 2.0) -> bool:
+    """Send a raw request; True if the server hangs up after answering it (within ``wait`` seconds)."""
+    with socket.create_connection(srv.server_address[:2], timeout=wait) as sock:
+        sock.sendall(head)
+        try:
+            while sock.recv(65536):
+                pass
+        except socket.timeout:
+            return False
+    return True
+
+
+def test_post_json_urls(server):
+    body = json.dumps({"urls": [TRACK.format("a1"), TRACK.format("b2")]}).encode()
+    status, payload = _post(server, body, {"Content-Type": "application/json", "Content-Length": str(len(body))})
+    assert status == 200
+    assert [r["track_id"] for r in payload["results"]] == ["a1", "b2"]
+
+
+def test_post_one_url_per_line(server):
+    body = f"{TRACK.format('a1')}\n\n{TRACK.format('b2')}\n".encode()
+    status, payload = _post(server, body, {"Content-Length": str(len(body))})
+    assert status == 200 and len(payload["results"]) == 2
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_invalid_content_length(server, length):
+    status, payload = _post(server, b"", {"Content-Length": length})
+    assert status == 400 and payload["error"] == "invalid Content-Length"
+    assert _closed_after_reply(server, f"POST /resolve HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+
+
+def test_body_too_large(server):
+    status, _ = _post(server, b"", {"Content-Length": str(MAX_BODY_BYTES + 1)})
+    assert status == 413
+    assert _closed_after_reply(server, f"POST /resolve HTTP/1.1\r\nContent-Length: {MAX_BODY_BYTES + 1}\r\n\r\n".encode())
+
+
+def test_keep_alive_after_a_good_request(server):
+    body = TRACK.format("a1").encode()
+    head = f"POST /resolve HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+    assert not _closed_after_reply(server, head + body, wait=0.3)
+
+
+def test_too_many_urls(server):
+    body = json.dumps([TRACK.format(f"t{i}") for i in range(MAX_BATCH_URLS + 1)]).encode()
+    status, payload = _post(server, body, {"Content-Length": str(len(body))})
+    assert status == 413 and str(MAX_BATCH_URLS) in payload["error"]
+
+
+def test_batch_at_the_limit(server):
+    body = json.dumps([TRACK.format(f"t{i}") for i in range(MAX_BATCH_URLS)]).encode()
+    status, payload = _post(server, body, {"Content-Length": str(len(body))})
+    assert status == 200 and len(payload["results"]) == MAX_BATCH_URLS
+
+
+@pytest.mark.parametrize("body", [b'{"urls": "x"}', b"[1, 2]", b"{not json"])
+def test_malformed_json(server, body):
+    status, _ = _post(server, body, {"Content-Type": "application/json", "Content-Length": str(len(body))})
+    assert status == 400